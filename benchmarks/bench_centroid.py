@@ -0,0 +1,127 @@
+# benchmarks/bench_centroid.py
+# CAD centroid report parsers on synthetic panels (boards stepped out into a
+# million placements): seconds, lines per second, and whether the typed
+# columns hold exactly the coordinates that were written.
+#
+#   python benchmarks/bench_centroid.py                 # 1M lines per format
+#   python benchmarks/bench_centroid.py --lines 200000
+import sys
+import os
+import time
+import argparse
+import tempfile
+import numpy as np
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from src.core.file_loader import load_and_clean_file
+from src.core import instrumentation
+
+LINES = 1_000_000
+# One board, stepped out until the panel has the requested placements
+BOARD_PARTS = 2_500
+PITCH_X = 120.0
+PITCH_Y = 80.0
+BOARDS_PER_ROW = 20
+
+def make_panel(n_lines, seed=7):
+    """Returns: {"ref", "x", "y", "rot", "top", "value", "package"} arrays (coordinates in mm)."""
+    rng = np.random.default_rng(seed)
+    part = np.arange(n_lines) % BOARD_PARTS
+    board = np.arange(n_lines) // BOARD_PARTS
+    prefixes = np.array(["R", "C", "LED", "U", "Q"])[part % 5]
+    board_x = rng.uniform(2, PITCH_X - 2, BOARD_PARTS).round(4)
+    board_y = rng.uniform(2, PITCH_Y - 2, BOARD_PARTS).round(4)
+    return {
+        "ref": np.char.add(np.char.add(prefixes, (part + 1).astype(str)), np.char.add("_", (board + 1).astype(str))),
+        "x": (board_x[part] + (board % BOARDS_PER_ROW) * PITCH_X).round(4),
+        "y": (board_y[part] + (board // BOARDS_PER_ROW) * PITCH_Y).round(4),
+        "rot": rng.choice([0.0, 90.0, 180.0, 270.0], BOARD_PARTS)[part],
+        "top": (part % 7) != 0,
+        "value": np.array(["10k", "100nF", "Green", "STM32", "BSS138"])[part % 5],
+        "package": np.array(["0402", "0402", "0603", "QFN-32", "SOT-23"])[part % 5],
+    }
+
+def write_kicad(path, panel):
+    with open(path, "w") as f:
+        f.write("### Footprint positions - created by bench_centroid ###\n")
+        f.write("## Unit = mm, Angle = deg.\n## Side : All\n")
+        f.write("# Ref     Val       Package        PosX       PosY       Rot  Side\n")
+        side = np.where(panel["top"], "top", "bottom")
+        _write_rows(f, "{:<12} {:<9} {:<10} {:>10.4f} {:>10.4f} {:>8.4f}  {}\n",
+                    panel["ref"], panel["value"], panel["package"], panel["x"], panel["y"], panel["rot"], side)
+        f.write("## End\n")
+
+def write_altium(path, panel):
+    """Pick Place .txt: banner block, then quoted fields separated by blanks, in mil."""
+    with open(path, "w") as f:
+        f.write("Altium Designer Pick and Place Locations\nC:\\Panel\\Panel.PcbDoc\n\n")
+        f.write("=" * 80 + "\nFile Design Information:\n\nDate:       01/01/26\nUnits used: mil\n\n")
+        f.write('"Designator" "Comment" "Layer" "Footprint" "Center-X(mil)" "Center-Y(mil)" "Rotation" "Description"\n')
+        layer = np.where(panel["top"], "TopLayer", "BottomLayer")
+        _write_rows(f, '"{}" "{}" "{}" "{}" "{:.4f}" "{:.4f}" "{:.0f}" "Part, {}"\n',
+                    panel["ref"], panel["value"], layer, panel["package"],
+                    panel["x"] / 0.0254, panel["y"] / 0.0254, panel["rot"], panel["package"])
+
+def write_fixed_width(path, panel):
+    """Mentor-style column-aligned report with a dash underline."""
+    with open(path, "w") as f:
+        f.write("Centroid Report\nUnits: mm\n\n")
+        f.write(f"{'RefDes':<12} {'Part Number':<16} {'X':>10} {'Y':>10} {'Rotation':>9} {'Side':<6}\n")
+        f.write(f"{'-' * 12} {'-' * 16} {'-' * 10} {'-' * 10} {'-' * 9} {'-' * 6}\n")
+        side = np.where(panel["top"], "TOP", "BOTTOM")
+        _write_rows(f, "{:<12} {:<16} {:>10.4f} {:>10.4f} {:>9.1f} {:<6}\n",
+                    panel["ref"], panel["package"], panel["x"], panel["y"], panel["rot"], side)
+
+def write_cadence(path, panel):
+    """Allegro place_txt: UUNITS line, no header, mirror flag 'm' on bottom parts."""
+    with open(path, "w") as f:
+        f.write("UUNITS = MILS\n")
+        mirror = np.where(panel["top"], " ", "m")
+        _write_rows(f, "{:<12} {:>12.3f} {:>12.3f} {:>6.0f} {} {}\n",
+                    panel["ref"], np.round(panel["x"] / 0.0254, 3), np.round(panel["y"] / 0.0254, 3),
+                    panel["rot"], mirror, panel["package"])
+
+def _write_rows(f, line_format, *columns):
+    columns = [c.tolist() for c in columns]
+    f.writelines(line_format.format(*row) for row in zip(*columns))
+
+# (label, file name, writer, coordinate factor to mm)
+FORMATS = [
+    ("KiCad .pos", "panel.pos", write_kicad, 1.0),
+    ("Altium .txt", "panel_altium.txt", write_altium, 0.0254),
+    ("fixed-width", "panel_centroid.rpt", write_fixed_width, 1.0),
+    ("Cadence", "place_txt.txt", write_cadence, 0.0254),
+]
+
+def run_benchmark(n_lines=LINES):
+    print(f"--- BENCHMARK: CENTROID REPORT PARSERS ({n_lines:,} placements) ---")
+    print(f"{'Format':<12} {'MB':>7} {'Seconds':>8} {'M lines/s':>10} {'MB/s':>7}  Backend / values")
+    panel = make_panel(n_lines)
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, name, write, factor in FORMATS:
+            path = os.path.join(tmp, name)
+            write(path, panel)
+            mb = os.path.getsize(path) / 1e6
+            instrumentation.clear()
+            instrumentation.enable()
+            start = time.perf_counter()
+            df = load_and_clean_file(path)
+            seconds = time.perf_counter() - start
+            instrumentation.disable()
+            detail = next(r["detail"] for r in instrumentation.records() if r["stage"] == "file_loader.read_rows")
+            x_col = next(c for c in df.columns if c.startswith("Mid X"))
+            same = (len(df) == n_lines
+                    and np.allclose(df[x_col].to_numpy() * factor, panel["x"], atol=1e-3)
+                    and (df["Designator"].to_numpy() == panel["ref"]).all()
+                    and ((df["Layer"] == "Top").to_numpy() == panel["top"]).all())
+            print(f"{label:<12} {mb:>7.1f} {seconds:>8.2f} {n_lines / seconds / 1e6:>10.2f} {mb / seconds:>7.1f}  "
+                  f"{detail}, {'exact' if same else 'MISMATCH'}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Centroid report parse speed on synthetic panels.")
+    parser.add_argument("--lines", type=int, default=LINES, help="Placements per file (default: 1000000)")
+    run_benchmark(parser.parse_args().lines)
@@ -0,0 +1,108 @@
+# benchmarks/bench_chunked_merge.py
+# Batch job on a full-panel KiCad .pos export, in memory vs. the chunked
+# (partitioned, spilled) merge, both writing merged.csv and placements.xlsx:
+# seconds and peak resident memory. Each run
+# gets a fresh process, so the peaks do not mix (Arrow buffers live outside
+# the Python heap: tracemalloc would miss them, ru_maxrss does not). The
+# files are written by another process too: a child's ru_maxrss starts at
+# its parent's.
+#
+#   python benchmarks/bench_chunked_merge.py                    # 2M placements
+#   python benchmarks/bench_chunked_merge.py --lines 500000 --memory-mb 256
+import sys
+import os
+import time
+import argparse
+import tempfile
+import resource
+import multiprocessing
+import numpy as np
+import pandas as pd
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+LINES = 2_000_000
+MEMORY_MB = 512
+# Budget of the in-memory run: large enough for run_job never to partition
+UNLIMITED_MB = 1_000_000
+MAPPING = {
+    "Reference Designator": "Designator",
+    "Mid X": "Mid X (mm)",
+    "Mid Y": "Mid Y (mm)",
+    "Rotation": "Rotation",
+    "Layer / Side": "Layer",
+    "Part Number": "Part Number",
+    "Value": "Val",
+    "Footprint": "Package",
+}
+
+def make_files(tmp, n_lines):
+    """Returns: (BOM .csv path, XY .pos path); the BOM misses every 50th part."""
+    from bench_centroid import make_panel, write_kicad
+
+    panel = make_panel(n_lines)
+    xy_path = os.path.join(tmp, "panel.pos")
+    write_kicad(xy_path, panel)
+    bom_path = os.path.join(tmp, "panel_bom.csv")
+    listed = np.arange(n_lines) % 50 != 0
+    pd.DataFrame({
+        "Designator": panel["ref"][listed],
+        "Part Number": np.char.add("PN-", panel["value"][listed]),
+    }).to_csv(bom_path, index=False)
+    return bom_path, xy_path
+
+def _write(tmp, n_lines, queue):
+    queue.put(make_files(tmp, n_lines))
+
+def _in_process(context, target, *args):
+    """Returns: What target put on its queue, run in a fresh process."""
+    queue = context.Queue()
+    process = context.Process(target=target, args=args + (queue,))
+    process.start()
+    value = queue.get()
+    process.join()
+    return value
+
+def _run(bom_path, xy_path, out_dir, memory_mb, queue):
+    from src.core.batch import run_job
+
+    job = {"name": "chunked" if memory_mb < UNLIMITED_MB else "in_memory", "bom": bom_path, "xy": xy_path,
+           "mapping": MAPPING, "delimiter": ",", "memory_mb": memory_mb}
+    start_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    result = run_job(job, out_dir)
+    seconds = time.perf_counter() - start
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss # KB on Linux
+    queue.put((seconds, start_rss / 1024, peak_rss / 1024, result))
+
+def run_benchmark(n_lines=LINES, memory_mb=MEMORY_MB):
+    print(f"--- BENCHMARK: CHUNKED MERGE ({n_lines:,} placements, budget {memory_mb} MB) ---")
+    print(f"{'Mode':<10} {'Seconds':>8} {'Peak MB':>8} {'Above imports':>14}  Matched / XY only / BOM only")
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        bom_path, xy_path = _in_process(context, _write, tmp, n_lines)
+        print(f"XY file: {os.path.getsize(xy_path) / 1e6:.0f} MB")
+        outputs = {}
+        for label, budget in (("in memory", UNLIMITED_MB), ("chunked", memory_mb)):
+            seconds, base_mb, peak_mb, result = _in_process(
+                context, _run, bom_path, xy_path, os.path.join(tmp, "out"), budget)
+            if result["error"]:
+                print(f"{label:<10} failed: {result['error']}")
+                continue
+            outputs[label] = result
+            print(f"{label:<10} {seconds:>8.1f} {peak_mb:>8.0f} {peak_mb - base_mb:>14.0f}  "
+                  f"{result['matched']} / {result['xy_only']} / {result['bom_only']}")
+        if len(outputs) == 2:
+            keys = ["matched", "xy_only", "bom_only", "ignored", "critical", "duplicates"]
+            same = all(outputs["in memory"][k] == outputs["chunked"][k] for k in keys)
+            print(f"Same counts: {'yes' if same else 'NO'}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="In-memory vs. chunked merge: time and peak memory.")
+    parser.add_argument("--lines", type=int, default=LINES, help="Placements in the XY file (default: 2000000)")
+    parser.add_argument("--memory-mb", type=int, default=MEMORY_MB, help="Chunked merge budget (default: 512)")
+    args = parser.parse_args()
+    run_benchmark(args.lines, args.memory_mb)
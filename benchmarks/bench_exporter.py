@@ -0,0 +1,59 @@
+# benchmarks/bench_exporter.py
+import sys
+import os
+import time
+import tempfile
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from src.core.exporter import export_placements
+
+SIZES = [20_000, 200_000]
+
+def make_master_df(n_rows):
+    """Dashboard-shaped result: ~95% matched, split over both sides."""
+    i = np.arange(n_rows)
+    status = np.where(i % 20 == 0, "XY_ONLY", np.where(i % 33 == 0, "BOM_ONLY", "MATCHED"))
+    return pd.DataFrame({
+        "Ref Des": [f"R{k}" for k in i],
+        "Status": status,
+        "Is Ignored": i % 40 == 0,
+        "Layer": np.where(i % 3 == 0, "Bottom", "Top"),
+        "Mid X": [f"{k * 0.5:.3f}" for k in i],
+        "Mid Y": [f"{k * 0.25:.3f}" for k in i],
+        "Rotation": [str((k % 4) * 90) for k in i],
+        "Part Number": [f"PN-{k % 300}" for k in i],
+        "Value": "10k",
+        "Footprint": "0402",
+        "Description": "Resistor 0402 1%",
+    })
+
+def run_benchmark():
+    print("--- BENCHMARK: STREAMING EXCEL EXPORT ---")
+    print(f"{'Rows':>8} {'Seconds':>8} {'Rows/sec':>10} {'Peak MB':>8} {'File MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in SIZES:
+            df = make_master_df(n_rows)
+            path = os.path.join(tmp, f"placement_{n_rows}.xlsx")
+
+            start = time.perf_counter()
+            export_placements(df, path)
+            elapsed = time.perf_counter() - start
+
+            # Peak measured separately (tracemalloc slows Python code down)
+            tracemalloc.start()
+            export_placements(df, path)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(f"{n_rows:>8} {elapsed:>8.2f} {n_rows / elapsed:>10,.0f} {peak / 1024 / 1024:>8.1f} "
+                  f"{os.path.getsize(path) / 1024 / 1024:>8.1f}")
+
+if __name__ == "__main__":
+    run_benchmark()
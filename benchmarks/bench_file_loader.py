@@ -0,0 +1,64 @@
+# benchmarks/bench_file_loader.py
+import sys
+import os
+import time
+import tempfile
+import tracemalloc
+import xlsxwriter
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from src.core.file_loader import load_and_clean_file
+
+SIZES = [5_000, 50_000]
+
+def make_workbook(path, n_rows):
+    """Banner rows, a header, and a Manufacturer column merged every 4 rows."""
+    workbook = xlsxwriter.Workbook(path, {'constant_memory': False})
+    worksheet = workbook.add_worksheet()
+    worksheet.merge_range(0, 0, 0, 5, 'Customer: Stark Industries')
+    worksheet.write(1, 0, 'Project: Jarvis V1')
+    headers = ['Ref Des', 'Manufacturer', 'Part Number', 'Qty', 'Value', 'Description']
+    for col, h in enumerate(headers):
+        worksheet.write(3, col, h)
+    for i in range(n_rows):
+        row = 4 + i
+        worksheet.write(row, 0, f"R{i}")
+        if i % 4 == 0:
+            worksheet.merge_range(row, 1, min(row + 3, 3 + n_rows), 1, f"MFR-{i % 40}")
+        worksheet.write(row, 2, f"PN-{i % 700}")
+        worksheet.write(row, 3, 1)
+        worksheet.write(row, 4, "10k")
+        worksheet.write(row, 5, "Resistor 0402 1%")
+    workbook.close()
+
+def _measure(func, path):
+    """Times a clean run, then repeats it under tracemalloc for peak memory."""
+    start = time.perf_counter()
+    df = func(path)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df, elapsed, peak / 1024 / 1024
+
+def run_benchmark():
+    print("--- BENCHMARK: EXCEL LOADER (full workbook vs streaming) ---")
+    print(f"{'Rows':>8} {'File MB':>8} {'Full s':>8} {'Full MB':>9} {'Stream s':>9} {'Stream MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in SIZES:
+            path = os.path.join(tmp, f"bom_{n_rows}.xlsx")
+            make_workbook(path, n_rows)
+            size_mb = os.path.getsize(path) / 1024 / 1024
+            full_df, full_s, full_mb = _measure(lambda p: load_and_clean_file(p, streaming=False), path)
+            stream_df, stream_s, stream_mb = _measure(load_and_clean_file, path)
+            same = full_df.fillna(str(None)).astype(str).equals(stream_df)
+            print(f"{n_rows:>8} {size_mb:>8.1f} {full_s:>8.2f} {full_mb:>9.1f} {stream_s:>9.2f} {stream_mb:>10.1f}"
+                  f"{'' if same else '  [MISMATCH]'}")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,86 @@
+# benchmarks/bench_logic_engine.py
+import sys
+import os
+import time
+import pandas as pd
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from src.core.logic_engine import perform_merge_and_validation
+
+SIZES = [1_000, 10_000, 50_000]
+
+MAPPING = {
+    "Reference Designator": "Ref Des",
+    "Layer / Side": "Layer",
+    "Mid X": "Mid X",
+    "Mid Y": "Mid Y",
+    "Rotation": "Rotation",
+    "Part Number": "Part Number",
+    "Value": "Value",
+    "Footprint": None,
+    "Description": "Description",
+}
+
+def make_inputs(n_placements):
+    """XY with ~5% fiducials/extras, BOM with ~5% refs missing from XY."""
+    xy_refs = [f"R{i}" for i in range(n_placements)]
+    xy_refs[::20] = [f"FID{i}" for i in range(len(xy_refs[::20]))]
+    xy_df = pd.DataFrame({
+        'Ref Des': xy_refs,
+        'Layer': ['Top' if i % 3 else 'Bottom' for i in range(n_placements)],
+        'Mid X': [f"{i * 0.5:.3f}" for i in range(n_placements)],
+        'Mid Y': [f"{i * 0.25:.3f}" for i in range(n_placements)],
+        'Rotation': [str((i % 4) * 90) for i in range(n_placements)],
+    })
+    bom_refs = [f"R{i}" for i in range(n_placements) if i % 19]
+    bom_df = pd.DataFrame({
+        'Ref Des': bom_refs,
+        'Part Number': [f"PN-{i % 300}" for i in range(len(bom_refs))],
+        'Value': ["10k"] * len(bom_refs),
+        'Description': ["Resistor"] * len(bom_refs),
+    })
+    return bom_df, xy_df
+
+def legacy_merge_and_validation(bom_df, xy_df, mapping):
+    """Row-by-row implementation this module replaced (kept for comparison)."""
+    bom_df['_JOIN_KEY'] = bom_df[mapping["Reference Designator"]].astype(str).str.strip().str.upper()
+    xy_df['_JOIN_KEY'] = xy_df[mapping["Reference Designator"]].astype(str).str.strip().str.upper()
+    merged_df = pd.merge(xy_df, bom_df, on='_JOIN_KEY', how='outer', indicator=True, suffixes=('_XY', '_BOM'))
+    statuses = {'both': "MATCHED", 'left_only': "XY_ONLY", 'right_only': "BOM_ONLY"}
+    final_rows = []
+    for _, row in merged_df.iterrows():
+        status = statuses.get(row['_merge'], "UNKNOWN")
+        new_row = {"Ref Des": row['_JOIN_KEY'], "Status": status, "Is Ignored": False}
+        for field, source in [("Layer", "Layer / Side"), ("Mid X", "Mid X"), ("Mid Y", "Mid Y"),
+                              ("Rotation", "Rotation"), ("Part Number", "Part Number"),
+                              ("Value", "Value"), ("Footprint", "Footprint"), ("Description", "Description")]:
+            new_row[field] = row.get(mapping.get(source), "")
+        ref = new_row["Ref Des"]
+        if ref.startswith("FID") or ref.startswith("TP") or ref.startswith("MH"):
+            if status == "XY_ONLY":
+                new_row["Is Ignored"] = True
+        final_rows.append(new_row)
+    return pd.DataFrame(final_rows)
+
+def _time(func, bom_df, xy_df):
+    start = time.perf_counter()
+    result = func(bom_df.copy(), xy_df.copy(), MAPPING)
+    return result, time.perf_counter() - start
+
+def run_benchmark():
+    print("--- BENCHMARK: MERGE & VALIDATION ---")
+    print(f"{'Placements':>10} {'Out rows':>10} {'Legacy s':>10} {'Columnar s':>11} {'Speedup':>8}")
+    for n_placements in SIZES:
+        bom_df, xy_df = make_inputs(n_placements)
+        legacy, legacy_s = _time(legacy_merge_and_validation, bom_df, xy_df)
+        result, new_s = _time(perform_merge_and_validation, bom_df, xy_df)
+        same = legacy.astype(object).fillna("").equals(result.astype(object).fillna(""))
+        print(f"{n_placements:>10} {len(result):>10} {legacy_s:>10.3f} {new_s:>11.3f} {legacy_s / new_s:>7.0f}x"
+              f"{'' if same else '  [MISMATCH]'}")
+
+if __name__ == "__main__":
+    run_benchmark()
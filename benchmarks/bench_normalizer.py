@@ -0,0 +1,46 @@
+# benchmarks/bench_normalizer.py
+import sys
+import os
+import time
+import pandas as pd
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from src.core.normalizer import normalize_bom_data
+
+SIZES = [1_000, 10_000, 100_000]
+
+def make_bom(n_lines):
+    """Builds a BOM with a realistic mix of single refs, lists and dense ranges."""
+    refs = []
+    for i in range(n_lines):
+        kind = i % 4
+        if kind == 0:
+            refs.append(f"R{i * 10 + 1}-R{i * 10 + 8}")
+        elif kind == 1:
+            refs.append(f"C{i}, C{i + 1}, C{i + 2}")
+        elif kind == 2:
+            refs.append(f"U{i}")
+        else:
+            refs.append(f"D{i * 4 + 3}-D{i * 4}, LED{i}")
+    return pd.DataFrame({
+        'Ref Des': refs,
+        'Part Number': [f"PN-{i % 500}" for i in range(n_lines)],
+        'Description': ["Generic part"] * n_lines,
+    })
+
+def run_benchmark():
+    print("--- BENCHMARK: BOM NORMALIZER ---")
+    print(f"{'BOM lines':>10} {'Out rows':>10} {'Seconds':>10} {'Lines/sec':>12} {'Refs/sec':>12}")
+    for n_lines in SIZES:
+        df = make_bom(n_lines)
+        start = time.perf_counter()
+        out = normalize_bom_data(df, 'Ref Des', delimiter=',')
+        elapsed = time.perf_counter() - start
+        print(f"{n_lines:>10} {len(out):>10} {elapsed:>10.3f} {n_lines / elapsed:>12,.0f} {len(out) / elapsed:>12,.0f}")
+
+if __name__ == "__main__":
+    run_benchmark()
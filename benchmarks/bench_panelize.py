@@ -0,0 +1,48 @@
+# benchmarks/bench_panelize.py
+import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from src.core.schema import apply_schema
+from src.core.panelize import panelize
+
+# (Parts per board, rows, cols)
+CASES = [(5_000, 4, 5), (25_000, 5, 8), (50_000, 5, 8)]
+
+def make_board(n_parts, seed=0):
+    """Merged single-board frame as it comes out of the merge + typed schema."""
+    rng = np.random.default_rng(seed)
+    return apply_schema(pd.DataFrame({
+        "Ref Des": [f"R{i}" for i in range(n_parts)],
+        "Status": "MATCHED",
+        "Is Ignored": False,
+        "Layer": rng.choice(["TopLayer", "BottomLayer"], n_parts),
+        "Mid X": np.round(rng.uniform(0, 300, n_parts), 4).astype(str),
+        "Mid Y": np.round(rng.uniform(0, 200, n_parts), 4).astype(str),
+        "Rotation": rng.choice(["0", "90", "180", "270"], n_parts),
+        "Part Number": rng.choice([f"PN-{i}" for i in range(500)], n_parts),
+    }))
+
+def run_benchmark():
+    print("--- BENCHMARK: PANEL STEP AND REPEAT ---")
+    print(f"{'Parts':>8} {'Panel':>7} {'Placements':>11} {'Seconds':>9} {'M rows/s':>9}")
+    for n_parts, rows, cols in CASES:
+        board_df = make_board(n_parts)
+        panel = {
+            "rows": rows, "cols": cols, "pitch_x": 310, "pitch_y": 210,
+            "board_rotation": {2: 180, 4: 180}, "mirrored_boards": [3], "skip": [rows * cols],
+        }
+        start = time.perf_counter()
+        panel_df = panelize(board_df, panel)
+        elapsed = time.perf_counter() - start
+        print(f"{n_parts:>8} {rows:>3}x{cols:<3} {len(panel_df):>11} {elapsed:>9.3f} {len(panel_df) / elapsed / 1e6:>9.1f}")
+
+if __name__ == "__main__":
+    run_benchmark()
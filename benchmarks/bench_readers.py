@@ -0,0 +1,65 @@
+# benchmarks/bench_readers.py
+# Every reader backend on the same files: seconds per backend, and whether
+# the frame equals the one from the always-available fallback backend.
+import sys
+import os
+import time
+import tempfile
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from src.core.file_loader import load_and_clean_file
+from src.core.readers import READERS
+from bench_file_loader import make_workbook
+from synthetic import generate_files
+
+SIZES = [100_000, 500_000]
+# Rows of the merged-cell workbook (openpyxl is slow on it: kept smaller)
+MERGED_ROWS = 50_000
+
+def make_files(tmp, n_placements):
+    """Returns: {label: path} for one board, as Excel, CSV and TXT."""
+    bom_path, xy_path = generate_files(tmp, n_placements, seed=3)
+    csv_path = os.path.join(tmp, f"xy_{n_placements}.csv")
+    # Same XY data comma separated, below a banner line
+    with open(csv_path, "w", newline="") as f:
+        f.write("Pick and place export\n")
+        load_and_clean_file(xy_path).to_csv(f, index=False)
+    merged_path = os.path.join(tmp, f"merged_{MERGED_ROWS}.xlsx")
+    if not os.path.exists(merged_path):
+        make_workbook(merged_path, MERGED_ROWS)
+    return {"BOM .xlsx": bom_path, "merged .xlsx": merged_path, "XY .txt": xy_path, "XY .csv": csv_path}
+
+def run_benchmark():
+    print("--- BENCHMARK: READER BACKENDS (same files, each backend forced) ---")
+    print(f"{'Parts':>8} {'File':<14} {'Backend':<10} {'Rows':>8} {'Seconds':>8} {'Speedup':>8}  Same as fallback")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in SIZES:
+            for label, path in make_files(tmp, n).items():
+                ext = os.path.splitext(path)[1]
+                backends = [r for r in READERS.values() if ext in r["extensions"]]
+                # Last registered = pure-Python fallback: the reference
+                reference_name = backends[-1]["name"]
+                start = time.perf_counter()
+                reference = load_and_clean_file(path, reader=reference_name)
+                reference_s = time.perf_counter() - start
+                for backend in backends:
+                    name = backend["name"]
+                    if not backend["available"]:
+                        print(f"{n:>8} {label:<14} {name:<10} {'-':>8} {'-':>8} {'-':>8}  not installed")
+                        continue
+                    if name == reference_name:
+                        df, seconds = reference, reference_s
+                    else:
+                        start = time.perf_counter()
+                        df = load_and_clean_file(path, reader=name)
+                        seconds = time.perf_counter() - start
+                    same = df.equals(reference) and list(df.columns) == list(reference.columns)
+                    print(f"{n:>8} {label:<14} {name:<10} {len(df):>8} {seconds:>8.2f} "
+                          f"{reference_s / seconds:>7.1f}x  {'yes' if same else 'NO'}")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,53 @@
+# benchmarks/bench_schema.py
+import sys
+import os
+import time
+import tempfile
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from src.core.file_loader import load_and_clean_file
+from src.core.normalizer import normalize_bom_data
+from src.core.logic_engine import perform_merge_and_validation
+from src.core.schema import apply_schema, CATEGORY_COLUMNS, NUMERIC_COLUMNS
+from synthetic import MAPPING, generate_files
+
+SIZES = [100_000, 500_000]
+
+def merged_frame(tmp, n_placements):
+    bom_path, xy_path = generate_files(tmp, n_placements, seed=7)
+    bom_df = normalize_bom_data(load_and_clean_file(bom_path), MAPPING["Reference Designator"], "auto")
+    return perform_merge_and_validation(bom_df, load_and_clean_file(xy_path), MAPPING)
+
+def _mb(df, columns):
+    usage = df.memory_usage(deep=True, index=False)
+    return usage[[c for c in columns if c in usage.index]].sum() / 1024 / 1024
+
+def run_benchmark():
+    print("--- BENCHMARK: TYPED SCHEMA (memory of the merged frame) ---")
+    print(f"{'Rows':>8} {'Text MB':>8} {'Typed MB':>9} {'Saved':>7} {'Convert s':>10}   Per group (text -> typed MB)")
+    groups = {
+        "Status": ["Status"],
+        "Categories": CATEGORY_COLUMNS,
+        "Coordinates": list(NUMERIC_COLUMNS) + list(NUMERIC_COLUMNS.values()),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in SIZES:
+            merged_df = merged_frame(tmp, n)
+
+            start = time.perf_counter()
+            typed_df = apply_schema(merged_df)
+            convert_s = time.perf_counter() - start
+
+            before = _mb(merged_df, merged_df.columns)
+            after = _mb(typed_df, typed_df.columns)
+            detail = ", ".join(
+                f"{name} {_mb(merged_df, cols):.1f} -> {_mb(typed_df, cols):.1f}" for name, cols in groups.items()
+            )
+            print(f"{len(merged_df):>8} {before:>8.1f} {after:>9.1f} {1 - after / before:>7.0%} {convert_s:>10.2f}   {detail}")
+
+if __name__ == "__main__":
+    run_benchmark()
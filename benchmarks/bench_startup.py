@@ -0,0 +1,132 @@
+# benchmarks/bench_startup.py
+# Cold start: time from launching Python to the first painted window, in a
+# fresh interpreter each run (-X importtime), plus the imports that happened
+# before the window and the time until the background preload finished.
+#
+#   python benchmarks/bench_startup.py                  # 5 runs, 500 ms target
+#   python benchmarks/bench_startup.py --runs 10 --target-ms 800
+import sys
+import os
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+RUNS = 5
+TARGET_MS = 500
+# Must not be imported before the first window (see src/ui/preload.py)
+HEAVY_MODULES = ["pandas", "numpy", "pyarrow", "openpyxl", "xlsxwriter"]
+WINDOW_MARKER = "--- first window ---"
+TOP_IMPORTS = 10
+
+def probe():
+    """Child process: shows the main window, reports, waits for the preload."""
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QThreadPool
+    from src.ui.main_window import MainWindow
+
+    app = QApplication(sys.argv[:1])
+    window = MainWindow()
+    window.show()
+    app.processEvents() # Show + first paint
+    heavy = [m for m in HEAVY_MODULES if m in sys.modules]
+    sys.stderr.write(WINDOW_MARKER + "\n")
+    sys.stderr.flush()
+    print(json.dumps({"event": "window", "heavy": heavy}), flush=True)
+
+    start = time.perf_counter()
+    # (A window without preload: nothing to wait for)
+    while getattr(window, "preload_worker", False) is None:
+        app.processEvents()
+        time.sleep(0.001)
+    QThreadPool.globalInstance().waitForDone()
+    print(json.dumps({"event": "preloaded", "seconds": time.perf_counter() - start}), flush=True)
+
+def run_once():
+    """
+    Launches one probe.
+    Returns: {"window_ms", "preload_ms", "heavy", "imports": [(cumulative us, module)]}
+    """
+    env = dict(os.environ)
+    if sys.platform.startswith("linux") and not env.get("DISPLAY") and not env.get("WAYLAND_DISPLAY"):
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    # -X importtime writes a lot to stderr: a file, so it never blocks the child
+    with tempfile.TemporaryFile(mode="w+") as err:
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            [sys.executable, "-X", "importtime", os.path.abspath(__file__), "--probe"],
+            cwd=parent_dir, env=env, stdout=subprocess.PIPE, stderr=err, text=True,
+        )
+        window_line = proc.stdout.readline()
+        window_ms = (time.perf_counter() - start) * 1000
+        preloaded_line = proc.stdout.readline()
+        proc.wait()
+        err.seek(0)
+        stderr = err.read()
+    if proc.returncode or not preloaded_line:
+        raise RuntimeError(f"Probe failed:\n{stderr[-2000:]}")
+    window = json.loads(window_line)
+    preload_ms = window_ms + json.loads(preloaded_line)["seconds"] * 1000
+
+    before_window = stderr.split(WINDOW_MARKER)[0]
+    return {
+        "window_ms": window_ms,
+        "preload_ms": preload_ms,
+        "heavy": window["heavy"],
+        "imports": _parse_importtime(before_window),
+    }
+
+def _parse_importtime(text):
+    """'import time: self | cumulative | name' lines -> [(cumulative us, name)], top-level only."""
+    imports = []
+    for line in text.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit() and not name.startswith("  "): # Nested imports are indented
+            imports.append((int(cumulative), name.strip()))
+    return sorted(imports, reverse=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time to first window (cold start).")
+    parser.add_argument("--runs", type=int, default=RUNS, help="Fresh interpreters to start (default: 5)")
+    parser.add_argument("--target-ms", type=float, default=TARGET_MS,
+                        help="Median time to first window that counts as a pass (default: 500)")
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.probe:
+        probe()
+        return 0
+
+    print("--- BENCHMARK: COLD START (time to first window) ---")
+    print(f"{'Run':>4} {'Window ms':>10} {'Preloaded ms':>13}")
+    runs = []
+    for i in range(args.runs):
+        runs.append(run_once())
+        print(f"{i + 1:>4} {runs[-1]['window_ms']:>10.0f} {runs[-1]['preload_ms']:>13.0f}")
+
+    window_ms = statistics.median(r["window_ms"] for r in runs)
+    preload_ms = statistics.median(r["preload_ms"] for r in runs)
+    print(f"Median: first window {window_ms:.0f} ms, preload done {preload_ms:.0f} ms (target {args.target_ms:.0f} ms)")
+    print("Slowest top-level imports before the window (last run):")
+    for cumulative, name in runs[-1]["imports"][:TOP_IMPORTS]:
+        print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+
+    heavy = sorted({m for r in runs for m in r["heavy"]})
+    if heavy:
+        print(f"[FAIL] Loaded before the first window: {', '.join(heavy)}")
+    if window_ms > args.target_ms:
+        print(f"[FAIL] First window after {window_ms:.0f} ms (target {args.target_ms:.0f} ms)")
+    if not heavy and window_ms <= args.target_ms:
+        print("[PASS] Window shown within target, heavy modules deferred.")
+    return 1 if heavy or window_ms > args.target_ms else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+# benchmarks/run_suite.py
+# End-to-end benchmark on seeded synthetic boards: load, normalize and merge
+# are timed and memory-profiled separately and compared with baseline.json.
+#
+#   python benchmarks/run_suite.py                      # 1k + 10k placements
+#   python benchmarks/run_suite.py --sizes 1000,100000,1000000
+#   python benchmarks/run_suite.py --update-baseline    # store this run
+import sys
+import os
+import json
+import time
+import argparse
+import platform
+import tempfile
+import tracemalloc
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from src.core.file_loader import load_and_clean_file
+from src.core.normalizer import normalize_bom_data
+from src.core.logic_engine import perform_merge_and_validation, clear_merge_cache
+from synthetic import MAPPING, generate_files
+
+SIZES = [1_000, 10_000]
+SEED = 42
+BASELINE_PATH = os.path.join(current_dir, "baseline.json")
+# "merge" starts from an empty memo cache every run; "merge_cached" is the
+# same merge again with the cache warm (e.g. a refresh after ignoring a row)
+STAGES = ["load_bom", "load_xy", "normalize", "merge", "merge_cached"]
+
+# A stage is a regression when it is this much slower / bigger than baseline
+TIME_TOLERANCE = 1.25
+MEMORY_TOLERANCE = 1.25
+# Below these, noise dominates: never flagged
+MIN_SECONDS = 0.05
+MIN_MB = 5.0
+
+def run_size(n_placements, tmp_dir, measure_memory=True):
+    """
+    Generates one board and runs the pipeline stage by stage.
+    Returns: {stage: {"seconds", "peak_mb", "rows"}}
+    """
+    bom_path, xy_path = generate_files(tmp_dir, n_placements, SEED)
+    inputs = {}
+    stages = {
+        "load_bom": lambda: load_and_clean_file(bom_path),
+        "load_xy": lambda: load_and_clean_file(xy_path),
+        # Generated BOMs mix ',', ', ' and ';' between tokens
+        "normalize": lambda: normalize_bom_data(inputs["load_bom"], MAPPING["Reference Designator"], "auto"),
+        "merge": lambda: perform_merge_and_validation(inputs["normalize"], inputs["load_xy"], MAPPING),
+        "merge_cached": lambda: perform_merge_and_validation(inputs["normalize"], inputs["load_xy"], MAPPING),
+    }
+    # Run before each measured run of the stage
+    resets = {"merge": clear_merge_cache}
+
+    results = {}
+    for stage in STAGES:
+        df, seconds, peak_mb = _measure(stages[stage], measure_memory, resets.get(stage))
+        inputs[stage] = df
+        results[stage] = {"seconds": round(seconds, 4), "peak_mb": peak_mb, "rows": len(df)}
+    return results
+
+def compare(results, baseline):
+    """
+    Ratios against the baseline for every (size, stage) present in both.
+    Returns: List of regression messages (empty = OK)
+    """
+    regressions = []
+    for size, stages in results.items():
+        for stage, now in stages.items():
+            before = baseline.get(size, {}).get(stage)
+            if not before:
+                continue
+            if now["seconds"] > MIN_SECONDS and now["seconds"] > before["seconds"] * TIME_TOLERANCE:
+                regressions.append(
+                    f"{size} {stage}: {now['seconds']:.3f}s vs {before['seconds']:.3f}s baseline"
+                )
+            if (now["peak_mb"] is not None and before.get("peak_mb") is not None
+                    and now["peak_mb"] > MIN_MB and now["peak_mb"] > before["peak_mb"] * MEMORY_TOLERANCE):
+                regressions.append(
+                    f"{size} {stage}: {now['peak_mb']:.1f} MB vs {before['peak_mb']:.1f} MB baseline"
+                )
+            if now["rows"] != before["rows"]:
+                regressions.append(f"{size} {stage}: {now['rows']} rows vs {before['rows']} baseline")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-end load/normalize/merge benchmark.")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in SIZES),
+                        help="Comma separated placement counts (default: 1000,10000)")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Skip the tracemalloc pass (faster for 1M boards)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON to compare with")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--json", help="Also write this run's results to a JSON file")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f).get("results", {})
+
+    print("--- BENCHMARK SUITE: SYNTHETIC BOARDS (seed %d) ---" % SEED)
+    print(f"{'Parts':>8} {'Stage':<12} {'Rows':>8} {'Seconds':>9} {'Peak MB':>9} {'vs base':>8}")
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            key = str(n)
+            results[key] = run_size(n, tmp, measure_memory=not args.no_memory)
+            for stage, r in results[key].items():
+                before = baseline.get(key, {}).get(stage)
+                ratio = f"{r['seconds'] / before['seconds']:.2f}x" if before and before["seconds"] else "-"
+                peak = "-" if r["peak_mb"] is None else f"{r['peak_mb']:.1f}"
+                print(f"{n:>8} {stage:<12} {r['rows']:>8} {r['seconds']:>9.3f} {peak:>9} {ratio:>8}")
+
+    report = {
+        "seed": SEED,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline)
+    for message in regressions:
+        print(f"[REGRESSION] {message}")
+    if not baseline:
+        print("No baseline yet: run with --update-baseline to store one.")
+    elif not regressions:
+        print("No regressions against baseline.")
+    return 1 if regressions else 0
+
+def _measure(func, measure_memory, reset=None):
+    """
+    Times a clean run, then repeats it under tracemalloc for peak memory.
+    reset (e.g. clear_merge_cache) runs before both, so the traced run does
+    the same work as the timed one.
+    """
+    if reset:
+        reset()
+    start = time.perf_counter()
+    df = func()
+    elapsed = time.perf_counter() - start
+    peak_mb = None
+    if measure_memory:
+        if reset:
+            reset()
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_mb = round(peak / 1024 / 1024, 2)
+    return df, elapsed, peak_mb
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+# benchmarks/synthetic.py
+# Seeded generator for realistic messy BOM / XY file pairs.
+import os
+import random
+import xlsxwriter
+
+# (Prefix, Footprint, Value choices, Description)
+PART_FAMILIES = [
+    ("R", "0402", ["10k", "4k7", "100R", "1M", "0R"], "Resistor"),
+    ("C", "0402", ["100nF", "1uF", "10pF", "4u7"], "Capacitor MLCC"),
+    ("C", "0805", ["10uF", "22uF"], "Capacitor MLCC"),
+    ("L", "0603", ["1uH", "4u7H"], "Inductor"),
+    ("D", "SOD-123", ["1N4148", "BAT54"], "Diode"),
+    ("LED", "0603", ["Green", "Red"], "LED"),
+    ("Q", "SOT-23", ["BSS138", "MMBT3904"], "Transistor"),
+    ("U", "QFN-32", ["STM32G0", "ESP32"], "IC"),
+    ("J", "HDR-2x5", ["Header"], "Connector"),
+]
+MANUFACTURERS = ["Murata", "Yageo", "TDK", "Vishay", "ST", "TI", "Samtec"]
+
+# XY columns in Altium "Pick Place" order
+XY_COLUMNS = ["Designator", "Footprint", "Mid X", "Mid Y", "Ref X", "Ref Y", "Layer", "Rotation", "Comment"]
+
+# Mapping the suite uses for perform_merge_and_validation
+MAPPING = {
+    "Reference Designator": "Ref Des",
+    "Layer / Side": "Layer",
+    "Mid X": "Mid X",
+    "Mid Y": "Mid Y",
+    "Rotation": "Rotation",
+    "Part Number": "Part Number",
+    "Value": "Value",
+    "Footprint": "Footprint",
+    "Description": "Description",
+}
+
+def generate_board(n_placements, seed=0, missing_rate=0.01):
+    """
+    Builds one board's worth of parts.
+    Returns: (bom_lines, placements)
+        bom_lines:  List of dicts, one per BOM line, 'Ref Des' holds ranges/lists.
+        placements: List of dicts, one per XY row (incl. fiducials and
+                    parts missing from the BOM).
+    """
+    rng = random.Random(seed)
+    counters = {}
+    bom_lines = []
+    placements = []
+
+    remaining = n_placements
+    pn = 0
+    while remaining > 0:
+        prefix, footprint, values, description = rng.choice(PART_FAMILIES)
+        # Passives come in big groups (dense ranges), ICs in small ones
+        group = min(remaining, rng.randint(1, 400 if prefix in ("R", "C") else 6))
+        value = rng.choice(values)
+        layer = "BottomLayer" if rng.random() < 0.3 else "TopLayer"
+
+        start = counters.get(prefix, 0) + 1
+        numbers = list(range(start, start + group))
+        counters[prefix] = start + group - 1 + rng.randint(0, 3) # Gaps between groups
+
+        bom_lines.append({
+            "Ref Des": _compress_refs(prefix, numbers, rng),
+            "Manufacturer": rng.choice(MANUFACTURERS),
+            "Part Number": f"PN-{pn:06d}",
+            "Value": value,
+            "Qty": str(group),
+            "Footprint": footprint,
+            "Description": f"{description} {value} {footprint}",
+        })
+        pn += 1
+
+        for n in numbers:
+            if rng.random() < missing_rate:
+                continue # In BOM, missing from XY
+            placements.append(_placement(f"{prefix}{n}", footprint, value, layer, rng))
+        remaining -= group
+
+    # Parts only in XY: fiducials/test points (auto-ignored) and a few strays
+    for i in range(1, 4):
+        placements.append(_placement(f"FID{i}", "FIDUCIAL", "", "TopLayer", rng))
+    for i in range(max(1, int(n_placements * missing_rate))):
+        placements.append(_placement(f"TP{i + 1}", "TESTPOINT", "", "BottomLayer", rng))
+        placements.append(_placement(f"X{i + 1}", "UNKNOWN", "", "TopLayer", rng))
+
+    rng.shuffle(placements)
+    return bom_lines, placements
+
+def write_bom_xlsx(path, bom_lines, seed=0):
+    """
+    Messy customer BOM: banner rows (one merged across the sheet), a blank
+    row, a duplicated 'Notes' header, and Manufacturer cells merged over
+    consecutive lines from the same vendor.
+    """
+    rng = random.Random(seed)
+    headers = ["Item", "Ref Des", "Qty", "Manufacturer", "Part Number", "Value", "Footprint", "Description", "Notes", "Notes"]
+
+    workbook = xlsxwriter.Workbook(path)
+    sheet = workbook.add_worksheet("BOM")
+    sheet.merge_range(0, 0, 0, len(headers) - 1, "Customer: Stark Industries - Assembly BOM")
+    sheet.write(1, 0, "Project: Jarvis")
+    sheet.write(1, 2, f"Rev {rng.choice('ABCD')}")
+    header_row = 3
+    sheet.write_row(header_row, 0, headers)
+
+    # Same manufacturer on consecutive lines -> one vertical merge
+    row = header_row + 1
+    i = 0
+    while i < len(bom_lines):
+        run = 1
+        while (i + run < len(bom_lines) and run < 5
+               and bom_lines[i + run]["Manufacturer"] == bom_lines[i]["Manufacturer"]):
+            run += 1
+        for k in range(run):
+            line = bom_lines[i + k]
+            r = row + k
+            sheet.write(r, 0, i + k + 1) # Item as number
+            sheet.write(r, 1, line["Ref Des"])
+            sheet.write(r, 2, int(line["Qty"]))
+            sheet.write(r, 4, line["Part Number"])
+            sheet.write(r, 5, line["Value"])
+            sheet.write(r, 6, line["Footprint"])
+            sheet.write(r, 7, line["Description"])
+        if run > 1:
+            sheet.merge_range(row, 3, row + run - 1, 3, bom_lines[i]["Manufacturer"])
+        else:
+            sheet.write(row, 3, bom_lines[i]["Manufacturer"])
+        row += run
+        i += run
+
+    workbook.close()
+
+def write_xy_txt(path, placements):
+    """Altium-style tab separated pick & place with a banner block."""
+    with open(path, "w") as f:
+        f.write("Altium Designer Pick and Place Locations\n")
+        f.write("Units used:\tmm\n")
+        f.write("\n")
+        f.write("\t".join(XY_COLUMNS) + "\n")
+        for p in placements:
+            f.write("\t".join(p[col] for col in XY_COLUMNS) + "\n")
+
+def generate_files(out_dir, n_placements, seed=0):
+    """Writes bom_<n>.xlsx and xy_<n>.txt. Returns: (bom_path, xy_path)"""
+    os.makedirs(out_dir, exist_ok=True)
+    bom_lines, placements = generate_board(n_placements, seed)
+    bom_path = os.path.join(out_dir, f"bom_{n_placements}.xlsx")
+    xy_path = os.path.join(out_dir, f"xy_{n_placements}.txt")
+    write_bom_xlsx(bom_path, bom_lines, seed)
+    write_xy_txt(xy_path, placements)
+    return bom_path, xy_path
+
+def _compress_refs(prefix, numbers, rng):
+    """
+    [1,2,3,4,7] -> 'R1-R4, R7' with the mess real BOMs have:
+    reversed or lowercase ranges, ranges without the second prefix, and
+    ',', ', ' or ';' between tokens.
+    """
+    tokens = []
+    i = 0
+    while i < len(numbers):
+        j = i
+        while j + 1 < len(numbers) and numbers[j + 1] == numbers[j] + 1 and j - i < 40:
+            j += 1
+        lo, hi = numbers[i], numbers[j]
+        if hi - lo >= 2:
+            style = rng.random()
+            if style < 0.1:
+                token = f"{prefix}{hi}-{prefix}{lo}" # Reversed
+            elif style < 0.2:
+                token = f"{prefix}{lo}-{hi}" # No second prefix
+            elif style < 0.25:
+                token = f"{prefix.lower()}{lo}-{prefix.lower()}{hi}"
+            else:
+                token = f"{prefix}{lo}-{prefix}{hi}"
+            tokens.append(token)
+        else:
+            tokens.extend(f"{prefix}{n}" for n in range(lo, hi + 1))
+        i = j + 1
+
+    out = tokens[0]
+    for token in tokens[1:]:
+        out += rng.choice([",", ", ", ";"]) + token
+    return out
+
+def _placement(ref, footprint, value, layer, rng):
+    x = rng.uniform(0, 300)
+    y = rng.uniform(0, 200)
+    return {
+        "Designator": ref,
+        "Footprint": footprint,
+        "Mid X": f"{x:.4f}mm",
+        "Mid Y": f"{y:.4f}mm",
+        "Ref X": f"{x - 0.5:.4f}mm",
+        "Ref Y": f"{y:.4f}mm",
+        "Layer": layer,
+        "Rotation": rng.choice(["0", "90", "180", "270"]),
+        "Comment": value,
+    }
@@ -1,12 +1,18 @@
 # main.py
 import sys
-from PyQt5.QtWidgets import QApplication
-from src.ui.main_window import MainWindow
 
 def main():
+    # Headless mode: "python main.py batch manifest.json ..." never loads PyQt5
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        from src.core.batch import main as batch_main
+        sys.exit(batch_main(sys.argv[2:]))
+
+    from PyQt5.QtWidgets import QApplication
+    from src.ui.main_window import MainWindow
+
     # 1. Create the Application
     app = QApplication(sys.argv)
-    
+
     # 2. Apply a Style (Optional, makes it look standard)
     app.setStyle("Fusion")
 
@@ -18,4 +24,4 @@ def main():
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,278 @@
+# src/core/batch.py
+# Headless batch runner: load -> normalize -> merge for many BOM/XY pairs.
+# Must never import PyQt5 (runs on build servers without a display).
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from src.core import instrumentation
+from src.core.file_loader import iter_file_batches, load_and_clean_file
+from src.core.normalizer import normalize_bom_data
+from src.core.logic_engine import perform_merge_and_validation
+from src.core.chunked_merge import DEFAULT_MEMORY_MB, merge_in_partitions, partition_plan
+from src.core.exporter import export_placement_chunks
+from src.core.schema import apply_schema
+from src.core.collisions import find_collisions, DEFAULT_MIN_DISTANCE
+from src.core.panelize import panelize, panel_definition
+
+COUNT_COLUMNS = ["matched", "xy_only", "bom_only", "ignored", "critical", "collisions", "duplicates"]
+SUMMARY_COLUMNS = [
+    "name", "status", "bom", "xy", "matched", "xy_only", "bom_only",
+    "ignored", "critical", "collisions", "duplicates", "seconds", "output", "error", "warning",
+]
+
+def load_manifest(manifest_path, mapping_path=None):
+    """
+    Reads a JSON manifest:
+        {
+          "mapping": {...},            # optional if --mapping is given; may set
+                                       # "Coordinate Units" / "Output Units" /
+                                       # "Duplicate Refs"
+          "delimiter": ",",            # optional, default ','
+          "min_distance": 0.1,         # optional, collision check distance (output units)
+          "panel": {"rows": 2, ...},   # optional, step-and-repeat (see panelize)
+          "memory_mb": 512,            # optional, memory budget (default 512): larger
+                                       # XY files use the chunked merge (see run_job)
+          "jobs": [
+            {"name": "rev_a", "bom": "a/bom.xlsx", "xy": "a/xy.txt"},
+            ...
+          ]
+        }
+    A job may override "mapping", "delimiter", "min_distance", "panel" and "memory_mb".
+    Relative paths are resolved against the manifest's folder.
+    Returns: List of job dicts ready for run_job().
+    """
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    mapping = manifest.get("mapping")
+    if mapping_path:
+        with open(mapping_path) as f:
+            mapping = json.load(f)
+
+    jobs = []
+    used_names = set()
+    for i, entry in enumerate(manifest.get("jobs", [])):
+        job_mapping = entry.get("mapping", mapping)
+        if not job_mapping or not job_mapping.get("Reference Designator"):
+            raise ValueError(f"Job {i}: no column mapping with a 'Reference Designator' entry.")
+
+        bom = os.path.join(base_dir, entry["bom"])
+        name = _safe_name(entry.get("name") or os.path.splitext(os.path.basename(bom))[0])
+        while name in used_names:
+            name = f"{name}_{i}"
+        used_names.add(name)
+
+        jobs.append({
+            "name": name,
+            "bom": bom,
+            "xy": os.path.join(base_dir, entry["xy"]),
+            "mapping": job_mapping,
+            "delimiter": entry.get("delimiter", manifest.get("delimiter", ",")),
+            "min_distance": entry.get("min_distance", manifest.get("min_distance", DEFAULT_MIN_DISTANCE)),
+        })
+        panel = entry.get("panel", manifest.get("panel"))
+        if panel:
+            jobs[-1]["panel"] = panel_definition(panel) # Fail early on bad settings
+        memory_mb = entry.get("memory_mb", manifest.get("memory_mb"))
+        if memory_mb:
+            if panel:
+                raise ValueError(f"Job {i}: a panel needs the whole board in memory (no 'memory_mb').")
+            if memory_mb <= 0:
+                raise ValueError(f"Job {i}: 'memory_mb' must be positive.")
+            jobs[-1]["memory_mb"] = memory_mb
+    return jobs
+
+def run_job(job, out_dir):
+    """
+    Runs one BOM/XY pair through the pipeline and writes <out_dir>/<name>/
+    (merged.csv, placements.xlsx, result.json).
+    job["profile"] ("time" or "memory") adds the per-stage records to the
+    result under "stages". An XY file too large to merge within
+    job["memory_mb"] (DEFAULT_MEMORY_MB if unset) is streamed through the
+    chunked merge and the partitions straight into the workbook; collisions
+    are not checked then. Panels are always merged in memory.
+    Never raises: failures are returned in the result dict.
+    """
+    result = {key: None for key in SUMMARY_COLUMNS}
+    result.update(name=job["name"], bom=job["bom"], xy=job["xy"], status="ERROR", error="", warning="")
+    profile = job.get("profile")
+    if profile:
+        instrumentation.clear()
+        instrumentation.enable(memory=profile == "memory")
+    start = time.perf_counter()
+
+    try:
+        mapping = job["mapping"]
+        job_dir = os.path.join(out_dir, job["name"])
+        os.makedirs(job_dir, exist_ok=True)
+        output = os.path.join(job_dir, "merged.csv")
+        workbook = os.path.join(job_dir, "placements.xlsx")
+
+        memory_mb = job.get("memory_mb") or DEFAULT_MEMORY_MB
+        partitions, batch_rows = partition_plan(job["xy"], memory_mb)
+        if partitions > 1 and not job.get("panel"):
+            # Does not fit the budget: both files in batches, merged partition
+            # by partition, each partition appended to both outputs
+            frames = _merged_partitions(job, memory_mb, batch_rows, output, result)
+            export_placement_chunks(frames, workbook, total_frames=partitions)
+            result["output"] = output
+        else:
+            bom_df = load_and_clean_file(job["bom"])
+            xy_df = load_and_clean_file(job["xy"])
+            ref_col = _find_ref_column(bom_df, mapping)
+            clean_bom_df = normalize_bom_data(bom_df, ref_col, job["delimiter"])
+            merged_df = apply_schema(perform_merge_and_validation(clean_bom_df, xy_df, mapping), mapping)
+            n_duplicates = len(merged_df.attrs["duplicates"])
+            if job.get("panel"):
+                merged_df = panelize(merged_df, job["panel"])
+            merged_df.to_csv(output, index=False)
+            export_placement_chunks([merged_df], workbook) # Continuation sheets past Excel's row limit
+
+            result.update(
+                _status_counts(merged_df),
+                collisions=len(find_collisions(merged_df, job.get("min_distance", DEFAULT_MIN_DISTANCE))),
+                duplicates=n_duplicates,
+                output=output,
+                warning=merged_df.attrs["units"]["warning"] or "",
+            )
+        # Same rule as the dashboard: unignored XY_ONLY parts block export
+        result["status"] = "OK" if result["critical"] == 0 else "CRITICAL"
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    if profile:
+        result["stages"] = instrumentation.records()
+        instrumentation.disable()
+    if result["output"]:
+        with open(os.path.join(os.path.dirname(result["output"]), "result.json"), "w") as f:
+            json.dump(result, f, indent=2)
+    return result
+
+def run_batch(jobs, out_dir, workers=None, progress=print):
+    """
+    Runs all jobs in a process pool (workers=None -> one per CPU).
+    Writes summary.json and summary.csv to out_dir.
+    Returns: Summary DataFrame in manifest order.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    results = {}
+
+    if workers == 1:
+        # No pool: easier to debug and profile
+        for job in jobs:
+            results[job["name"]] = run_job(job, out_dir)
+            _report(progress, results[job["name"]], len(results), len(jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(run_job, job, out_dir): job for job in jobs}
+            for future in as_completed(futures):
+                result = future.result()
+                results[result["name"]] = result
+                _report(progress, result, len(results), len(jobs))
+
+    summary_df = pd.DataFrame([results[job["name"]] for job in jobs], columns=SUMMARY_COLUMNS)
+    summary_df = summary_df.astype({col: "Int64" for col in COUNT_COLUMNS}) # Failed jobs have no counts
+    summary_df.to_csv(os.path.join(out_dir, "summary.csv"), index=False)
+    with open(os.path.join(out_dir, "summary.json"), "w") as f:
+        json.dump({
+            "jobs": len(jobs),
+            "ok": int((summary_df["status"] == "OK").sum()),
+            "critical": int((summary_df["status"] == "CRITICAL").sum()),
+            "errors": int((summary_df["status"] == "ERROR").sum()),
+            "results": [results[job["name"]] for job in jobs],
+        }, f, indent=2)
+    return summary_df
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="main.py batch",
+        description="Merge many BOM/XY pairs without the GUI.",
+    )
+    parser.add_argument("manifest", help="JSON manifest listing the BOM/XY pairs")
+    parser.add_argument("--mapping", help="JSON column mapping (as saved from the mapping screen)")
+    parser.add_argument("--out", default="batch_results", help="Output folder (default: batch_results)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--profile", choices=["time", "memory"],
+                        help="Record per-stage timings (and peak memory) into result.json / summary.json")
+    parser.add_argument("--memory-mb", type=float, default=None,
+                        help=f"Memory budget (default: {DEFAULT_MEMORY_MB}); larger XY files use the chunked merge "
+                             "(no collision check)")
+    args = parser.parse_args(argv)
+
+    jobs = load_manifest(args.manifest, args.mapping)
+    for job in jobs:
+        job["profile"] = args.profile
+        if args.memory_mb:
+            if job.get("panel"):
+                parser.error(f"{job['name']}: --memory-mb cannot be used with a panel")
+            job["memory_mb"] = args.memory_mb
+    summary_df = run_batch(jobs, args.out, workers=args.workers)
+
+    failed = summary_df["status"] != "OK"
+    print(f"Done: {len(summary_df) - failed.sum()} OK, {failed.sum()} need attention. Summary in {args.out}")
+    return 1 if failed.any() else 0
+
+def _find_ref_column(bom_df, mapping):
+    """Mapped Reference Designator column, else the same auto-detect as the import screen."""
+    ref_col = mapping.get("Reference Designator")
+    if ref_col in bom_df.columns:
+        return ref_col
+    possible_cols = [c for c in bom_df.columns if "ref" in c.lower() or "des" in c.lower()]
+    if not possible_cols:
+        raise ValueError("Could not find a 'Reference' column in the BOM.")
+    return possible_cols[0]
+
+def _normalized_batches(job, batch_rows):
+    """normalize_bom_data per batch of the BOM file (each row expands on its own)."""
+    ref_col = None
+    for bom_df in iter_file_batches(job["bom"], batch_rows):
+        ref_col = ref_col or _find_ref_column(bom_df, job["mapping"])
+        yield normalize_bom_data(bom_df, ref_col, job["delimiter"])
+
+def _merged_partitions(job, memory_mb, batch_rows, output, result):
+    """
+    merge_in_partitions over the job's files: each partition is appended to
+    output and its counts added to result before it is handed on.
+    """
+    result.update({key: 0 for key in COUNT_COLUMNS if key != "collisions"})
+    header = True
+    bom_batches = _normalized_batches(job, batch_rows)
+    for merged_df in merge_in_partitions(bom_batches, job["xy"], job["mapping"], memory_mb):
+        merged_df.to_csv(output, mode="w" if header else "a", header=header, index=False)
+        header = False
+        for key, value in _status_counts(merged_df).items():
+            result[key] += value
+        result["duplicates"] += len(merged_df.attrs["duplicates"])
+        result["warning"] = merged_df.attrs["units"]["warning"] or ""
+        yield merged_df
+    if header:
+        pd.DataFrame().to_csv(output, index=False) # No rows on either side
+
+def _status_counts(merged_df):
+    status = merged_df["Status"]
+    ignored = merged_df["Is Ignored"]
+    return {
+        "matched": int((status == "MATCHED").sum()),
+        "xy_only": int((status == "XY_ONLY").sum()),
+        "bom_only": int((status == "BOM_ONLY").sum()),
+        "ignored": int(ignored.sum()),
+        "critical": int(((status == "XY_ONLY") & ~ignored).sum()),
+    }
+
+def _safe_name(name):
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', name).strip('_') or "job"
+
+def _report(progress, result, done, total):
+    if progress:
+        detail = result["error"] or f"{result['matched']} matched, {result['critical']} critical"
+        progress(f"[{done}/{total}] {result['name']}: {result['status']} ({detail}) in {result['seconds']}s")
+        if result["warning"]:
+            progress(f"    {result['warning']}")
@@ -0,0 +1,421 @@
+# src/core/centroid.py
+# Native parsers for CAD centroid (pick and place) reports: KiCad .pos,
+# Altium Pick Place (banner block + quoted fields), Cadence place_txt and
+# fixed-width Mentor/Cadence reports.
+#
+# detect_format() looks at the first lines of a file and returns a format
+# dict (or None: not a report we know, the generic loader reads it).
+# read_centroid() then streams the file in batches of lines, straight into
+# typed columns: ref, x, y, rotation and side come out as str / float64
+# under the names below, with the unit the report states in the coordinate
+# headers ("Mid X (mil)"), where schema.apply_schema picks it up.
+# iter_centroid() hands out the typed batches one at a time.
+import csv
+import io
+import re
+import numpy as np
+import pandas as pd
+
+from src.core.readers import ARROW_ENCODINGS
+from src.core.units import HEADER_UNIT_PATTERN, NUMBER_PATTERN, UNIT_ALIASES, convert_coordinates, parse_numbers
+
+# Optional: Arrow string kernels split a whole batch of lines at once
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa_csv = None
+
+# Extensions worth sniffing (anything else goes to the generic loader)
+CENTROID_EXTENSIONS = (".pos", ".txt", ".csv", ".rpt")
+# Backend name in stage details, and for load_and_clean_file(reader=...)
+CENTROID_READER = "centroid"
+
+# Lines a detector looks at (Altium banners are ~15 lines)
+DETECT_LINES = 60
+# Data lines used to check a header candidate and to find fixed-width columns
+SAMPLE_LINES = 50
+# Text read per batch (whole lines) before it is split and converted
+BATCH_BYTES = 16 << 20
+
+# Output columns (the names the mapping screen auto-selects)
+REF = "Designator"
+X = "Mid X"
+Y = "Mid Y"
+ROTATION = "Rotation"
+SIDE = "Layer"
+TOP = "Top"
+BOTTOM = "Bottom"
+
+# Header spellings per output column, compared lowercase, letters/digits only,
+# without a unit suffix ("Center-X(mm)" -> "centerx")
+COLUMN_NAMES = {
+    REF: {"ref", "refdes", "designator", "reference", "referencedesignator", "partreference", "compname"},
+    X: {"posx", "x", "midx", "centerx", "centrex", "centroidx", "locationx", "xlocation", "xloc", "symx", "xcoord"},
+    Y: {"posy", "y", "midy", "centery", "centrey", "centroidy", "locationy", "ylocation", "yloc", "symy", "ycoord"},
+    ROTATION: {"rot", "rotation", "angle", "orientation", "symrotate", "symrotation"},
+    SIDE: {"side", "layer", "tb", "mirror", "mirrored", "symmirror"},
+}
+# Side columns holding a mirror flag instead of a layer name
+MIRROR_COLUMNS = {"mirror", "mirrored", "symmirror"}
+MIRROR_FLAGS = {"m", "y", "yes", "mirror", "mirrored", "true", "1"}
+
+# Arrow reads raw lines as one "column": a separator that never occurs in text
+LINE_SEPARATOR = "\x1f"
+# Open-ended last fixed-width column
+MAX_LINE = 1 << 30
+
+# "## Unit = mm, Angle = deg.", "Units used: mm", "UUNITS = MILS", "Units: mils"
+UNIT_PATTERN = re.compile(r'\bu?units?(?:\s+used)?\s*[:=]\s*"?([A-Za-z]+)', re.IGNORECASE)
+# Cadence place_txt: no header, "UUNITS = MILS" then REFDES X Y ROTATION [m] SYMBOL
+CADENCE_PATTERN = re.compile(r'^\s*UUNITS\s*=', re.IGNORECASE)
+CADENCE_COLUMNS = [REF, X, Y, ROTATION, SIDE, "Symbol"]
+# Underline below a fixed-width header ("-------- ------")
+RULE_PATTERN = re.compile(r'^[\s=-]*-[\s=-]*$')
+# Skipped in fixed-width data: blank lines, underlines and "=====" separators
+RULE_CHARS = " \t\r\n=-"
+RULE_CHARS_PATTERN = r'^[\s=-]*$'
+_NUMBER = re.compile(r'^\s*' + NUMBER_PATTERN)
+
+def detect_format(lines):
+    """
+    Recognizes a centroid report from its first lines (newlines stripped).
+    Returns: None, or {"format", "layout", "delimiter", "names", "columns",
+             "mirror", "unit", "skip_lines", "spans"} for read_centroid:
+             names are the file's headers, columns {output column: index},
+             skip_lines the lines up to and including the header.
+    """
+    unit = None
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if not stripped:
+            continue
+        found = UNIT_PATTERN.search(stripped)
+        if found and unit is None:
+            unit = UNIT_ALIASES.get(found.group(1).lower())
+        data = lines[i + 1:i + 1 + SAMPLE_LINES]
+
+        if CADENCE_PATTERN.match(stripped):
+            report = _report("cadence", "cadence", CADENCE_COLUMNS, unit, i + 1)
+        elif stripped.startswith("#"):
+            # KiCad: "# Ref Val Package PosX PosY Rot Side", data split on blanks
+            report = _report("kicad", "whitespace", stripped.lstrip("#").split(), unit, i + 1)
+        elif stripped.startswith('"'):
+            # Altium: quoted header, fields separated by commas or blanks
+            delimiter = "," if re.match(r'^"[^"]*"\s*,', stripped) else " "
+            names = next(csv.reader([stripped], delimiter=delimiter, skipinitialspace=True))
+            report = _report("altium", "delimited", names, unit, i + 1, delimiter)
+        elif stripped.lower().replace(" ", "").startswith("ref,val,package,posx,posy"):
+            report = _report("kicad", "delimited", next(csv.reader([stripped])), unit, i + 1, ",")
+        elif not any(d in stripped for d in ",\t;|"):
+            report = _fixed_width_report(lines, i, unit)
+        else:
+            report = None
+
+        row = _first_row(data, report) if report is not None else None
+        if row is not None and all(_NUMBER.match(row[report["columns"][c]]) for c in (X, Y)):
+            if report["unit"] is None:
+                # No unit line or header unit: a suffix on the values ("1000mil")
+                report["unit"] = UNIT_ALIASES.get(_NUMBER.sub("", row[report["columns"][X]]).strip().lower())
+            return report
+    return None
+
+def read_centroid(file_path, report, encoding, max_rows=None, progress=None):
+    """
+    Streams a detected report into typed columns: the file is read in
+    batches of whole lines, each batch is split by a vectorized parser
+    (Arrow string kernels if pyarrow is installed, else pandas' C
+    tokenizer) and its numbers are converted before the next batch is read.
+    max_rows: Stop after that many parts (preview).
+    progress(message, percent): called after every batch (may raise to stop).
+    Returns: DataFrame with REF, X, Y (float64, unit in the header),
+             ROTATION (float64), SIDE ("Top"/"Bottom") where the report has
+             them, then the report's other columns as strings (headers as
+             in the file: not unique yet).
+    """
+    typed = []
+    n_rows = 0
+    for batch in iter_centroid(file_path, report, encoding):
+        if max_rows is not None:
+            batch = batch.iloc[:max_rows - n_rows]
+        typed.append(batch)
+        n_rows += len(batch)
+        if max_rows is not None and n_rows >= max_rows:
+            break
+        if progress:
+            progress(f"Parsing file... {n_rows:,} parts", -1)
+    if not typed:
+        return _typed_batch(report, _split_lines([], report))
+    return pd.concat(typed, ignore_index=True)
+
+def iter_centroid(file_path, report, encoding, batch_bytes=BATCH_BYTES):
+    """
+    Yields the typed columns of read_centroid one batch (about batch_bytes
+    of text) at a time, for callers that never hold the whole file.
+    """
+    n_rows = 0
+    if pa_csv is not None and encoding in ARROW_ENCODINGS:
+        try:
+            for batch in _arrow_batches(file_path, report, encoding, batch_bytes):
+                n_rows += len(batch)
+                yield _typed_batch(report, batch)
+            return
+        except pa.ArrowInvalid:
+            pass # e.g. bytes invalid in the sniffed encoding: Python decodes them with replacement
+    # Restart on the text parser, after the parts already yielded
+    for batch in _text_batches(file_path, report, encoding, batch_bytes):
+        if n_rows:
+            skipped = min(n_rows, len(batch))
+            batch = batch.iloc[skipped:].reset_index(drop=True)
+            n_rows -= skipped
+            if not len(batch):
+                continue
+        yield _typed_batch(report, batch)
+
+def _typed_batch(report, batch):
+    """Types one batch of split fields and names its columns (outputs first, then the rest in file order)."""
+    columns = report["columns"]
+    if report["format"] == "cadence":
+        # REFDES X Y ROTATION [m] SYMBOL: without the mirror flag the symbol is field 4
+        unflagged = (batch[5] == "") & ~batch[4].str.lower().isin(MIRROR_FLAGS)
+        batch.loc[unflagged, 5] = batch.loc[unflagged, 4]
+        batch.loc[unflagged, 4] = ""
+    for column in (X, Y, ROTATION):
+        if column in columns and batch[columns[column]].dtype != np.float64:
+            unit = report["unit"] if column != ROTATION else None
+            batch[columns[column]] = _to_float(batch[columns[column]], unit)
+    if SIDE in columns:
+        batch[columns[SIDE]] = _side_labels(batch[columns[SIDE]], report["mirror"])
+
+    order = list(columns.values()) + [i for i in range(len(report["names"])) if i not in columns.values()]
+    names = [f"{c} ({report['unit']})" if c in (X, Y) and report["unit"] else c for c in columns]
+    batch = batch[order]
+    batch.columns = names + [report["names"][i] for i in order[len(names):]]
+    return batch
+
+def _text_batches(file_path, report, encoding, batch_bytes=BATCH_BYTES):
+    """Yields one DataFrame (fields 0..n-1) per batch of data lines, split by pandas."""
+    numeric = [report["columns"][c] for c in (X, Y, ROTATION) if c in report["columns"]]
+    with open(file_path, encoding=encoding, errors="replace") as f:
+        for _ in range(report["skip_lines"]):
+            f.readline()
+        while True:
+            lines = f.readlines(batch_bytes)
+            if not lines:
+                break
+            try:
+                yield _split_lines(lines, report, numeric)
+            except ValueError: # Unit suffixes, blanks: split as text, converted by the caller
+                yield _split_lines(lines, report)
+
+def _arrow_batches(file_path, report, encoding, batch_bytes=BATCH_BYTES):
+    """Arrow reads the lines below the header in blocks; each block is split at once."""
+    read_options = pa_csv.ReadOptions(column_names=["line"], block_size=batch_bytes,
+                                      encoding=ARROW_ENCODINGS[encoding])
+    parse_options = pa_csv.ParseOptions(delimiter=LINE_SEPARATOR, quote_char=False, ignore_empty_lines=True)
+    convert_options = pa_csv.ConvertOptions(column_types={"line": pa.string()}, strings_can_be_null=False)
+    with open(file_path, "rb") as f:
+        for _ in range(report["skip_lines"]):
+            f.readline()
+        for block in pa_csv.open_csv(f, read_options, parse_options, convert_options):
+            lines = block.column(0)
+            fields = _split_arrow(lines, report)
+            if fields is None:
+                fields = _split_lines([line + "\n" for line in lines.to_pylist()], report)
+            yield fields
+
+def _split_arrow(lines, report):
+    """
+    Arrow version of _split_lines, for one block of lines. Strings stay in
+    Arrow buffers (pandas "str" columns wrap them without a copy) and the
+    numeric fields are cast by Arrow.
+    Returns: DataFrame, or None if the block needs a real tokenizer (quoted
+             fields other than Altium's "a" "b" rows).
+    """
+    width = len(report["names"])
+    layout = report["layout"]
+    if layout in ("whitespace", "cadence") and _contains_byte(lines, b'"'):
+        return None
+    trimmed = pc.ascii_trim_whitespace(lines)
+    keep = pc.greater(pc.binary_length(trimmed), 0)
+    if layout == "whitespace":
+        keep = pc.and_(keep, pc.invert(pc.starts_with(trimmed, "#")))
+    elif layout == "fixed":
+        keep = pc.and_(keep, pc.invert(pc.match_substring_regex(trimmed, RULE_CHARS_PATTERN)))
+    if not pc.all(keep).as_py():
+        lines = lines.filter(keep)
+        trimmed = trimmed.filter(keep)
+
+    if layout == "fixed":
+        if pc.all(pc.string_is_ascii(lines)).as_py():
+            # Characters are bytes: slice the bytes, no UTF-8 decoding per line
+            data = lines.cast(pa.binary())
+            fields = [pc.binary_slice(data, a, b if b is not None else MAX_LINE).cast(pa.string())
+                      for a, b in report["spans"]]
+        else:
+            fields = [pc.utf8_slice_codeunits(lines, a, b) for a, b in report["spans"]]
+        fields = [pc.ascii_trim_whitespace(field) for field in fields]
+    else:
+        if layout == "delimited":
+            quoted = pc.and_(pc.starts_with(trimmed, '"'), pc.ends_with(trimmed, '"'))
+            if report["delimiter"] != " " or not pc.all(quoted).as_py():
+                return None
+            # "C1" "100nF" "Part, 0402" -> split between the quotes (wider gaps: regex, slower)
+            inner = pc.utf8_slice_codeunits(trimmed, 1, -1)
+            parts = pc.split_pattern(inner, '" "')
+            if not _all_width(parts, width):
+                parts = pc.split_pattern_regex(inner, r'"\s+"')
+        else:
+            parts = pc.ascii_split_whitespace(trimmed)
+        if not _all_width(parts, width):
+            # Ragged rows to the header width: missing fields are "", extra ones dropped
+            parts = pc.list_slice(parts, 0, width, return_fixed_size_list=True)
+        flat = pc.fill_null(parts.flatten(), "")
+        fields = [flat.take(pa.array(np.arange(i, len(flat), width))) for i in range(width)]
+
+    numeric = {report["columns"][c] for c in (X, Y, ROTATION) if c in report["columns"]}
+    columns = {}
+    for i, field in enumerate(fields):
+        if i in numeric:
+            try:
+                columns[i] = pc.cast(field, pa.float64()).to_numpy(zero_copy_only=False)
+                continue
+            except pa.ArrowInvalid: # Unit suffixes, blanks: converted by the caller
+                pass
+        columns[i] = pd.array(field, dtype="str")
+    return pd.DataFrame(columns)
+
+def _all_width(parts, width):
+    lengths = pc.min_max(pc.list_value_length(parts))
+    return lengths["min"].as_py() == width and lengths["max"].as_py() == width
+
+def _contains_byte(strings, byte):
+    """Whether any string of an Arrow array may contain byte (scans the data buffer)."""
+    data = strings.buffers()[2]
+    return data is not None and bool((np.frombuffer(data, dtype=np.uint8) == byte[0]).any())
+
+def _report(fmt, layout, names, unit, skip_lines, delimiter=None, spans=None):
+    """Format dict for a header, or None if the header lacks ref, x or y."""
+    columns = {}
+    mirror = False
+    for i, name in enumerate(names):
+        key = _column_key(name)
+        for column, spellings in COLUMN_NAMES.items():
+            if column not in columns and key in spellings:
+                columns[column] = i
+                mirror = mirror or (column == SIDE and key in MIRROR_COLUMNS)
+                # No unit line above the header: "Center-X(mm)" names it
+                header_unit = HEADER_UNIT_PATTERN.search(str(name)) if column in (X, Y) else None
+                if unit is None and header_unit:
+                    unit = UNIT_ALIASES[header_unit.group(1).lower()]
+                break
+    if fmt == "cadence":
+        mirror = True
+    if not {REF, X, Y} <= columns.keys():
+        return None
+    return {"format": fmt, "layout": layout, "delimiter": delimiter, "names": list(names),
+            "columns": columns, "mirror": mirror, "unit": unit, "skip_lines": skip_lines, "spans": spans}
+
+def _column_key(name):
+    name = HEADER_UNIT_PATTERN.sub("", str(name))
+    return re.sub(r'[^a-z0-9]', "", name.lower())
+
+def _fixed_width_report(lines, index, unit):
+    """
+    Header at lines[index] of a column-aligned report. Column boundaries come
+    from the dash underline if there is one, else from the character
+    positions that are blank on the header and every sampled data line.
+    """
+    header = lines[index].rstrip()
+    below = lines[index + 1:index + 1 + SAMPLE_LINES]
+    skip_lines = index + 1
+    if below and RULE_PATTERN.match(below[0]):
+        starts = [m.start() for m in re.finditer(r'[-=]+', below[0])]
+        skip_lines += 1
+    else:
+        sample = [line.rstrip() for line in below if line.strip()]
+        width = max(len(line) for line in [header] + sample)
+        used = np.zeros(width + 1, dtype=bool)
+        for line in [header] + sample:
+            used[:len(line)] |= np.frombuffer(line.encode("utf-32-le"), dtype=np.uint32) != ord(" ")
+        starts = [i for i in range(width) if used[i] and (i == 0 or not used[i - 1])]
+    if len(starts) < 3:
+        return None
+    starts[0] = 0
+    spans = list(zip(starts, starts[1:] + [None]))
+    names = [header[a:b].strip() for a, b in spans]
+    return _report("fixed-width", "fixed", names, unit, skip_lines, spans=spans)
+
+def _first_row(lines, report):
+    """First data row below a header candidate as strings, or None."""
+    try:
+        batch = _split_lines(lines, report)
+    except ValueError: # Not the layout this header suggests (e.g. ragged quoting)
+        return None
+    return batch.iloc[0].tolist() if len(batch) else None
+
+def _split_lines(lines, report, numeric=()):
+    """
+    One batch of data lines -> DataFrame of str, one column per header
+    field (0..n-1). Comments, blank lines and underlines are skipped;
+    missing trailing fields are "", fields past the header are dropped.
+    numeric: Fields the tokenizer parses to float64 itself (ValueError if
+             one of them is not a plain number).
+    """
+    width = len(report["names"])
+    layout = report["layout"]
+    if layout == "fixed":
+        lines = [line for line in lines if line.strip(RULE_CHARS)]
+        lines = pd.Series(lines, dtype="str").str.rstrip("\r\n")
+        return pd.DataFrame({i: lines.str.slice(a, b).str.strip() for i, (a, b) in enumerate(report["spans"])})
+
+    if layout == "delimited" and report["delimiter"] != " ":
+        options = {"sep": report["delimiter"], "skipinitialspace": True}
+    else:
+        options = {"sep": r"\s+"} # C tokenizer's whitespace mode: runs of blanks, quotes honored
+    if layout == "whitespace":
+        lines = [line for line in lines if line[:1] != "#"] # KiCad comments ("## End")
+    text = "".join(lines)
+    if not text.strip():
+        return pd.DataFrame({i: pd.Series(dtype="str") for i in range(width)})
+    df = pd.read_csv(
+        io.StringIO(text),
+        header=None,
+        names=range(width),
+        usecols=range(width),
+        index_col=False,
+        dtype={i: np.float64 if i in numeric else str for i in range(width)},
+        na_filter=False, # "NA" is a part value here, not a missing one
+        float_precision="round_trip", # Same floats as float(text)
+        **options,
+    )
+    return df.fillna({i: "" for i in range(width) if i not in numeric})
+
+def _to_float(values, unit):
+    """
+    One batch of a numeric column. Plain numbers take a single cast;
+    values with a unit suffix ("1000mil") are converted to unit.
+    Returns: float64 array (NaN where no number was found).
+    """
+    try:
+        return values.astype(np.float64).to_numpy()
+    except ValueError:
+        if unit is None:
+            return parse_numbers(values).to_numpy()
+        return convert_coordinates(values, unit, target=unit)
+
+def _side_labels(values, mirror):
+    """Layer names / mirror flags -> "Top" / "Bottom" (few distinct values: mapped once)."""
+    labels = {}
+    for value in values.unique():
+        flag = value.strip().lower()
+        if mirror:
+            labels[value] = BOTTOM if flag in MIRROR_FLAGS else TOP
+        elif flag.startswith("t"):
+            labels[value] = TOP
+        elif flag.startswith("b"):
+            labels[value] = BOTTOM
+        else:
+            labels[value] = value
+    return values.map(labels).astype("str")
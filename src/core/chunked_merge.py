@@ -0,0 +1,174 @@
+# src/core/chunked_merge.py
+# Out-of-core merge for XY files too large to hold in memory (full-panel
+# centroid exports). The files are read in batches and both sides are
+# hash-partitioned on the join key into spill files on disk; then one
+# partition of each side is loaded at a time and joined like the in-memory
+# merge. A Ref Des always lands in the same partition on both sides, so
+# every partition's join (and duplicate handling) is complete on its own.
+import math
+import os
+import pickle
+import tempfile
+import pandas as pd
+
+from src.core.file_loader import iter_file_batches
+from src.core.instrumentation import stage
+from src.core.logic_engine import (
+    DEFAULT_DUPLICATE_POLICY, DUPLICATE_POLICIES, DUPLICATE_POLICY_KEY, DuplicateRefError,
+    find_xy_ref_column, join_keys, join_prepared, resolve_duplicates,
+)
+from src.core.schema import INPUT_UNITS_KEY, OUTPUT_UNITS_KEY, apply_schema
+from src.core.units import AUTO, DEFAULT_UNIT, detect_unit_from_evidence, extent_warning, unit_evidence
+
+DEFAULT_MEMORY_MB = 512
+# Memory while one partition is joined and typed, per byte of XY text in it
+# (str columns, both join inputs, the joined copy and the typed frame)
+JOIN_BYTES_PER_FILE_BYTE = 12
+# Memory per XY row while a batch is parsed and spilled
+BATCH_BYTES_PER_ROW = 1024
+MAX_BATCH_ROWS = 200_000
+
+def partition_plan(xy_path, memory_mb=DEFAULT_MEMORY_MB):
+    """
+    Partitions and XY batch size that keep one partition's join (and one
+    batch) within memory_mb. Python, pandas and pyarrow themselves (and the
+    allocators' reserves, ~100-200 MB) come on top.
+    Returns: (partitions, batch_rows)
+    """
+    budget = int(memory_mb * 1024 * 1024)
+    partitions = max(1, math.ceil(os.path.getsize(xy_path) * JOIN_BYTES_PER_FILE_BYTE / budget))
+    batch_rows = max(1_000, min(MAX_BATCH_ROWS, budget // BATCH_BYTES_PER_ROW))
+    return partitions, batch_rows
+
+def merge_in_partitions(bom_batches, xy_path, mapping, memory_mb=DEFAULT_MEMORY_MB, spill_dir=None, partitions=None):
+    """
+    apply_schema(perform_merge_and_validation(bom_df, xy_df, mapping)) for an
+    XY file that is only ever read in batches: same rows, same columns, but
+    handed out partition by partition (rows sorted by Ref Des within each
+    one). The spill files live in a temporary folder under spill_dir (system
+    temp if None), removed when the generator finishes or is closed.
+    The coordinate unit is detected once over the whole XY file, and the
+    "reject" duplicate policy raises DuplicateRefError before any partition
+    is handed out.
+    bom_batches: The normalized BOM as an iterable of DataFrames ([bom_df],
+                 or normalize_bom_data per batch of a large file: every row
+                 expands on its own).
+    partitions: Force the partition count (default: from partition_plan).
+    Yields: Typed DataFrames; attrs["duplicates"] holds the partition's
+            duplicate records, attrs["units"] the whole file's units.
+    """
+    policy = mapping.get(DUPLICATE_POLICY_KEY) or DEFAULT_DUPLICATE_POLICY
+    if policy not in DUPLICATE_POLICIES:
+        raise ValueError(f"Unknown duplicate policy: {policy}")
+    n_partitions, batch_rows = partition_plan(xy_path, memory_mb)
+    n_partitions = partitions or n_partitions
+
+    with tempfile.TemporaryDirectory(prefix="merge_spill_", dir=spill_dir) as tmp:
+        # 1. Spill both sides, partitioned on the join key
+        with stage("chunked_merge.spill", "XY") as s:
+            xy_template, evidence, s.rows = _spill_xy(xy_path, mapping, tmp, n_partitions, batch_rows)
+        with stage("chunked_merge.spill", "BOM") as s:
+            bom_template, s.rows = _spill_bom(bom_batches, mapping, tmp, n_partitions, batch_rows)
+
+        # 2. One unit for the whole file: partitions only see part of the board
+        schema_mapping = mapping
+        detected = None
+        if (mapping.get(INPUT_UNITS_KEY) or AUTO) == AUTO:
+            headers = [mapping.get(col) for col in ("Mid X", "Mid Y") if mapping.get(col) in xy_template.columns]
+            unit, reason = detect_unit_from_evidence(evidence, headers)
+            warning = None
+            if unit is None:
+                # Unlabelled: not converted, as in convert_columns
+                unit = mapping.get(OUTPUT_UNITS_KEY) or DEFAULT_UNIT
+                warning = extent_warning(evidence, unit)
+            schema_mapping = {**mapping, INPUT_UNITS_KEY: unit}
+            detected = {"reason": reason, "warning": warning}
+
+        sides = [(os.path.join(tmp, "xy"), xy_template, "XY"), (os.path.join(tmp, "bom"), bom_template, "BOM")]
+        if policy == "reject":
+            with stage("chunked_merge.duplicates"):
+                reports = [resolve_duplicates(_load(prefix, p, template), '_JOIN_KEY', policy, source)[1]
+                           for p in range(n_partitions) for prefix, template, source in sides]
+                duplicates = pd.concat(reports, ignore_index=True)
+            if len(duplicates):
+                raise DuplicateRefError(duplicates)
+
+        # 3. Join partition by partition
+        for p in range(n_partitions):
+            with stage("chunked_merge.join", f"{p + 1}/{n_partitions}") as s:
+                prepared = [resolve_duplicates(_load(prefix, p, template), '_JOIN_KEY', policy, source)
+                            for prefix, template, source in sides]
+                (xy_side, xy_report), (bom_side, bom_report) = prepared
+                s.rows = len(xy_side) + len(bom_side)
+                if not s.rows:
+                    continue
+                duplicates = pd.concat([xy_report, bom_report], ignore_index=True)
+                frame = apply_schema(join_prepared(xy_side, bom_side, duplicates, mapping), schema_mapping)
+                del prepared, xy_side, bom_side
+            if detected is not None:
+                frame.attrs["units"].update(detected)
+            yield frame
+
+def _spill_xy(xy_path, mapping, tmp, n_partitions, batch_rows):
+    """
+    Streams the XY file into its partitions, collecting the unit evidence of
+    the mapped coordinate columns on the way.
+    Returns: (empty frame with the spilled columns, unit evidence, rows)
+    """
+    template = None
+    evidence = None
+    rows = 0
+    for batch in iter_file_batches(xy_path, batch_rows):
+        if template is None:
+            xy_key = find_xy_ref_column(batch, mapping.get("Reference Designator"))
+            coordinate_cols = [mapping.get(col) for col in ("Mid X", "Mid Y") if mapping.get(col) in batch.columns]
+        evidence = unit_evidence([batch[col] for col in coordinate_cols], evidence)
+        batch = batch.assign(_JOIN_KEY=join_keys(batch[xy_key]))
+        if template is None:
+            template = batch.iloc[:0]
+        _spill(batch, os.path.join(tmp, "xy"), n_partitions)
+        rows += len(batch)
+    if template is None:
+        # Nothing below the header (or no header): same error as the in-memory merge
+        find_xy_ref_column(pd.DataFrame(), mapping.get("Reference Designator"))
+    return template, evidence, rows
+
+def _spill_bom(bom_batches, mapping, tmp, n_partitions, batch_rows):
+    """Returns: (empty frame with the spilled columns, rows)"""
+    bom_ref_col = mapping.get("Reference Designator")
+    template = pd.DataFrame({'_JOIN_KEY': pd.Series(dtype="str")}) # BOM without rows
+    rows = 0
+    for bom_df in bom_batches:
+        keyed = bom_df.assign(_JOIN_KEY=join_keys(bom_df[bom_ref_col]))
+        template = keyed.iloc[:0]
+        for start in range(0, len(keyed), batch_rows):
+            _spill(keyed.iloc[start:start + batch_rows], os.path.join(tmp, "bom"), n_partitions)
+        rows += len(keyed)
+    return template, rows
+
+def _spill(batch, prefix, n_partitions):
+    """
+    Appends each row of batch to the spill file of its key's partition
+    (<prefix>_<partition>.pkl). Rows keep their order within a partition,
+    so "keep_first" keeps the same row as the in-memory merge.
+    Pickle: exact dtypes, and frames can be appended to an open file.
+    """
+    partition = pd.util.hash_pandas_object(batch['_JOIN_KEY'], index=False).to_numpy() % n_partitions
+    for p, part in batch.groupby(partition, sort=False):
+        with open(f"{prefix}_{p}.pkl", "ab") as f:
+            pickle.dump(part.reset_index(drop=True), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+def _load(prefix, p, template):
+    """Returns: Every frame spilled to partition p, in spill order (template if none)."""
+    parts = []
+    path = f"{prefix}_{p}.pkl"
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            while True:
+                try:
+                    parts.append(pickle.load(f))
+                except EOFError:
+                    break
+    if not parts:
+        return template
+    return pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
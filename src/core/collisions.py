@@ -0,0 +1,118 @@
+# src/core/collisions.py
+# Placement collision check: parts on the same layer closer than a distance.
+import numpy as np
+import pandas as pd
+
+from src.core.instrumentation import instrumented
+from src.core.schema import NUMERIC_COLUMNS
+from src.core.units import parse_numbers
+
+# Default minimum centre-to-centre distance, in apply_schema's output unit (mm by default)
+DEFAULT_MIN_DISTANCE = 0.1
+
+# Grid cells per axis are capped so (layer, cell x, cell y) fits in one int64 key
+MAX_CELLS_PER_AXIS = 1 << 20
+
+# Neighbour cells checked from each cell: itself plus half of the 8 around it,
+# so every pair of adjacent cells is visited exactly once
+NEIGHBOUR_OFFSETS = [(0, 0), (1, -1), (1, 0), (1, 1), (0, 1)]
+
+PAIR_COLUMNS = ["Ref Des A", "Ref Des B", "Layer", "Distance", "Row A", "Row B"]
+
+@instrumented("collisions.find")
+def find_collisions(df, min_distance=DEFAULT_MIN_DISTANCE):
+    """
+    Flags pairs of placed parts on the same layer whose centres are closer
+    than min_distance. Uses a uniform grid hash (cell size >= min_distance),
+    so only parts in neighbouring cells are compared: near-linear instead
+    of comparing every pair.
+    Ignored parts and rows without coordinates are skipped. Layers are
+    compared by their first letter (Top/TopLayer/T -> T).
+    Returns: DataFrame with PAIR_COLUMNS (Row A/B are positions into df),
+             closest pairs first.
+    """
+    if min_distance <= 0:
+        raise ValueError("Minimum distance must be greater than 0.")
+
+    x = _coordinates(df, "Mid X")
+    y = _coordinates(df, "Mid Y")
+    layer = df["Layer"].astype(str).str.strip().str.upper().str[:1].fillna("")
+    placed = np.isfinite(x) & np.isfinite(y)
+    if "Is Ignored" in df.columns:
+        placed &= ~df["Is Ignored"].to_numpy(dtype=bool)
+
+    rows = np.flatnonzero(placed)
+    if len(rows) < 2:
+        return pd.DataFrame(columns=PAIR_COLUMNS)
+    x, y = x[rows], y[rows]
+    layer_codes, layer_names = pd.factorize(layer.to_numpy()[rows])
+
+    # 1. Grid cell of every part (cells grow past min_distance on huge boards)
+    span = max(x.max() - x.min(), y.max() - y.min())
+    cell_size = max(min_distance, span / (MAX_CELLS_PER_AXIS - 3))
+    # +1 leaves room for the -1 neighbour offset
+    cx = np.floor((x - x.min()) / cell_size).astype(np.int64) + 1
+    cy = np.floor((y - y.min()) / cell_size).astype(np.int64) + 1
+    width = int(cx.max()) + 2
+    height = int(cy.max()) + 2
+
+    # 2. Parts sorted by cell key: each cell is one contiguous run
+    #    key = (layer * width + cell x) * height + cell y, so a neighbour cell
+    #    is just key + dx * height + dy (the padding keeps it on the same layer)
+    keys = (layer_codes.astype(np.int64) * width + cx) * height + cy
+    order = np.argsort(keys, kind="stable")
+    cells, run_start, cell_of, run_count = np.unique(
+        keys[order], return_index=True, return_inverse=True, return_counts=True
+    )
+
+    # 3. For each neighbour offset, pair every part with the run of its neighbour cell
+    found_a, found_b, found_d = [], [], []
+    for dx, dy in NEIGHBOUR_OFFSETS:
+        # Sorted needles into sorted cells: one cheap pass per offset
+        target = cells + dx * height + dy
+        target_pos = np.minimum(np.searchsorted(cells, target), len(cells) - 1)
+        has_target = cells[target_pos] == target
+
+        part_target = target_pos[cell_of] # Per part (sorted order)
+        counts = np.where(has_target[cell_of], run_count[part_target], 0)
+        if not counts.any():
+            continue
+
+        a = np.repeat(np.arange(len(order)), counts)
+        first = np.cumsum(counts) - counts
+        b = np.repeat(run_start[part_target], counts) + (np.arange(len(a)) - np.repeat(first, counts))
+        if (dx, dy) == (0, 0):
+            keep = a < b # Same cell: each pair once, no self pairs
+            a, b = a[keep], b[keep]
+        a, b = order[a], order[b]
+
+        distance = np.hypot(x[a] - x[b], y[a] - y[b])
+        close = distance < min_distance
+        found_a.append(a[close])
+        found_b.append(b[close])
+        found_d.append(distance[close])
+
+    if not found_a:
+        return pd.DataFrame(columns=PAIR_COLUMNS)
+    a = np.concatenate(found_a)
+    b = np.concatenate(found_b)
+    distance = np.concatenate(found_d)
+    by_distance = np.argsort(distance, kind="stable")
+    a, b, distance = a[by_distance], b[by_distance], distance[by_distance]
+
+    refs = df["Ref Des"].to_numpy()
+    return pd.DataFrame({
+        "Ref Des A": refs[rows[a]],
+        "Ref Des B": refs[rows[b]],
+        "Layer": layer_names[layer_codes[a]],
+        "Distance": distance.round(4),
+        "Row A": rows[a],
+        "Row B": rows[b],
+    })
+
+def _coordinates(df, text_col):
+    """Float column from apply_schema if present, else parsed from the text."""
+    numeric_col = NUMERIC_COLUMNS[text_col]
+    if numeric_col in df.columns:
+        return df[numeric_col].to_numpy(dtype=np.float64)
+    return parse_numbers(df[text_col]).to_numpy()
@@ -0,0 +1,252 @@
+# src/core/exporter.py
+import os
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+# Columns of the placement sheets, in output order
+EXPORT_COLUMNS = [
+    "Ref Des", "Part Number", "Value", "Footprint",
+    "Mid X", "Mid Y", "Rotation", "Layer", "Description",
+]
+EXCEPTION_COLUMNS = ["Ref Des", "Status", "Reason"] + EXPORT_COLUMNS[1:]
+
+SHEET_TOP = "Top"
+SHEET_BOTTOM = "Bottom"
+SHEET_EXCEPTIONS = "Exceptions"
+EXCEPTION_REASONS = np.array(
+    ["In XY, missing from BOM", "In BOM, no placement", "Unknown layer", "Unknown status"], dtype=object
+)
+SHEET_COLUMNS = {
+    SHEET_TOP: EXPORT_COLUMNS,
+    SHEET_BOTTOM: EXPORT_COLUMNS,
+    SHEET_EXCEPTIONS: EXCEPTION_COLUMNS,
+}
+
+# Headers that name the coordinate unit when it is known ("Mid X (mil)")
+COORDINATE_COLUMNS = ["Mid X", "Mid Y"]
+
+# Rows are handed to xlsxwriter in chunks of this size (bounds the temp lists)
+WRITE_CHUNK_ROWS = 10_000
+# Excel's rows per worksheet (header included)
+SHEET_MAX_ROWS = 1_048_576
+
+def split_for_export(df):
+    """
+    Splits the dashboard's master_df into the three output sheets.
+    Top/Bottom: MATCHED parts by Layer (values starting with T / B).
+    Exceptions: everything else (XY_ONLY, BOM_ONLY, unknown layer) with a Reason.
+    Ignored (DNI) rows are left out of every sheet.
+    Returns: {sheet name: DataFrame}
+    """
+    frames = {}
+    for name, (rows, reason) in _plan_sheets(df).items():
+        sheet_df = df.iloc[rows]
+        if reason is not None:
+            sheet_df = sheet_df.assign(Reason=EXCEPTION_REASONS[reason])
+        columns = SHEET_COLUMNS[name]
+        frames[name] = pd.DataFrame({
+            label: sheet_df[col] if col in sheet_df.columns else ""
+            for col, label in zip(columns, _header(columns, _text_unit(df)))
+        })
+    return frames
+
+def export_placements(df, xlsx_path, write_csv=False, write_parquet=False, progress=None):
+    """
+    Writes the merged placement file.
+    The workbook is streamed with xlsxwriter's constant_memory mode: rows are
+    flushed to disk as they are written, and each chunk is read straight from
+    df by row position, so memory does not grow with the row count. A sheet
+    that reaches Excel's row limit continues on "<name> (2)", ... (panels).
+    Optional CSV/Parquet copies go next to the workbook as
+    <name>_<Sheet>.csv / .parquet.
+    progress(message, percent) is called after every written chunk; if it
+    raises (e.g. user cancelled) the partial workbook is deleted.
+    Returns: {sheet name: row count}
+    """
+    plan = _plan_sheets(df)
+    total_rows = max(1, sum(len(rows) for rows, _ in plan.values()))
+    written = 0
+
+    def chunk_written(name, n_rows):
+        nonlocal written
+        written += n_rows
+        if progress:
+            progress(f"Writing {name} sheet...", int(100 * written / total_rows))
+
+    book = _PlacementWorkbook(xlsx_path)
+    try:
+        book.append(df, plan, chunk_written)
+        book.close()
+    except BaseException:
+        book.discard()
+        raise
+
+    if write_csv or write_parquet:
+        base = os.path.splitext(xlsx_path)[0]
+        for name, sheet_df in split_for_export(df).items():
+            if write_csv:
+                sheet_df.to_csv(f"{base}_{name}.csv", index=False)
+            if write_parquet:
+                try:
+                    sheet_df.to_parquet(f"{base}_{name}.parquet", index=False)
+                except ImportError as e:
+                    raise ValueError(f"Parquet export needs pyarrow installed ({e}).")
+
+    return book.counts
+
+def export_placement_chunks(frames, xlsx_path, write_csv=False, progress=None, total_frames=None):
+    """
+    export_placements for a merge handed out in pieces (e.g. by
+    chunked_merge.merge_in_partitions): each frame's rows are appended to
+    the sheets as it arrives, so only one frame is in memory at a time.
+    CSV copies (<name>_<Sheet>.csv) are appended per frame.
+    progress(message, percent) is called after every frame (percent of
+    total_frames, 0 if unknown); if it raises the partial workbook is deleted.
+    Returns: {sheet name: row count}
+    """
+    base = os.path.splitext(xlsx_path)[0]
+    csv_started = set()
+
+    book = _PlacementWorkbook(xlsx_path)
+    try:
+        for done, df in enumerate(frames, start=1):
+            book.append(df)
+            if write_csv:
+                for name, sheet_df in split_for_export(df).items():
+                    sheet_df.to_csv(f"{base}_{name}.csv", mode="a" if name in csv_started else "w",
+                                    header=name not in csv_started, index=False)
+                    csv_started.add(name)
+            if progress:
+                progress(f"Writing part {done}...", int(100 * done / total_frames) if total_frames else 0)
+        if write_csv:
+            # No frames at all: header-only files, like an empty export_placements
+            for name in set(SHEET_COLUMNS) - csv_started:
+                pd.DataFrame(columns=SHEET_COLUMNS[name]).to_csv(f"{base}_{name}.csv", index=False)
+        book.close()
+    except BaseException:
+        book.discard()
+        raise
+    return book.counts
+
+class _PlacementWorkbook:
+    """
+    The sheet writer behind both exports: Top / Bottom / Exceptions in
+    constant_memory mode, rows appended in arrival order. A sheet that
+    reaches SHEET_MAX_ROWS continues on "<name> (2)", ... (xlsxwriter
+    itself would drop the rows past it without an error).
+    """
+
+    def __init__(self, xlsx_path):
+        self.path = xlsx_path
+        self.workbook = xlsxwriter.Workbook(xlsx_path, {"constant_memory": True})
+        self.header_format = self.workbook.add_format({"bold": True, "bg_color": "#DDDDDD"})
+        self.counts = {name: 0 for name in SHEET_COLUMNS}
+        self.sheets = {} # Added with the first frame, whose unit labels the headers
+        self.unit = None
+
+    def _add_sheet(self, name, part=1):
+        worksheet = self.workbook.add_worksheet(name if part == 1 else f"{name} ({part})")
+        worksheet.write_row(0, 0, _header(SHEET_COLUMNS[name], self.unit), self.header_format)
+        worksheet.freeze_panes(1, 0)
+        return [worksheet, 1, part] # Worksheet, next free row, part number
+
+    def append(self, df, plan=None, chunk_written=None):
+        """
+        Appends df's rows to the sheets (plan: from _plan_sheets, computed if None).
+        chunk_written(sheet name, rows) is called after every written chunk.
+        """
+        if not self.sheets:
+            self._add_sheets(_text_unit(df))
+        for name, (rows, reason) in (plan or _plan_sheets(df)).items():
+            self.counts[name] += len(rows)
+            while len(rows):
+                sheet = self.sheets[name]
+                room = SHEET_MAX_ROWS - sheet[1]
+                if room == 0:
+                    self.sheets[name] = self._add_sheet(name, sheet[2] + 1)
+                    continue
+                part_reason = None if reason is None else reason[:room]
+                for n_rows in _stream_rows(sheet[0], df, rows[:room], SHEET_COLUMNS[name], part_reason, sheet[1]):
+                    if chunk_written:
+                        chunk_written(name, n_rows)
+                sheet[1] += len(rows[:room])
+                rows = rows[room:]
+                reason = None if reason is None else reason[room:]
+
+    def _add_sheets(self, unit):
+        self.unit = unit
+        self.sheets = {name: self._add_sheet(name) for name in SHEET_COLUMNS}
+
+    def close(self):
+        if not self.sheets:
+            self._add_sheets(None)
+        self.workbook.close()
+
+    def discard(self):
+        """Closes and deletes the partial workbook."""
+        self.workbook.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+def _plan_sheets(df):
+    """
+    Row positions per sheet (plus the Reason column for exceptions), ignored
+    rows left out. Nothing is copied from df here.
+    Returns: {sheet name: (row positions, reason codes or None)}
+    """
+    status = df["Status"].astype(str).to_numpy()
+    layer = df["Layer"].astype(str).str.strip().str.upper()
+    is_top = layer.str.startswith("T").to_numpy()
+    is_bottom = layer.str.startswith("B").to_numpy()
+    matched = status == "MATCHED"
+    kept = np.ones(len(df), dtype=bool)
+    if "Is Ignored" in df.columns:
+        kept = ~df["Is Ignored"].to_numpy(dtype=bool)
+
+    # Small int codes into EXCEPTION_REASONS (strings only per written chunk)
+    reason_code = np.select(
+        [status == "XY_ONLY", status == "BOM_ONLY", matched], [0, 1, 2], default=3
+    ).astype(np.int8)
+    exceptions = np.flatnonzero(kept & ~(matched & (is_top | is_bottom)))
+
+    return {
+        SHEET_TOP: (np.flatnonzero(kept & matched & is_top), None),
+        SHEET_BOTTOM: (np.flatnonzero(kept & matched & is_bottom), None),
+        SHEET_EXCEPTIONS: (exceptions, reason_code[exceptions]),
+    }
+
+def _stream_rows(worksheet, df, rows, columns, reason, first_row=1):
+    """
+    Writes df rows (positions) from sheet row first_row down, top to bottom
+    (constant_memory needs row order). Only one chunk of values is
+    materialized at a time. Yields the number of rows written per chunk.
+    """
+    for start in range(0, len(rows), WRITE_CHUNK_ROWS):
+        chunk_rows = rows[start:start + WRITE_CHUNK_ROWS]
+        chunk = []
+        for col in columns:
+            if col == "Reason":
+                values = EXCEPTION_REASONS[reason[start:start + WRITE_CHUNK_ROWS]].tolist()
+            elif col in df.columns:
+                values = df[col].iloc[chunk_rows].tolist()
+            else:
+                values = [None] * len(chunk_rows)
+            chunk.append([None if _is_missing(v) else v for v in values])
+        for offset, values in enumerate(zip(*chunk)):
+            worksheet.write_row(first_row + start + offset, 0, values)
+        yield len(chunk_rows)
+
+def _text_unit(df):
+    """Unit of the Mid X / Mid Y text recorded by apply_schema / panelize (None: unknown)."""
+    return (df.attrs.get("units") or {}).get("text")
+
+def _header(columns, unit):
+    """Column labels: Mid X / Mid Y name their unit when it is known."""
+    if not unit:
+        return list(columns)
+    return [f"{col} ({unit})" if col in COORDINATE_COLUMNS else col for col in columns]
+
+def _is_missing(value):
+    # NaN/None/NA -> empty cell (NaN is the only value not equal to itself)
+    return value is None or value is pd.NA or value != value
@@ -1,37 +1,309 @@
 # src/core/file_loader.py
 import pandas as pd
 import openpyxl
+from collections import deque
+from contextlib import closing
+from itertools import chain, islice
+import codecs
+import csv
+import io
 import os
 
+from src.core.instrumentation import stage
+from src.core.readers import EXCEL, ReaderNotApplicable, read_text_batches, readers_for
+from src.core.centroid import (
+    CENTROID_EXTENSIONS, CENTROID_READER, DETECT_LINES, detect_format, iter_centroid, read_centroid,
+)
+
+# Bump whenever loading/cleaning output changes (invalidates parse caches)
+LOADER_VERSION = 6
+
 # Define keywords to identify the header row
 HEADER_KEYWORDS = [
     "ref", "reference", "designator", "part", "component", 
     "value", "qty", "quantity", "description", "footprint"
 ]
 
-def load_and_clean_file(file_path):
+# Header search window: the file's first row plus the 20 rows below it
+HEADER_SCAN_ROWS = 21
+HEADER_MIN_MATCHES = 2
+
+# Quick preview: data rows shown while the full file is still loading
+PREVIEW_ROWS = 50
+
+# iter_file_batches: rows per batch (centroid reports are read in blocks of
+# batch rows x BATCH_LINE_BYTES of text: a typical report line)
+BATCH_ROWS = 200_000
+BATCH_LINE_BYTES = 64
+
+# Full loads call progress() after every this many Excel rows (or centroid batch)
+PROGRESS_ROWS = 20_000
+
+# CSV/TXT sniffing looks at this much of the file
+SNIFF_BYTES = 64 * 1024
+# Tried in order (latin-1 decodes anything); UTF-16 is recognized by its BOM
+ENCODINGS = ["utf-8-sig", "cp1252", "latin-1"]
+# Candidate delimiters; the extension's own (',' for .csv, tab for .txt) wins ties
+DELIMITERS = [",", "\t", ";", "|"]
+DEFAULT_DELIMITERS = {".csv": ",", ".txt": "\t", ".pos": "\t", ".rpt": "\t"}
+
+class _KeywordMatcher:
+    """
+    Aho-Corasick automaton over a keyword list.
+    find() reports every keyword contained in a string (overlaps included,
+    e.g. "ref" and "reference") in a single left-to-right pass.
+    """
+
+    def __init__(self, keywords):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [set()]
+
+        # 1. Trie of all keywords
+        for keyword in keywords:
+            state = 0
+            for ch in keyword:
+                if ch not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(set())
+                    self.goto[state][ch] = len(self.goto) - 1
+                state = self.goto[state][ch]
+            self.output[state].add(keyword)
+
+        # 2. Failure links, breadth first (depth-1 states fail back to root)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[nxt] = self.goto[fallback].get(ch, 0)
+                self.output[nxt] |= self.output[self.fail[nxt]]
+
+    def find(self, text):
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(ch, 0)
+            if self.output[state]:
+                found |= self.output[state]
+        return found
+
+_HEADER_MATCHER = _KeywordMatcher(HEADER_KEYWORDS)
+
+def load_and_clean_file(file_path, streaming=True, reader=None, progress=None):
     """
     Main entry point. Detects file type, handles unmerging, finds headers.
+    Loading is two-phase: a bounded prefix of the file is peeked to locate
+    the header row, then one full parse starts below it with the final
+    column names. The parse is done by the fastest installed reader
+    backend (see src/core/readers.py; recorded in the stage details).
+    CAD centroid reports (KiCad .pos, Altium Pick Place, Cadence/Mentor
+    fixed-width) are recognized first and parsed into typed columns
+    (see src/core/centroid.py).
+    streaming=False loads Excel files through the full workbook object
+    model instead (legacy path).
+    reader: Backend name to force (e.g. "openpyxl", "pandas", "centroid").
+    progress(message, percent): called between batches of Excel rows and
+    centroid report batches (CSV/TXT are one native parse); if it raises
+    (e.g. user cancelled) the load stops.
     Returns: Cleaned Pandas DataFrame.
     """
+    with stage("file_loader.load", os.path.basename(file_path)) as s:
+        if not streaming and _kind(file_path) == EXCEL:
+            df = _process_excel_with_unmerge(file_path)
+            # Find the actual header row (ignoring "Customer Name" etc)
+            with stage("file_loader.header_detect"):
+                df = _find_and_set_header(df)
+        else:
+            df = _read_file(file_path, reader=reader, progress=progress)
+        s.rows = len(df)
+    return df
+
+def preview_file(file_path, n_rows=PREVIEW_ROWS, reader=None):
+    """
+    First n_rows data rows of a file, with the same header detection as
+    load_and_clean_file, for showing while the full load runs.
+    Excel through openpyxl: shared strings are only parsed as far as those
+    rows need, and merged ranges are not filled (they are stored after the
+    cell data, so finding them means reading the whole sheet).
+    Returns: DataFrame with at most n_rows rows.
+    """
+    with stage("file_loader.preview", os.path.basename(file_path)) as s:
+        df = _read_file(file_path, max_rows=n_rows, reader=reader)
+        s.rows = len(df)
+    return df
+
+def iter_file_batches(file_path, batch_rows=BATCH_ROWS):
+    """
+    The rows of load_and_clean_file, batch_rows at a time, for files too
+    large to hold at once (see src/core/chunked_merge.py). Same header
+    detection and column names; text goes through the pandas parser, and
+    cells past the header of an Excel sheet are dropped.
+    Returns: Iterator of DataFrames of at most batch_rows rows.
+    """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
 
     ext = os.path.splitext(file_path)[1].lower()
+    if ext in CENTROID_EXTENSIONS:
+        detected = _detect_centroid_report(file_path)
+        if detected is not None:
+            report, encoding = detected
+            names = None
+            for batch in iter_centroid(file_path, report, encoding, batch_rows * BATCH_LINE_BYTES):
+                names = names or _make_unique_header(batch.columns)
+                batch.columns = names
+                for start in range(0, len(batch), batch_rows):
+                    yield batch.iloc[start:start + batch_rows].reset_index(drop=True)
+            return
 
-    if ext in ['.xlsx', '.xls', '.xlsm']:
-        df = _process_excel_with_unmerge(file_path)
-    elif ext == '.csv':
-        df = pd.read_csv(file_path, dtype=str)
-    elif ext == '.txt':
-        df = pd.read_csv(file_path, sep='\t', dtype=str)
-    else:
-        raise ValueError(f"Unsupported file format: {ext}")
-
-    # Step 2: Find the actual header row (ignoring "Customer Name" etc)
-    df_clean = _find_and_set_header(df)
-    
-    return df_clean
+    backend = readers_for(ext)[0]
+    if backend["kind"] == EXCEL:
+        yield from _excel_batches(file_path, backend, batch_rows)
+        return
+    text_format = sniff_text_format(file_path, DEFAULT_DELIMITERS.get(ext, ","))
+    if text_format["names"]:
+        yield from read_text_batches(file_path, text_format, batch_rows)
+
+def sniff_text_format(file_path, default_delimiter=","):
+    """
+    Encoding, delimiter and header position of a CSV/TXT file, from its
+    first SNIFF_BYTES. Every candidate delimiter is tried on the first
+    HEADER_SCAN_ROWS records (csv module: copes with ragged banner rows);
+    the one giving the widest header row wins. Without a header row the
+    default delimiter is used and the first line becomes the header.
+    Returns: {"encoding", "delimiter", "names", "skip_lines"} (the text
+             backends' input; names is empty for an empty file)
+    """
+    with open(file_path, "rb") as f:
+        sample = f.read(SNIFF_BYTES)
+    encoding = _sniff_encoding(sample)
+    # The sample may end inside a character: only complete ones are decoded
+    text = codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+
+    best = None # (header width, delimiter, header record, skip_lines)
+    delimiters = [default_delimiter] + [d for d in DELIMITERS if d != default_delimiter]
+    for delimiter in delimiters:
+        head, line_ends = _peek_records(text, delimiter)
+        index = _find_header_row(head)
+        if index is not None and (best is None or len(head[index]) > best[0]):
+            best = (len(head[index]), delimiter, head[index], line_ends[index])
+    if best is None:
+        # No header found: keep the file's first line as header
+        head, line_ends = _peek_records(text, default_delimiter)
+        best = (0, default_delimiter, head[0] if head else [], line_ends[0] if head else 0)
+
+    _, delimiter, header, skip_lines = best
+    names = _make_unique_header(header) if header else []
+    return {"encoding": encoding, "delimiter": delimiter, "names": names, "skip_lines": skip_lines}
+
+def _kind(file_path):
+    """Returns: readers.EXCEL or readers.TEXT (ValueError for other extensions)."""
+    return readers_for(os.path.splitext(file_path)[1].lower())[0]["kind"]
+
+def _read_file(file_path, max_rows=None, reader=None, progress=None):
+    """Streaming load (max_rows: stop early) through the reader backends."""
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found: {file_path}")
+
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext in CENTROID_EXTENSIONS and reader in (None, CENTROID_READER):
+        df = _read_centroid_report(file_path, max_rows, progress)
+        if df is not None:
+            return df
+        if reader == CENTROID_READER:
+            raise ValueError(f"Not a recognized centroid report: {os.path.basename(file_path)}")
+    backends = readers_for(ext, reader)
+    if backends[0]["kind"] == EXCEL:
+        return _stream_excel_with_unmerge(file_path, backends[0], max_rows, progress)
+    return _read_delimited(file_path, backends, DEFAULT_DELIMITERS.get(ext, ","), max_rows)
+
+def _read_centroid_report(file_path, max_rows=None, progress=None):
+    """
+    Typed columns of a CAD centroid report, or None if the file's first
+    DETECT_LINES lines are not one (the generic text loader reads it).
+    """
+    detected = _detect_centroid_report(file_path)
+    if detected is None:
+        return None
+    report, encoding = detected
+
+    detail = f"{CENTROID_READER} ({report['format']}, {report['unit'] or 'unit not stated'})"
+    with stage("file_loader.read_rows", detail) as s:
+        df = read_centroid(file_path, report, encoding, max_rows, progress)
+        df.columns = _make_unique_header(df.columns)
+        s.rows = len(df)
+    return df
+
+def _detect_centroid_report(file_path):
+    """Returns: (centroid report format, encoding), or None if the file does not start like one."""
+    with stage("file_loader.header_detect", CENTROID_READER):
+        with open(file_path, "rb") as f:
+            sample = f.read(SNIFF_BYTES)
+        encoding = _sniff_encoding(sample)
+        text = codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+        # Split like the parsers' readline() on bytes (on "\n" only)
+        lines = [line.rstrip("\r") for line in text.split("\n")]
+        if len(sample) == SNIFF_BYTES:
+            lines = lines[:-1] # May be cut off
+        report = detect_format(lines[:DETECT_LINES])
+    return None if report is None else (report, encoding)
+
+def _read_delimited(file_path, backends, default_delimiter, max_rows=None):
+    """
+    CSV/TXT loader.
+    Phase 1 sniffs encoding, delimiter and header from the start of the
+    file, phase 2 is a single parse by the first backend that accepts the
+    file, skipping everything up to the header line (and stopping after
+    max_rows).
+    """
+    with stage("file_loader.header_detect"):
+        text_format = sniff_text_format(file_path, default_delimiter)
+    if not text_format["names"]:
+        return pd.DataFrame()
+
+    declined = []
+    for backend in backends:
+        detail = f"{backend['name']} ({text_format['encoding']}, {text_format['delimiter']!r})"
+        with stage("file_loader.read_rows", detail) as s:
+            try:
+                df = backend["read"](file_path, text_format, max_rows)
+            except ReaderNotApplicable as e:
+                declined.append(str(e))
+                continue
+            s.rows = len(df)
+        return df
+    raise ValueError("No reader could parse the file: " + "; ".join(declined))
+
+def _sniff_encoding(sample):
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    for encoding in ENCODINGS:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return ENCODINGS[-1]
+
+def _peek_records(text, delimiter):
+    """
+    First HEADER_SCAN_ROWS records of text.
+    Returns: (records, physical line number where each record ends)
+    """
+    head = []
+    line_ends = []
+    reader = csv.reader(io.StringIO(text, newline=''), delimiter=delimiter)
+    for record in islice(reader, HEADER_SCAN_ROWS):
+        head.append(record)
+        line_ends.append(reader.line_num)
+    return head, line_ends
 
 def _process_excel_with_unmerge(file_path):
     """
@@ -39,69 +311,126 @@ def _process_excel_with_unmerge(file_path):
     Then passes data to Pandas.
     """
     # Load workbook and active sheet
-    wb = openpyxl.load_workbook(file_path, data_only=True)
-    sheet = wb.active
+    with stage("file_loader.open_workbook"):
+        wb = openpyxl.load_workbook(file_path, data_only=True)
+        sheet = wb.active
 
     # CRITICAL: Detect and unmerge cells
     # We copy the list because unmerging modifies the range inplace
-    merged_ranges = list(sheet.merged_cells.ranges)
-    
-    for merged_cell in merged_ranges:
-        # Get the value from the top-left cell of the merge
-        top_left_cell = sheet.cell(row=merged_cell.min_row, column=merged_cell.min_col)
-        value = top_left_cell.value
-        
-        # Unmerge the range
-        sheet.unmerge_cells(str(merged_cell))
-        
-        # Fill the unmerged range with the top-left value
-        for row in range(merged_cell.min_row, merged_cell.max_row + 1):
-            for col in range(merged_cell.min_col, merged_cell.max_col + 1):
-                sheet.cell(row=row, column=col).value = value
+    with stage("file_loader.unmerge") as s:
+        merged_ranges = list(sheet.merged_cells.ranges)
+        s.rows = len(merged_ranges)
+
+        for merged_cell in merged_ranges:
+            # Get the value from the top-left cell of the merge
+            top_left_cell = sheet.cell(row=merged_cell.min_row, column=merged_cell.min_col)
+            value = top_left_cell.value
+
+            # Unmerge the range
+            sheet.unmerge_cells(str(merged_cell))
+
+            # Fill the unmerged range with the top-left value
+            for row in range(merged_cell.min_row, merged_cell.max_row + 1):
+                for col in range(merged_cell.min_col, merged_cell.max_col + 1):
+                    sheet.cell(row=row, column=col).value = value
 
     # Convert OpenPyXL sheet to values list
     data = sheet.values
     
     # Create DataFrame (assuming first row read is just the first row of file)
     # We treat all data as strings to prevent scientific notation conversion
-    cols = next(data) # Grab first row as temp headers
-    df = pd.DataFrame(data, columns=cols)
-    
-    # Force all data to string to avoid "5.00E+05" issues
-    df = df.astype(str)
-    
+    with stage("file_loader.read_rows") as s:
+        cols = next(data) # Grab first row as temp headers
+        df = pd.DataFrame(data, columns=cols)
+
+        # Force all data to string to avoid "5.00E+05" issues
+        df = df.astype(str)
+        s.rows = len(df)
+
     return df
 
-def _find_and_set_header(df):
+def _stream_excel_with_unmerge(file_path, backend, max_rows=None, progress=None):
     """
-    Scans first 20 rows for keywords. Promotes that row to header.
-    Ensures column names are unique to prevent pandas errors.
+    Streaming version of _process_excel_with_unmerge.
+    The backend streams the sheet's rows (merged ranges filled); the first
+    HEADER_SCAN_ROWS are peeked for the header. The same row stream then
+    continues into per-column string buffers, so the sheet is parsed
+    exactly once.
+    max_rows: Stop after that many data rows (preview).
+    progress(message, percent): called every PROGRESS_ROWS rows.
     """
-    header_row_index = None
+    with closing(backend["read"](file_path, max_rows)) as rows:
+        # Phase 1: bounded peek for the header row
+        with stage("file_loader.header_detect"):
+            head = list(islice(rows, HEADER_SCAN_ROWS))
+            header_row_index = _find_header_row(head) if head else None
+        if not head:
+            return pd.DataFrame()
+        if header_row_index is None:
+            header_row_index = 0 # No header found: keep the first row as header
+        header = head[header_row_index]
+
+        # Phase 2: everything below the header goes straight into column buffers
+        with stage("file_loader.read_rows", backend["name"]) as s:
+            columns = [[] for _ in header] # One list of strings per sheet column
+            row_count = 0
+            for values in islice(chain(head[header_row_index + 1:], rows), max_rows):
+                # Rows can be ragged, new columns are back-filled with None
+                while len(columns) < len(values):
+                    columns.append([str(None)] * row_count)
+                # Store as string right away to avoid "5.00E+05" issues
+                for col_idx, buffer in enumerate(columns):
+                    buffer.append(str(values[col_idx]) if col_idx < len(values) else str(None))
+                row_count += 1
+                if progress and not row_count % PROGRESS_ROWS:
+                    progress(f"Parsing file... {row_count:,} rows", -1)
+            s.rows = row_count
+
+    header = list(header) + [None] * (len(columns) - len(header))
+    return pd.DataFrame(dict(zip(_make_unique_header(header), columns)))
 
-    # Iterate through first 20 rows
-    for i, row in df.head(20).iterrows():
+def _excel_batches(file_path, backend, batch_rows):
+    """
+    _stream_excel_with_unmerge, batch_rows rows at a time. Every batch has
+    the header's columns: cells past it are dropped, short rows padded.
+    """
+    with closing(backend["read"](file_path)) as rows:
+        head = list(islice(rows, HEADER_SCAN_ROWS))
+        if not head:
+            return
+        header_row_index = _find_header_row(head) or 0
+        names = _make_unique_header(head[header_row_index])
+        width = len(names)
+        data = chain(head[header_row_index + 1:], rows)
+        while True:
+            chunk = list(islice(data, batch_rows))
+            if not chunk:
+                break
+            # Same strings as the full load: str() of every value, missing cells are "None"
+            yield pd.DataFrame([[str(v) for v in list(values[:width]) + [None] * (width - len(values))]
+                                for values in chunk], columns=names)
+
+def _find_header_row(rows):
+    """
+    Returns the index of the first row containing at least HEADER_MIN_MATCHES
+    header keywords, or None.
+    """
+    for i, row in enumerate(rows):
         # Convert row to a single lowercase string for searching
-        row_str = " ".join(row.astype(str).str.lower().tolist())
-        
-        # Check if at least 2 keywords exist in this row
-        matches = sum(1 for key in HEADER_KEYWORDS if key in row_str)
-        if matches >= 2:
-            header_row_index = i
-            break
-    
-    if header_row_index is None:
-        return df
+        row_str = " ".join("" if value is None else str(value) for value in row).lower()
+        if len(_HEADER_MATCHER.find(row_str)) >= HEADER_MIN_MATCHES:
+            return i
+    return None
 
-    # Promote the found row to header
-    new_header = df.iloc[header_row_index].astype(str).tolist() # Convert to list of strings
-    
-    # --- CRITICAL FIX: Deduplicate Headers ---
-    # Turns ["Qty", "Qty", ""] into ["Qty", "Qty.1", "Unnamed.2"]
+def _make_unique_header(values):
+    """
+    Turns ["Qty", "Qty", ""] into ["Qty", "Qty.1", "Unnamed"].
+    Ensures column names are unique to prevent pandas errors.
+    """
     seen = {}
     unique_header = []
-    for col in new_header:
-        col_clean = col.strip()
+    for col in values:
+        col_clean = "" if col is None else str(col).strip()
         if col_clean == "" or col_clean.lower() == "nan":
             col_clean = "Unnamed"
             
@@ -111,10 +440,22 @@ def _find_and_set_header(df):
         else:
             seen[col_clean] = 0
             unique_header.append(col_clean)
-    # -----------------------------------------
+    return unique_header
+
+def _find_and_set_header(df):
+    """
+    Legacy path for fully loaded frames.
+    Scans first 20 rows for keywords. Promotes that row to header.
+    """
+    header_row_index = _find_header_row(df.head(HEADER_SCAN_ROWS - 1).values.tolist())
+    if header_row_index is None:
+        return df
+
+    # Promote the found row to header
+    new_header = _make_unique_header(df.iloc[header_row_index].tolist())
 
     df = df[header_row_index + 1:] # Take data below header
-    df.columns = unique_header # Set unique headers
+    df.columns = new_header # Set unique headers
     df.reset_index(drop=True, inplace=True) # Reset index numbers
     
-    return df
\ No newline at end of file
+    return df
@@ -0,0 +1,173 @@
+# src/core/incremental.py
+# Watch-mode re-validation: when a source file changes, only the rows that
+# changed go through normalization and the merge again.
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from src.core.instrumentation import instrumented, stage
+from src.core.logic_engine import find_xy_ref_column, perform_merge_and_validation
+from src.core.normalizer import normalize_bom_rows
+from src.core.reconcile import ACCEPTED_KEY, reapply_accepted
+from src.core.schema import INPUT_UNITS_KEY, apply_schema
+
+# Separates cells when a row is joined into one string for hashing
+_CELL_SEPARATOR = "\x1f"
+_NULL_CELL = "\x00"
+# Mixes a row's hash with its occurrence number (identical rows stay distinct)
+_OCCURRENCE_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+def snapshot(raw_df, ref_col=None, delimiter=None):
+    """
+    State of one loaded file for later update_source() calls:
+    {"raw", "hashes", "clean", "sources"}. With ref_col the file is a BOM and
+    "clean" is its normalized form (sources: raw row of every clean row);
+    without, "clean" is the raw frame itself (XY). Row hashes are computed on
+    the first update, so files that never change cost nothing.
+    Returns: Snapshot dict.
+    """
+    if ref_col is None:
+        clean_df, sources = raw_df, np.arange(len(raw_df))
+    else:
+        clean_df, sources = normalize_bom_rows(raw_df, ref_col, delimiter)
+    return {"raw": raw_df, "hashes": None, "clean": clean_df, "sources": sources}
+
+def row_hashes(df):
+    """
+    Per-row content hash: the row's cells joined into one string (Arrow string
+    concatenation), then one uint64 hash per row.
+    Returns: uint64 array.
+    """
+    with stage("incremental.row_hashes") as s:
+        joined = None
+        for col in df.columns:
+            cells = df[col].astype(str).fillna(_NULL_CELL)
+            joined = cells if joined is None else joined + _CELL_SEPARATOR + cells
+        s.rows = len(df)
+        if joined is None:
+            return np.zeros(len(df), dtype=np.uint64)
+        return pd.util.hash_pandas_object(joined, index=False).to_numpy()
+
+def diff_rows(old_hashes, new_hashes):
+    """
+    Matches rows of two versions of a file by content (multiset: a row that
+    appears twice needs two matches).
+    Returns: (old_to_new, added): new position of every old row (-1 = removed),
+             and the positions of new rows that match no old row.
+    """
+    old_keys = _occurrence_keys(old_hashes)
+    new_keys = _occurrence_keys(new_hashes)
+    old_to_new = pd.Index(new_keys).get_indexer(old_keys)
+    matched = np.zeros(len(new_keys), dtype=bool)
+    matched[old_to_new[old_to_new >= 0]] = True
+    return old_to_new, np.flatnonzero(~matched)
+
+@instrumented("incremental.update_source")
+def update_source(old, new_raw_df, ref_col=None, delimiter=None):
+    """
+    Applies a re-parsed file to its snapshot. Kept rows reuse their old
+    normalized rows; only added rows are normalized (BOM).
+    Returns: (new snapshot, changed clean rows: removed old + added new),
+             changed is None when the columns changed (everything is new).
+    """
+    if list(new_raw_df.columns) != list(old["raw"].columns):
+        return snapshot(new_raw_df, ref_col, delimiter), None
+
+    old_hashes = old["hashes"] if old["hashes"] is not None else row_hashes(old["raw"])
+    new_hashes = row_hashes(new_raw_df)
+    old_to_new, added = diff_rows(old_hashes, new_hashes)
+
+    clean_kept = old_to_new[old["sources"]] >= 0
+    if ref_col is None:
+        # XY rows are their own clean rows
+        added_clean = new_raw_df.take(added)
+        clean_df, sources = new_raw_df, np.arange(len(new_raw_df))
+    else:
+        added_clean, added_sources = normalize_bom_rows(new_raw_df.take(added), ref_col, delimiter)
+        clean_df = pd.concat([old["clean"][clean_kept], added_clean], ignore_index=True)
+        sources = np.concatenate([old_to_new[old["sources"][clean_kept]], added[added_sources]])
+
+    changed = pd.concat([old["clean"][~clean_kept], added_clean], ignore_index=True)
+    new = {"raw": new_raw_df, "hashes": new_hashes, "clean": clean_df, "sources": sources}
+    return new, changed
+
+@instrumented("incremental.remerge")
+def remerge(master_df, bom_df, xy_df, mapping, changed_bom=None, changed_xy=None, full=False):
+    """
+    Re-merges only the Ref Des touched by changed BOM / XY rows (both files'
+    rows for those refs), and swaps them into master_df. Ignore decisions of
+    refs still present are kept, and so are accepted near-match pairs (both
+    refs of a pair are re-merged when either changes, then the pair is
+    accepted again). full=True re-merges everything (same rules).
+    Units are pinned to the ones master_df was built with.
+    Returns: (new master DataFrame, number of Ref Des re-merged)
+    """
+    ref_col = mapping.get("Reference Designator")
+    xy_ref_col = find_xy_ref_column(xy_df, ref_col)
+    units = master_df.attrs.get("units")
+    if units:
+        mapping = {**mapping, INPUT_UNITS_KEY: units["input"]}
+
+    accepted = master_df.attrs.get(ACCEPTED_KEY, [])
+    if full:
+        changed = None
+        untouched = []
+        delta_df = apply_schema(perform_merge_and_validation(bom_df, xy_df, mapping), mapping)
+        replaced = np.ones(len(master_df), dtype=bool)
+    else:
+        changed = pd.Index(pd.concat([
+            _join_keys(changed_bom, ref_col),
+            _join_keys(changed_xy, xy_ref_col),
+        ])).unique()
+        if not len(changed):
+            return master_df, 0
+        # A pair is merged as one part: either side changing re-merges both
+        changed_refs = set(changed)
+        touched, untouched = [], []
+        for pair in accepted:
+            in_delta = pair["XY Ref Des"] in changed_refs or pair["BOM Ref Des"] in changed_refs
+            (touched if in_delta else untouched).append(pair)
+        changed = changed.append(pd.Index([ref for pair in touched for ref in (pair["XY Ref Des"], pair["BOM Ref Des"])])).unique()
+        bom_part = bom_df[_join_keys(bom_df, ref_col).isin(changed).to_numpy()]
+        xy_part = xy_df[_join_keys(xy_df, xy_ref_col).isin(changed).to_numpy()]
+        delta_df = apply_schema(perform_merge_and_validation(bom_part, xy_part, mapping), mapping)
+        replaced = master_df["Ref Des"].isin(changed).to_numpy()
+    delta_df = reapply_accepted(delta_df, accepted if full else touched)
+
+    # Ignore decisions made on the dashboard survive the update
+    ignored = master_df.loc[replaced & master_df["Is Ignored"].to_numpy(dtype=bool), "Ref Des"]
+    delta_df["Is Ignored"] = delta_df["Is Ignored"].to_numpy(dtype=bool) | delta_df["Ref Des"].isin(ignored).to_numpy()
+
+    result_df = _concat_typed(master_df[~replaced], delta_df)
+    duplicates = delta_df.attrs.get("duplicates", [])
+    if changed is not None:
+        changed_refs = set(changed)
+        kept = [d for d in master_df.attrs.get("duplicates", []) if d["Ref Des"] not in changed_refs]
+        duplicates = kept + duplicates
+    accepted = untouched + delta_df.attrs.get(ACCEPTED_KEY, [])
+    result_df.attrs = {**master_df.attrs, "duplicates": duplicates, ACCEPTED_KEY: accepted}
+    return result_df, len(delta_df)
+
+def _occurrence_keys(hashes):
+    """hash -> hash mixed with how often it was seen before (0, 1, ...)."""
+    if pd.Index(hashes).is_unique:
+        return hashes # Usual case: no repeated rows
+    occurrence = pd.Series(hashes).groupby(hashes).cumcount().to_numpy(dtype=np.uint64)
+    return pd.util.hash_array(hashes ^ (occurrence * _OCCURRENCE_MIX))
+
+def _join_keys(df, ref_col):
+    """Same standardization as the merge's join key."""
+    if df is None or not len(df):
+        return pd.Series([], dtype=object)
+    return df[ref_col].astype(str).str.strip().str.upper().reset_index(drop=True)
+
+def _concat_typed(kept_df, delta_df):
+    """Row concat that keeps categoricals categorical (categories are unioned)."""
+    columns = {}
+    for col in kept_df.columns:
+        a, b = kept_df[col], delta_df[col] if col in delta_df.columns else pd.Series(index=delta_df.index)
+        if isinstance(a.dtype, pd.CategoricalDtype) and isinstance(b.dtype, pd.CategoricalDtype):
+            columns[col] = pd.Series(union_categoricals([a.array, b.array], ignore_order=True))
+        else:
+            columns[col] = pd.concat([a, b], ignore_index=True)
+    return pd.DataFrame(columns)
@@ -0,0 +1,192 @@
+# src/core/instrumentation.py
+# Per-stage wall time / peak memory / row counts for "why is this file slow".
+# Off by default: stage() then hands out one shared no-op object and
+# @instrumented functions cost a single flag check.
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+# PCB_BOM_PROFILE=1 records timings, PCB_BOM_PROFILE=memory adds peak memory
+PROFILE_ENV = "PCB_BOM_PROFILE"
+# Oldest records are dropped past this (long GUI sessions)
+MAX_RECORDS = 1000
+
+_enabled = False
+_track_memory = False
+_started_tracemalloc = False
+_records = deque(maxlen=MAX_RECORDS)
+_record_count = 0 # Total ever recorded, lets the GUI poll cheaply
+_lock = threading.Lock()
+_local = threading.local()
+# Memory-tracked stages open on any thread. tracemalloc's peak is process-wide:
+# a stage that overlaps one on another thread gets no peak (see _Stage)
+_open_memory_stages = set()
+
+class _NullStage:
+    """Stand-in while disabled; attribute writes (rows) are simply ignored."""
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_STAGE = _NullStage()
+
+class _Stage:
+    """
+    One timed stage. Its peak memory is only measured while it runs alone:
+    if a stage on another thread is open at any point of its run (e.g. BOM
+    and XY loading on the thread pool), both are marked overlapped and
+    record peak_mb None, since reset_peak() and the peak are process-wide.
+    """
+    def __init__(self, name, detail):
+        self.name = name
+        self.detail = detail
+        self.rows = None
+
+    def __enter__(self):
+        stack = _stack()
+        self.parent = stack[-1] if stack else None
+        stack.append(self)
+
+        self.memory = _track_memory and tracemalloc.is_tracing()
+        self.overlapped = False
+        if self.memory:
+            self.thread = threading.get_ident()
+            with _lock:
+                for other in _open_memory_stages:
+                    if other.thread != self.thread:
+                        other.overlapped = self.overlapped = True
+                _open_memory_stages.add(self)
+                current, peak = tracemalloc.get_traced_memory()
+                # The parent may already have peaked; reset_peak() would lose that
+                if self.parent is not None and self.parent.memory:
+                    self.parent.child_peak = max(self.parent.child_peak, peak)
+                self.start_memory = current
+                self.child_peak = 0
+                if not self.overlapped:
+                    tracemalloc.reset_peak()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        stack = _stack()
+        stack.pop()
+
+        peak_mb = None
+        if self.memory:
+            with _lock:
+                _open_memory_stages.discard(self)
+                peak = max(tracemalloc.get_traced_memory()[1], self.child_peak)
+            if not self.overlapped:
+                peak_mb = round((peak - self.start_memory) / 1024 / 1024, 2)
+            if self.parent is not None and self.parent.memory:
+                self.parent.child_peak = max(self.parent.child_peak, peak)
+
+        _add_record({
+            "stage": self.name,
+            "detail": self.detail,
+            "seconds": round(seconds, 6),
+            "peak_mb": peak_mb,
+            "rows": None if self.rows is None else int(self.rows),
+            "depth": len(stack),
+            "thread": threading.current_thread().name,
+            "overlapped": self.overlapped, # Peak not measurable (peak_mb None)
+            "ok": exc_type is None,
+        })
+        return False
+
+def enable(memory=False):
+    """Starts recording. memory=True also tracks peak memory (tracemalloc, slower)."""
+    global _enabled, _track_memory, _started_tracemalloc
+    _track_memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracemalloc = True
+    _enabled = True
+
+def disable():
+    """Stops recording (records are kept until clear())."""
+    global _enabled, _track_memory, _started_tracemalloc
+    _enabled = False
+    _track_memory = False
+    if _started_tracemalloc:
+        tracemalloc.stop()
+        _started_tracemalloc = False
+
+def is_enabled():
+    return _enabled
+
+def is_tracking_memory():
+    return _enabled and _track_memory
+
+def stage(name, detail=None):
+    """
+    Context manager timing one stage:
+        with stage("file_loader.read_rows") as s:
+            ...
+            s.rows = len(df)
+    Returns: A shared no-op object while disabled.
+    """
+    if not _enabled:
+        return _NULL_STAGE
+    return _Stage(name, detail)
+
+def instrumented(name, rows=len):
+    """Decorator: records the call as a stage, rows(result) as its row count."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Stage(name, None) as s:
+                result = func(*args, **kwargs)
+                s.rows = rows(result)
+            return result
+        return wrapper
+    return decorate
+
+def records():
+    """Returns: Copy of the recorded stages, oldest first."""
+    with _lock:
+        return list(_records)
+
+def record_count():
+    """Total number of stages recorded so far (keeps counting past MAX_RECORDS)."""
+    return _record_count
+
+def clear():
+    with _lock:
+        _records.clear()
+
+def to_json(path=None):
+    """Returns: Records as a JSON string (also written to path if given)."""
+    text = json.dumps({"memory": is_tracking_memory(), "stages": records()}, indent=2)
+    if path:
+        with open(path, "w") as f:
+            f.write(text)
+    return text
+
+def _add_record(record):
+    global _record_count
+    with _lock:
+        _records.append(record)
+        _record_count += 1
+
+def _stack():
+    # Open stages of the current thread (for nesting depth and memory peaks)
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+_env_profile = os.environ.get(PROFILE_ENV, "").strip().lower()
+if _env_profile not in ("", "0"):
+    enable(memory=_env_profile == "memory")
@@ -1,86 +1,272 @@
 
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
 
+from src.core.instrumentation import instrumented, stage
+from src.core.schema import Status
+
+# '_merge' indicator value -> Status
+# left = XY, right = BOM (We treat XY as the physical master)
+MERGE_STATUS = {
+    'both': Status.MATCHED.value,
+    'left_only': Status.XY_ONLY.value,   # In XY, missing BOM
+    'right_only': Status.BOM_ONLY.value, # In BOM, missing XY
+}
+
+# Output column -> Mapping field it is read from
+OUTPUT_FIELDS = {
+    # XY Data (Handle if missing)
+    "Layer": "Layer / Side",
+    "Mid X": "Mid X",
+    "Mid Y": "Mid Y",
+    "Rotation": "Rotation",
+    # BOM Data (Handle if missing)
+    "Part Number": "Part Number",
+    "Value": "Value",
+    "Footprint": "Footprint",
+    "Description": "Description",
+}
+
+# Mapping entry (not a column): what to do with a Ref Des listed more than once
+# in the BOM or the XY file. Without it the outer join multiplies rows.
+DUPLICATE_POLICY_KEY = "Duplicate Refs"
+DUPLICATE_POLICIES = ("keep_first", "aggregate", "reject")
+DEFAULT_DUPLICATE_POLICY = "keep_first"
+
+# Report in merged_df.attrs["duplicates"]: one record (dict) per duplicated Ref Des
+# and file. Plain records, not a DataFrame: pandas compares attrs with ==
+DUPLICATE_COLUMNS = ["Ref Des", "Source", "Count", "Action"]
+
+# "aggregate": distinct values of the duplicate rows joined into one cell
+AGGREGATE_SEPARATOR = "; "
+
+class DuplicateRefError(ValueError):
+    """Raised by the "reject" policy. report: DataFrame with DUPLICATE_COLUMNS."""
+    def __init__(self, report):
+        refs = ", ".join(report["Ref Des"].astype(str).head(10))
+        more = f" (+{len(report) - 10} more)" if len(report) > 10 else ""
+        super().__init__(f"{len(report)} Ref Des listed more than once: {refs}{more}")
+        self.report = report
+
+# XY_ONLY refs starting with these are auto-ignored (Fiducials, Test Points, Mount Holes)
+AUTO_IGNORE_PATTERN = r'(?:FID|TP|MH)'
+
+# Memoized merge: prepared sides (join key + duplicates resolved) per input
+# frame, and outer joins per pair of sides. Keys are content fingerprints, so
+# an edited or reloaded file never hits a stale entry. Each entry holds a
+# full frame: the caches stay small (least recently used goes first).
+SIDE_CACHE_SIZE = 4
+JOIN_CACHE_SIZE = 2
+
+_side_cache = OrderedDict()
+_join_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+@instrumented("logic_engine.merge")
 def perform_merge_and_validation(bom_df, xy_df, mapping):
     """
     Merges BOM and XY based on the mapped Reference Designator columns.
-    Returns: A unified DataFrame with a 'status' column (MATCHED, XY_ONLY, BOM_ONLY).
+    Duplicate refs on either side are resolved first (mapping["Duplicate Refs"],
+    see resolve_duplicates), so the join is always one-to-one.
+    bom_df / xy_df are not modified. The join is memoized on the content of
+    both frames + the key mapping: calling again with only non-key fields
+    changed (e.g. Description) just re-projects columns from the cached join.
+    Returns: A unified DataFrame with a 'status' column (MATCHED, XY_ONLY, BOM_ONLY)
+             and the duplicate report records in attrs["duplicates"].
     """
+    policy = mapping.get(DUPLICATE_POLICY_KEY) or DEFAULT_DUPLICATE_POLICY
+    if policy not in DUPLICATE_POLICIES:
+        raise ValueError(f"Unknown duplicate policy: {policy}")
+
     # 1. Identify Key Columns from Mapping
     bom_ref_col = mapping.get("Reference Designator") # e.g. "Part Ref"
-    xy_ref_col = mapping.get("Reference Designator")  # e.g. "Designator" (Assuming user mapped same or we handle split)
-    
-    # Note: In our UI we had one "Reference Designator" mapping. 
-    # We assume the user selected the BOM column name.
-    # We need to find the equivalent in XY. Usually standardizing both works best.
-    
-    # Standardize Keys for Joining (Create temp columns)
-    # We assume 'Ref Des' is the normalized column in BOM from previous step
-    # We need to ensure we know the XY Ref column. 
-    # For this implementation, we will try to auto-detect the XY ref col if not explicitly separated in UI.
-    
-    # --- HELPER: Find XY Ref Column ---
-    # In Screen 2, if we mapped "Reference Designator" to a BOM column, 
-    # we need to find the matching XY column. 
-    # A robust app would have 2 dropdowns. 
-    # For now, let's look for the mapped name, OR standard "Ref", "Designator".
-    xy_key = None
+    xy_key = find_xy_ref_column(xy_df, bom_ref_col)
+
+    # 2. Join (or reuse the join of identical inputs)
+    with stage("logic_engine.fingerprint"):
+        bom_fp = frame_fingerprint(bom_df)
+        xy_fp = frame_fingerprint(xy_df)
+    join_key = (xy_fp, xy_key, bom_fp, bom_ref_col, policy)
+    joined = _cache_get(_join_cache, join_key)
+    if joined is None:
+        xy_side, xy_report = _prepared_side(xy_df, xy_fp, xy_key, policy, "XY")
+        bom_side, bom_report = _prepared_side(bom_df, bom_fp, bom_ref_col, policy, "BOM")
+        duplicates = pd.concat([xy_report, bom_report], ignore_index=True)
+        if policy == "reject" and len(duplicates):
+            raise DuplicateRefError(duplicates)
+
+        # 3. Perform Outer Join
+        # indicator=True creates a '_merge' column: 'left_only', 'right_only', 'both'
+        # left = XY, right = BOM (We treat XY as the physical master)
+        with stage("logic_engine.join") as s:
+            merged_df = _outer_join(xy_side, bom_side)
+            s.rows = len(merged_df)
+        joined = (merged_df, duplicates)
+        _cache_put(_join_cache, join_key, joined, JOIN_CACHE_SIZE)
+
+    with stage("logic_engine.project"):
+        return _project(*joined, mapping)
+
+def join_prepared(xy_side, bom_side, duplicates, mapping):
+    """
+    Steps 3 and 4 of perform_merge_and_validation, uncached, for sides that
+    already have a unique '_JOIN_KEY' (see join_keys / resolve_duplicates).
+    Used per partition by chunked_merge.
+    duplicates: Duplicate report DataFrame for attrs["duplicates"].
+    Returns: Unified DataFrame, as perform_merge_and_validation.
+    """
+    return _project(_outer_join(xy_side, bom_side), duplicates, mapping)
+
+def find_xy_ref_column(xy_df, bom_ref_col):
+    """
+    In Screen 2 "Reference Designator" is mapped to a BOM column (one dropdown).
+    The XY file uses the same name, or we fall back to the first column that
+    looks like "Ref" / "Designator".
+    Returns: XY column name. Raises ValueError if there is none.
+    """
     if bom_ref_col in xy_df.columns:
-        xy_key = bom_ref_col
-    else:
-        # Fallback search
-        for c in xy_df.columns:
-            if "des" in c.lower() or "ref" in c.lower():
-                xy_key = c
-                break
-    
-    if not xy_key:
-        raise ValueError("Could not find Reference Designator column in XY file.")
-
-    # 2. Prepare Dataframes for Merge
-    # Standardize keys to Uppercase/Trimmed for the join
-    bom_df['_JOIN_KEY'] = bom_df[bom_ref_col].astype(str).str.strip().str.upper()
-    xy_df['_JOIN_KEY'] = xy_df[xy_key].astype(str).str.strip().str.upper()
-
-    # 3. Perform Outer Join
-    # indicator=True creates a '_merge' column: 'left_only', 'right_only', 'both'
-    # left = XY, right = BOM (We treat XY as the physical master)
-    merged_df = pd.merge(xy_df, bom_df, on='_JOIN_KEY', how='outer', indicator=True, suffixes=('_XY', '_BOM'))
-
-    # 4. Process Results & Rename Columns based on Mapping
-    final_rows = []
-    
-    for _, row in merged_df.iterrows():
-        # Determine Status
-        merge_status = row['_merge']
-        status = "UNKNOWN"
-        if merge_status == 'both': status = "MATCHED"
-        elif merge_status == 'left_only': status = "XY_ONLY"  # In XY, missing BOM
-        elif merge_status == 'right_only': status = "BOM_ONLY" # In BOM, missing XY
-        
-        # Build Unified Row
-        new_row = {
-            "Ref Des": row['_JOIN_KEY'],
-            "Status": status,
-            "Is Ignored": False, # Default
-            # XY Data (Handle if missing)
-            "Layer": row.get(mapping.get("Layer / Side"), ""),
-            "Mid X": row.get(mapping.get("Mid X"), ""),
-            "Mid Y": row.get(mapping.get("Mid Y"), ""),
-            "Rotation": row.get(mapping.get("Rotation"), ""),
-            # BOM Data (Handle if missing)
-            "Part Number": row.get(mapping.get("Part Number"), ""),
-            "Value": row.get(mapping.get("Value"), ""),
-            "Footprint": row.get(mapping.get("Footprint"), ""),
-            "Description": row.get(mapping.get("Description"), "")
-        }
-        
-        # Auto-Ignore logic for Fiducials (Optional, can be expanded)
-        ref = new_row["Ref Des"]
-        if ref.startswith("FID") or ref.startswith("TP") or ref.startswith("MH"):
-            if status == "XY_ONLY":
-                new_row["Is Ignored"] = True
-                
-        final_rows.append(new_row)
-
-    return pd.DataFrame(final_rows)
\ No newline at end of file
+        return bom_ref_col
+    for c in xy_df.columns:
+        if "des" in c.lower() or "ref" in c.lower():
+            return c
+    raise ValueError("Could not find Reference Designator column in XY file.")
+
+def join_keys(refs):
+    """Returns: The standardized join key (Uppercase/Trimmed) of each Ref Des."""
+    return refs.astype(str).str.strip().str.upper()
+
+def frame_fingerprint(df):
+    """
+    Content hash of a DataFrame (column names, dtypes, values; not the index).
+    Arrow-backed columns hash their buffers directly, which is much faster
+    than pandas' per-row object hashing.
+    Returns: Hex digest string.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode())
+    for col in df.columns:
+        values = df[col].array
+        if hasattr(values, "__arrow_array__"):
+            chunks = values.__arrow_array__()
+            for chunk in getattr(chunks, "chunks", [chunks]):
+                # Sliced arrays share buffers: offset + length pin the content
+                digest.update(f"{chunk.offset}:{len(chunk)}".encode())
+                for buffer in chunk.buffers():
+                    if buffer is not None:
+                        digest.update(memoryview(buffer))
+        elif df[col].dtype.kind in "biufcmM":
+            digest.update(np.ascontiguousarray(df[col].to_numpy()).view(np.uint8))
+        else:
+            digest.update(pd.util.hash_pandas_object(df[col], index=False).to_numpy().view(np.uint8))
+    return digest.hexdigest()
+
+def clear_merge_cache():
+    """Drops every memoized side and join (e.g. to free memory)."""
+    with _cache_lock:
+        _side_cache.clear()
+        _join_cache.clear()
+
+def _prepared_side(df, fingerprint, ref_col, policy, source):
+    """
+    Copy of df with the standardized '_JOIN_KEY' (Uppercase/Trimmed) and
+    duplicate keys resolved, cached per input frame.
+    Returns: (DataFrame, duplicate report)
+    """
+    key = (fingerprint, ref_col, policy)
+    side = _cache_get(_side_cache, key)
+    if side is None:
+        with stage("logic_engine.keys", source) as s:
+            keyed = df.assign(_JOIN_KEY=join_keys(df[ref_col]))
+            side = resolve_duplicates(keyed, '_JOIN_KEY', policy, source)
+            s.rows = len(df)
+        _cache_put(_side_cache, key, side, SIDE_CACHE_SIZE)
+    return side
+
+def _outer_join(xy_side, bom_side):
+    return pd.merge(xy_side, bom_side, on='_JOIN_KEY', how='outer', indicator=True, suffixes=('_XY', '_BOM'))
+
+def _project(merged_df, duplicates, mapping):
+    """
+    4. Process Results & Rename Columns based on Mapping (column-wise)
+    Returns: Unified frame built from the joined columns (merged_df untouched).
+    """
+    # Determine Status with a categorical lookup on the '_merge' indicator
+    status = merged_df['_merge'].cat.rename_categories(MERGE_STATUS).astype(object)
+    ref_des = merged_df['_JOIN_KEY']
+
+    # Build Unified Frame in one step: mapped source column, or "" if missing
+    unified = {
+        "Ref Des": ref_des,
+        "Status": status,
+        "Is Ignored": False, # Default
+    }
+    for field, source in OUTPUT_FIELDS.items():
+        source_col = mapping.get(source)
+        unified[field] = merged_df[source_col] if source_col in merged_df.columns else ""
+
+    result_df = pd.DataFrame(unified)
+
+    # Auto-Ignore logic for Fiducials (Optional, can be expanded)
+    auto_ignore = ref_des.str.match(AUTO_IGNORE_PATTERN, na=False) & (status == "XY_ONLY")
+    result_df["Is Ignored"] = auto_ignore.to_numpy()
+
+    result_df = result_df.reset_index(drop=True)
+    result_df.attrs["duplicates"] = duplicates.to_dict("records")
+    return result_df
+
+def _cache_get(cache, key):
+    with _cache_lock:
+        if key not in cache:
+            return None
+        cache.move_to_end(key)
+        return cache[key]
+
+def _cache_put(cache, key, value, max_entries):
+    with _cache_lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > max_entries:
+            cache.popitem(last=False)
+
+def resolve_duplicates(df, key_col, policy, source):
+    """
+    Finds keys listed more than once (one hashed value count) and applies policy:
+    "keep_first" drops later rows, "aggregate" keeps one row per key whose cells
+    hold the distinct values of all its rows, "reject" changes nothing (the
+    caller raises on the report).
+    Returns: (DataFrame with unique keys, report DataFrame with DUPLICATE_COLUMNS)
+    """
+    keys = df[key_col]
+    # Usual case: one uniqueness check, no counting
+    counts = keys.value_counts(sort=False) if not keys.is_unique else keys.iloc[:0].value_counts()
+    counts = counts[counts > 1]
+    action = {"keep_first": "kept first row", "aggregate": "combined rows", "reject": "rejected"}[policy]
+    report = pd.DataFrame({
+        "Ref Des": counts.index.to_numpy(),
+        "Source": source,
+        "Count": counts.to_numpy(dtype=np.int64),
+        "Action": action,
+    }, columns=DUPLICATE_COLUMNS)
+    if not len(counts) or policy == "reject":
+        return df, report
+
+    unique_df = df.drop_duplicates(subset=key_col, keep="first")
+    if policy == "aggregate":
+        # Only the duplicated keys are grouped; the rest is untouched
+        is_dup = unique_df[key_col].isin(counts.index)
+        dup_rows = df[df[key_col].isin(counts.index)]
+        combined = dup_rows.groupby(key_col, sort=False).agg(_join_distinct)
+        unique_df = unique_df.copy()
+        for col in combined.columns:
+            values = unique_df.loc[is_dup, key_col].map(combined[col])
+            unique_df[col] = unique_df[col].astype(object)
+            unique_df.loc[is_dup, col] = values
+    return unique_df, report
+
+def _join_distinct(values):
+    """Distinct non-empty values in first-seen order, AGGREGATE_SEPARATOR joined."""
+    distinct = dict.fromkeys(str(v).strip() for v in values if pd.notna(v) and str(v).strip())
+    return AGGREGATE_SEPARATOR.join(distinct)
@@ -1,78 +1,91 @@
 # src/core/normalizer.py
+import numpy as np
 import pandas as pd
-import re
 
+from src.core.instrumentation import instrumented
+
+# Range token (e.g., R1-R4 or C10-C12)
+# Regex Explanation:
+# ^([A-Za-z]+) -> Start with letters (Group 1: Prefix)
+# (\d+)        -> Followed by digits (Group 2: Start Num)
+# \s*-\s*      -> A hyphen with optional spaces
+# ([A-Za-z]*)  -> Optional letters (Group 3: End Prefix, usually same as start)
+# (\d+)$       -> Ends with digits (Group 4: End Num)
+RANGE_PATTERN = r'^([A-Za-z]+)(\d+)\s*-\s*([A-Za-z]*)(\d+)$'
+
+@instrumented("normalizer.normalize")
 def normalize_bom_data(df, ref_col_name, delimiter=','):
     """
     Takes a DataFrame and 'explodes' the Reference Column.
     Handles ranges (R1-R4) and delimiters (comma, space, etc).
+
+    Works column-wise: the ref column is tokenized with vectorized string ops,
+    ranges are expanded into an index array, and the output is built with a
+    single DataFrame.take() instead of one dict per designator.
+    """
+    return normalize_bom_rows(df, ref_col_name, delimiter)[0]
+
+def normalize_bom_rows(df, ref_col_name, delimiter=','):
     """
-    normalized_rows = []
-
-    # Iterate over every row in the dataframe
-    for index, row in df.iterrows():
-        raw_ref = str(row[ref_col_name])
-        
-        # 1. Clean the string (remove accidental double spaces)
-        # If user selected space delimiter, we don't want to replace spaces yet.
-        if delimiter != ' ': 
-            raw_ref = raw_ref.replace(' ', '') 
-
-        # 2. Split into tokens based on delimiter
-        # Handle mixed delimiters if necessary, but stick to primary first
-        if delimiter == 'auto':
-            # naive auto-detect: split by comma or semicolon or space
-            tokens = re.split(r'[;, ]+', raw_ref)
-        else:
-            tokens = raw_ref.split(delimiter)
-
-        # 3. Process each token (check for ranges)
-        expanded_refs = []
-        for token in tokens:
-            token = token.strip()
-            if not token: 
-                continue # Skip empty strings
-            
-            # Check for Range (e.g., R1-R4 or C10-C12)
-            # Regex Explanation: 
-            # ^([A-Za-z]+) -> Start with letters (Group 1: Prefix)
-            # (\d+)        -> Followed by digits (Group 2: Start Num)
-            # \s*-\s* -> A hyphen with optional spaces
-            # ([A-Za-z]*)  -> Optional letters (Group 3: End Prefix, usually same as start)
-            # (\d+)$       -> Ends with digits (Group 4: End Num)
-            range_match = re.match(r'^([A-Za-z]+)(\d+)\s*-\s*([A-Za-z]*)(\d+)$', token)
-            
-            if range_match:
-                prefix = range_match.group(1)
-                start_num = int(range_match.group(2))
-                end_prefix = range_match.group(3) # Might be empty
-                end_num = int(range_match.group(4))
-                
-                # Validation: prefixes must match (cannot do R1-C5)
-                # If end_prefix exists, it must equal prefix
-                if end_prefix and end_prefix.upper() != prefix.upper():
-                    # Invalid range (R1-C5), treat as single item or error
-                    expanded_refs.append(token)
-                else:
-                    # Expand the range
-                    # Ensure start < end
-                    if start_num > end_num:
-                        start_num, end_num = end_num, start_num # Swap if reverse order
-                    
-                    for i in range(start_num, end_num + 1):
-                        expanded_refs.append(f"{prefix}{i}")
-            else:
-                # No range, just a single ref
-                expanded_refs.append(token)
-
-        # 4. Create new rows for the DataFrame
-        for ref in expanded_refs:
-            new_row_dict = row.to_dict() 
-            new_row_dict[ref_col_name] = ref.upper() # Standardize
-            normalized_rows.append(new_row_dict)
-
-    # Create new DataFrame
-    df_normalized = pd.DataFrame(normalized_rows)
+    normalize_bom_data that also tells where every output row came from
+    (each input row expands on its own, so a changed row can be re-expanded alone).
+    Returns: (normalized DataFrame, source row position in df of every output row)
+    """
+    # Positional index so token -> source row lookups are plain array indexing
+    raw_refs = df[ref_col_name].map(str).astype(object).reset_index(drop=True)
+
+    # 1. Clean the string (remove accidental double spaces)
+    # If user selected space delimiter, we don't want to replace spaces yet.
+    if delimiter != ' ':
+        raw_refs = raw_refs.str.replace(' ', '', regex=False)
+
+    # 2. Split into tokens based on delimiter (one token per line after explode)
+    if delimiter == 'auto':
+        # naive auto-detect: split by comma or semicolon or space
+        tokens = raw_refs.str.split(r'[;, ]+', regex=True)
+    else:
+        tokens = raw_refs.str.split(delimiter, regex=False)
+    tokens = tokens.explode().str.strip()
+    tokens = tokens[tokens != ''] # Skip empty strings
+
+    token_rows = tokens.index.to_numpy()
+    tokens = tokens.reset_index(drop=True)
+
+    # 3. Detect ranges for all tokens at once
+    parts = tokens.str.extract(RANGE_PATTERN)
+    prefix_upper = parts[0].str.upper()
+    end_prefix_upper = parts[2].str.upper()
+
+    # Validation: prefixes must match (cannot do R1-C5)
+    # Invalid ranges are kept as a single item, like any other token
+    is_range = (parts[0].notna() & ((end_prefix_upper == '') | (end_prefix_upper == prefix_upper))).to_numpy()
+
+    start_num = np.zeros(len(tokens), dtype=np.int64)
+    end_num = np.zeros(len(tokens), dtype=np.int64)
+    start_num[is_range] = parts[1][is_range].astype(np.int64).to_numpy()
+    end_num[is_range] = parts[3][is_range].astype(np.int64).to_numpy()
+
+    # Ensure start < end (swap if reverse order)
+    low = np.minimum(start_num, end_num)
+    high = np.maximum(start_num, end_num)
+
+    # 4. Expand: every token yields 1 ref, every range yields (high - low + 1)
+    counts = np.where(is_range, high - low + 1, 1)
+    ref_token = np.repeat(np.arange(len(tokens)), counts)
+    first_ref = np.cumsum(counts) - counts
+    numbers = np.repeat(low, counts) + (np.arange(len(ref_token)) - np.repeat(first_ref, counts))
+
+    refs = tokens.str.upper().to_numpy(dtype=object)[ref_token] # Standardize
+    in_range = is_range[ref_token]
+    if in_range.any():
+        range_prefix = pd.Series(prefix_upper.to_numpy(dtype=object)[ref_token[in_range]])
+        range_number = pd.Series(numbers[in_range]).astype(str)
+        refs[in_range] = (range_prefix + range_number).to_numpy(dtype=object)
+
+    # 5. Create new rows for the DataFrame in one shot
+    source_rows = token_rows[ref_token]
+    df_normalized = df.take(source_rows)
+    df_normalized[ref_col_name] = refs
     df_normalized.reset_index(drop=True, inplace=True)
-    
-    return df_normalized
\ No newline at end of file
+
+    return df_normalized, source_rows
@@ -0,0 +1,192 @@
+# src/core/panelize.py
+# Step-and-repeat: one board's merged placements -> a full panel.
+import re
+import numpy as np
+import pandas as pd
+
+from src.core.instrumentation import instrumented
+from src.core.schema import NUMERIC_COLUMNS
+from src.core.units import UNIT_MM, parse_numbers
+
+# Panel definition keys and defaults (same dict is saved in batch manifests)
+PANEL_DEFAULTS = {
+    "rows": 1,
+    "cols": 1,
+    "pitch_x": 0.0,         # Board-to-board step, X/Y units (mm by default)
+    "pitch_y": 0.0,
+    "board_width": None,    # Board size: rotation/mirror pivot on its centre
+    "board_height": None,   # (None = centre of the placement extents)
+    "rotation": 0.0,        # Degrees, every board (counter-clockwise)
+    "mirror": False,        # Every board flipped (X mirrored, Top <-> Bottom)
+    "board_rotation": {},   # {board: degrees} overrides per board
+    "mirrored_boards": [],  # Boards flipped in addition to "mirror"
+    "skip": [],             # Boards left empty (x-outs)
+    "ref_format": "{ref}_{board}",
+}
+
+# Board numbers start at 1, row by row from the panel origin (bottom left)
+BOARD_COLUMN = "Board"
+
+# Coordinates in the panel output are rounded to this many decimals
+COORD_DECIMALS = 4
+
+_LAYER_SIDE = re.compile(r'^(top|bottom|t|b)', re.IGNORECASE)
+_FLIPPED_SIDE = {"top": "bottom", "bottom": "top", "t": "b", "b": "t"}
+
+def panel_definition(panel):
+    """
+    Fills in defaults and validates a panel dict.
+    Returns: Complete panel definition (new dict).
+    """
+    unknown = set(panel) - set(PANEL_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown panel settings: {', '.join(sorted(unknown))}")
+    definition = {**PANEL_DEFAULTS, **panel}
+    if int(definition["rows"]) < 1 or int(definition["cols"]) < 1:
+        raise ValueError("Panel needs at least 1 row and 1 column.")
+    if "{ref}" not in definition["ref_format"] or "{board}" not in definition["ref_format"]:
+        raise ValueError("ref_format must contain {ref} and {board}.")
+    definition["board_rotation"] = {int(k): float(v) for k, v in definition["board_rotation"].items()}
+    definition["mirrored_boards"] = [int(b) for b in definition["mirrored_boards"]]
+    definition["skip"] = [int(b) for b in definition["skip"]]
+    return definition
+
+@instrumented("panelize.expand")
+def panelize(df, panel):
+    """
+    Repeats every placement of a single-board merged frame for each board
+    of the panel. Per board, placements are mirrored and/or rotated about
+    the board centre, then shifted by the board's pitch offset, all with
+    NumPy broadcasting (boards x parts).
+    Ref Des gets the board suffix (ref_format), a Board column is added,
+    Mid X / Mid Y / Rotation become numbers (X/Y/Angle are kept in sync).
+    Mid X / Mid Y stay in the unit of their text: the output unit, or the
+    file's unit when its text was kept (attrs["units"]["text"] is set to it).
+    Returns: Panel DataFrame, board by board.
+    """
+    panel = panel_definition(panel)
+    rows, cols = int(panel["rows"]), int(panel["cols"])
+
+    # 1. Boards that get populated (row-major, bottom left = board 1)
+    boards = np.arange(1, rows * cols + 1)
+    boards = boards[~np.isin(boards, panel["skip"])]
+    if not len(boards):
+        raise ValueError("Every board of the panel is skipped.")
+    board_row, board_col = np.divmod(boards - 1, cols)
+    offset_x = board_col * float(panel["pitch_x"])
+    offset_y = board_row * float(panel["pitch_y"])
+
+    rotation = np.array([panel["board_rotation"].get(b, panel["rotation"]) for b in boards], dtype=np.float64)
+    mirrored = np.isin(boards, panel["mirrored_boards"]) ^ bool(panel["mirror"])
+
+    # 2. Placement arrays (n,) against board arrays (B, 1) -> (B, n)
+    x = _numbers(df, "Mid X")
+    y = _numbers(df, "Mid Y")
+    angle = _numbers(df, "Rotation")
+    centre_x, centre_y = _board_centre(x, y, panel)
+
+    # Board-local coordinates relative to the centre; mirror flips X
+    dx = (x - centre_x)[None, :] * np.where(mirrored, -1.0, 1.0)[:, None]
+    dy = (y - centre_y)[None, :]
+    local_angle = np.where(mirrored[:, None], 180.0 - angle[None, :], angle[None, :])
+
+    phi = np.radians(rotation)[:, None]
+    cos_phi, sin_phi = np.cos(phi), np.sin(phi)
+    panel_x = dx * cos_phi - dy * sin_phi + (centre_x + offset_x)[:, None]
+    panel_y = dx * sin_phi + dy * cos_phi + (centre_y + offset_y)[:, None]
+    panel_angle = np.mod(local_angle + rotation[:, None], 360.0)
+
+    # 3. Untouched columns repeated board by board (categoricals stay categoricals)
+    n_parts, n_boards = len(df), len(boards)
+    replaced = {"Ref Des"} | set(NUMERIC_COLUMNS) | set(NUMERIC_COLUMNS.values())
+    out = df[[c for c in df.columns if c not in replaced]].take(np.tile(np.arange(n_parts), n_boards))
+    out.reset_index(drop=True, inplace=True)
+
+    out["Ref Des"] = _suffixed_refs(df["Ref Des"], boards, panel["ref_format"])
+    out[BOARD_COLUMN] = np.repeat(boards, n_parts).astype(np.int32)
+    units = df.attrs.get("units")
+    text_unit = units and (units.get("text") or units["input"])
+    to_text = UNIT_MM[units["output"]] / UNIT_MM[text_unit] if units else 1.0
+    for text_col, values in (("Mid X", panel_x), ("Mid Y", panel_y), ("Rotation", panel_angle)):
+        values = values.ravel()
+        if text_col in df.columns:
+            scale = 1.0 if text_col == "Rotation" else to_text
+            out[text_col] = (values * scale).round(COORD_DECIMALS)
+        out[NUMERIC_COLUMNS[text_col]] = values.round(COORD_DECIMALS)
+    if units:
+        out.attrs = {**df.attrs, "units": {**units, "text": text_unit}}
+
+    if mirrored.any() and "Layer" in out.columns:
+        out["Layer"] = _flip_layers(out["Layer"], np.repeat(mirrored, n_parts))
+
+    # Original column order, Board right after Ref Des
+    order = [c for c in df.columns if c in out.columns]
+    order.insert(order.index("Ref Des") + 1, BOARD_COLUMN)
+    order += [c for c in out.columns if c not in order]
+    return out[order]
+
+def _board_centre(x, y, panel):
+    """Pivot for rotation/mirror: board size if given, else the placement extents."""
+    placed = np.isfinite(x) & np.isfinite(y)
+    if panel["board_width"] is not None and panel["board_height"] is not None:
+        return float(panel["board_width"]) / 2, float(panel["board_height"]) / 2
+    if not placed.any():
+        return 0.0, 0.0
+    return (
+        (x[placed].min() + x[placed].max()) / 2,
+        (y[placed].min() + y[placed].max()) / 2,
+    )
+
+def _numbers(df, text_col):
+    numeric_col = NUMERIC_COLUMNS[text_col]
+    if numeric_col in df.columns:
+        return df[numeric_col].to_numpy(dtype=np.float64)
+    if text_col in df.columns:
+        return parse_numbers(df[text_col]).to_numpy()
+    return np.full(len(df), np.nan)
+
+def _suffixed_refs(refs, boards, ref_format):
+    """
+    'R1' on board 3 -> 'R1_3'. Text before and after {ref} is joined column-wise.
+    Returns: Series indexed 0..boards * parts - 1.
+    """
+    n_parts = len(refs)
+    # Arrow-backed takes + one concat: no per-row Python strings
+    refs = refs.astype(str).reset_index(drop=True)
+    result = refs.take(np.tile(np.arange(n_parts), len(boards))).reset_index(drop=True)
+
+    before, after = ref_format.split("{ref}", 1)
+    board_rows = np.repeat(np.arange(len(boards)), n_parts)
+    if before:
+        labels = pd.Series([before.format(board=b) for b in boards], dtype=str)
+        result = labels.take(board_rows).reset_index(drop=True) + result
+    if after:
+        labels = pd.Series([after.format(board=b) for b in boards], dtype=str)
+        result = result + labels.take(board_rows).reset_index(drop=True)
+    return result
+
+def _flip_layers(layer, flip):
+    """Top <-> Bottom (and T <-> B) for the rows in flip, keeping the spelling style."""
+    layer = pd.Categorical(layer)
+    names = list(layer.categories)
+    if not names:
+        return layer
+    flipped = [_flip_side(str(name)) for name in names]
+
+    # Category codes are remapped, no per-row string work
+    categories = list(dict.fromkeys(names + flipped))
+    lookup = {name: i for i, name in enumerate(categories)}
+    keep_codes = np.array([lookup[name] for name in names])
+    flip_codes = np.array([lookup[name] for name in flipped])
+    codes = layer.codes
+    new_codes = np.where(codes < 0, -1, np.where(flip, flip_codes[codes], keep_codes[codes]))
+    return pd.Categorical.from_codes(new_codes, categories=categories)
+
+def _flip_side(name):
+    def swap(match):
+        text = match.group(1)
+        new = _FLIPPED_SIDE[text.lower()]
+        if text.isupper():
+            return new.upper()
+        return new.capitalize() if text[0].isupper() else new
+    return _LAYER_SIDE.sub(swap, name, count=1)
@@ -0,0 +1,184 @@
+# src/core/parse_cache.py
+import functools
+import hashlib
+import json
+import os
+import threading
+import pandas as pd
+
+from src.core.file_loader import LOADER_VERSION, load_and_clean_file
+from src.core.instrumentation import stage
+
+# Feather needs pyarrow; without it entries fall back to pickle
+try:
+    import pyarrow # noqa: F401
+    CACHE_FORMAT = "feather"
+except ImportError:
+    CACHE_FORMAT = "pkl"
+
+# Defaults, overridable per instance or through the environment
+DEFAULT_CACHE_DIR = os.environ.get(
+    "PCB_BOM_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".pcb_bom_merger", "cache")
+)
+DEFAULT_MAX_BYTES = int(os.environ.get("PCB_BOM_CACHE_MAX_MB", "512")) * 1024 * 1024
+
+HASH_CHUNK_SIZE = 1 << 20
+INDEX_FILE = "index.json"
+
+class ParseCache:
+    """
+    On-disk cache of cleaned DataFrames returned by load_and_clean_file.
+
+    Entries are keyed by file content hash + loader + LOADER_VERSION, so a
+    renamed or copied file still hits, and neither another loader (or reader
+    backend) nor a loader change is ever served another parse's frame.
+    A small index remembers (mtime, size) -> hash per path, so an unchanged
+    file is not even re-hashed. Total size is capped with LRU eviction
+    (entry file mtime is the "last used" stamp).
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_bytes = DEFAULT_MAX_BYTES if max_bytes is None else max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._index = self._read_index()
+        self._lock = threading.Lock() # BOM and XY may load on two threads at once
+
+    def load(self, file_path, loader=load_and_clean_file, progress=None):
+        """
+        Returns the cached frame for file_path, parsing and storing it on a miss.
+        loader: Parse function, part of the key (e.g. a functools.partial of
+                load_and_clean_file with another reader is cached apart).
+        progress: Passed to the loader on a miss (not part of the key); if it
+                  raises, nothing is stored.
+        """
+        with stage("parse_cache.load", os.path.basename(file_path)) as s:
+            df = self.get(file_path, loader)
+            if df is None:
+                df = loader(file_path) if progress is None else loader(file_path, progress=progress)
+                self.put(file_path, df, loader)
+            s.rows = len(df)
+        return df
+
+    def get(self, file_path, loader=load_and_clean_file):
+        """Returns the frame cached for file_path parsed by loader, or None."""
+        entry_path = self._entry_path(self._content_key(file_path, loader))
+        if not os.path.exists(entry_path):
+            return None
+        try:
+            df = self._read_entry(entry_path)
+        except Exception:
+            # Corrupt or truncated entry: drop it and re-parse
+            self._remove(entry_path)
+            return None
+        os.utime(entry_path) # Mark as most recently used
+        return df
+
+    def put(self, file_path, df, loader=load_and_clean_file):
+        """Stores df for file_path parsed by loader. Frames that cannot be serialized are skipped."""
+        entry_path = self._entry_path(self._content_key(file_path, loader))
+        tmp_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            self._write_entry(df, tmp_path)
+            os.replace(tmp_path, entry_path)
+        except Exception:
+            # e.g. non-string column names: caching is best effort
+            self._remove(tmp_path)
+            return False
+        self._evict()
+        return True
+
+    def clear(self):
+        for name in os.listdir(self.cache_dir):
+            self._remove(os.path.join(self.cache_dir, name))
+        with self._lock:
+            self._index = {}
+
+    # --- Keys ---
+
+    def _content_key(self, file_path, loader):
+        """Content hash + loader + loader version. Re-hashes only if mtime/size changed."""
+        abs_path = os.path.abspath(file_path)
+        stat = os.stat(abs_path)
+        with self._lock:
+            known = self._index.get(abs_path)
+        if known and known["mtime_ns"] == stat.st_mtime_ns and known["size"] == stat.st_size:
+            digest = known["hash"]
+        else:
+            digest = _hash_file(abs_path)
+            with self._lock:
+                self._index[abs_path] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "hash": digest}
+                self._write_index()
+        return f"{digest}-{_loader_key(loader)}-v{LOADER_VERSION}"
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.{CACHE_FORMAT}")
+
+    # --- Storage ---
+
+    def _read_entry(self, entry_path):
+        if CACHE_FORMAT == "feather":
+            return pd.read_feather(entry_path)
+        return pd.read_pickle(entry_path)
+
+    def _write_entry(self, df, path):
+        if CACHE_FORMAT == "feather":
+            df.reset_index(drop=True).to_feather(path)
+        else:
+            df.to_pickle(path)
+
+    def _evict(self):
+        """Deletes least recently used entries until the cache fits max_bytes."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(f".{CACHE_FORMAT}"):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(os.path.join(self.cache_dir, name))
+            total -= size
+
+    def _read_index(self):
+        try:
+            with open(os.path.join(self.cache_dir, INDEX_FILE)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self):
+        # Forget paths that no longer exist so the index does not grow forever
+        self._index = {p: v for p, v in self._index.items() if os.path.exists(p)}
+        tmp_path = os.path.join(self.cache_dir, f"{INDEX_FILE}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, os.path.join(self.cache_dir, INDEX_FILE))
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def _loader_key(loader):
+    """
+    Short id of a loader that is stable across runs: module + qualified name,
+    plus the arguments bound by functools.partial (e.g. reader="pandas").
+    """
+    bound = []
+    while isinstance(loader, functools.partial):
+        bound.append(repr((loader.args, sorted(loader.keywords.items()))))
+        loader = loader.func
+    name = getattr(loader, "__qualname__", type(loader).__qualname__)
+    identity = f"{getattr(loader, '__module__', '')}.{name}{''.join(bound)}"
+    return hashlib.blake2b(identity.encode(), digest_size=6).hexdigest()
+
+def _hash_file(file_path):
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,328 @@
+# src/core/readers.py
+# Reader backends for load_and_clean_file. Each file type has backends in
+# order of preference; the first one installed (and willing to read the
+# file) wins, the pure-Python ones always work.
+#
+# Excel backends: read(file_path, max_rows) -> iterator of row lists with
+#   merged ranges filled (max_rows set: preview, only the first rows matter).
+# Text backends: read(file_path, text_format, max_rows) -> DataFrame of str,
+#   text_format = {"encoding", "delimiter", "names", "skip_lines"} (sniffed by
+#   file_loader: the header line and everything above it are skipped).
+# A backend that cannot handle a particular file raises ReaderNotApplicable
+# and the next one is tried.
+import re
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+import pandas as pd
+import openpyxl
+from openpyxl.utils.cell import range_boundaries
+
+from src.core.instrumentation import stage
+
+# Optional backends
+try:
+    from python_calamine import CalamineWorkbook, CalamineSheet
+    # Older releases cannot report merged cells: not used, the fill would be lost
+    CALAMINE_AVAILABLE = hasattr(CalamineSheet, "merged_cell_ranges")
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa_csv = None
+
+EXCEL = "excel"
+TEXT = "text"
+
+# Name -> {"name", "kind", "extensions", "available", "read"}; insertion order is preference
+READERS = {}
+
+# Cells read as NaN (pandas' default NA strings, as of pandas 3.0): every text
+# backend gets this list, so all of them turn the same cells into NaN
+NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+# Rows a preview may need above its data rows (file_loader.HEADER_SCAN_ROWS)
+HEADER_PEEK_ROWS = 21
+
+# Streaming Excel reader: sheet XML is scanned in 1 MB chunks for merged ranges
+XML_CHUNK_SIZE = 1 << 20
+MERGE_CELL_PATTERN = re.compile(rb'<(?:\w+:)?mergeCell\b[^>]*?\bref="([^"]+)"')
+# Relationship types (package root -> workbook part)
+OFFICE_DOCUMENT_REL = "/officeDocument"
+
+# pyarrow reads blocks of this size in parallel
+ARROW_BLOCK_SIZE = 4 << 20
+# Byte-oriented encodings: lines can be skipped on raw bytes (UTF-16 goes to pandas)
+ARROW_ENCODINGS = {"utf-8": "utf8", "utf-8-sig": "utf8", "ascii": "utf8", "cp1252": "cp1252", "latin-1": "latin-1"}
+
+class ReaderNotApplicable(Exception):
+    """Raised by a backend that cannot read this file: the next backend is tried."""
+
+def register_reader(name, kind, extensions, read, available=True):
+    """Adds a backend after the existing ones (lowest preference)."""
+    READERS[name] = {"name": name, "kind": kind, "extensions": tuple(extensions),
+                     "available": bool(available), "read": read}
+
+def readers_for(ext, preferred=None):
+    """
+    Installed backends for a file extension, in order of preference.
+    preferred: Backend name to use alone (e.g. for benchmarks).
+    Returns: List of backend dicts. Raises ValueError if none can read ext.
+    """
+    candidates = [r for r in READERS.values() if ext in r["extensions"]]
+    if preferred is not None:
+        candidates = [r for r in candidates if r["name"] == preferred]
+        if not candidates:
+            raise ValueError(f"Reader '{preferred}' does not read {ext} files")
+    installed = [r for r in candidates if r["available"]]
+    if not installed:
+        if candidates:
+            names = ", ".join(r["name"] for r in candidates)
+            raise ValueError(f"Reading {ext} files needs one of: {names} (not installed)")
+        raise ValueError(f"Unsupported file format: {ext}")
+    return installed
+
+def available_readers():
+    """Returns: {backend name: installed?} for diagnostics."""
+    return {name: r["available"] for name, r in READERS.items()}
+
+# --- Excel: python-calamine (Rust) ---
+
+def _calamine_rows(file_path, max_rows=None):
+    """
+    Rows of the active sheet (as openpyxl's), read by calamine in one call
+    (also reads legacy .xls). Merged ranges come with the sheet, previews
+    get them too.
+    """
+    sheet = CalamineWorkbook.from_path(file_path).get_sheet_by_index(_active_sheet_index(file_path))
+    # ((first row, first col), (last row, last col)), 0-based; None if unknown for the format
+    merged_ranges = [
+        (col0 + 1, row0 + 1, col1 + 1, row1 + 1)
+        for (row0, col0), (row1, col1) in sheet.merged_cell_ranges or ()
+    ]
+    nrows = None if max_rows is None else max_rows + HEADER_PEEK_ROWS
+    rows = sheet.to_python(skip_empty_area=False, nrows=nrows)
+    # Same values as openpyxl: empty cells are None, whole numbers are int
+    rows = ([_openpyxl_value(v) for v in row] for row in rows)
+    return fill_merged_ranges(rows, merged_ranges)
+
+def _openpyxl_value(value):
+    if value == "":
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+# --- Excel: openpyxl read-only (streaming) ---
+
+def _openpyxl_rows(file_path, max_rows=None):
+    """
+    Rows of the active sheet in read-only mode (no workbook object model).
+    Preview (max_rows set): stops after the rows a preview can use, and
+    merged ranges are not filled (they are stored after the cell data, so
+    finding them means reading the whole sheet).
+    """
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = wb.active
+        merged_ranges = []
+        if max_rows is None:
+            with stage("file_loader.merged_ranges") as s:
+                merged_ranges = _read_merged_ranges(file_path, sheet.title)
+                s.rows = len(merged_ranges)
+        # Some writers store a wrong <dimension>; read every row at its real width
+        sheet.reset_dimensions()
+        last_row = None if max_rows is None else max_rows + HEADER_PEEK_ROWS
+        yield from fill_merged_ranges(sheet.iter_rows(max_row=last_row, values_only=True), merged_ranges)
+    finally:
+        wb.close()
+
+def fill_merged_ranges(rows, merged_ranges):
+    """
+    Yields rows as lists, with every merged range filled with its top-left value.
+    merged_ranges: (min_col, min_row, max_col, max_row) tuples, 1-based.
+    """
+    # Merged ranges grouped by their first row: {min_row: [(min_col, max_col, max_row), ...]}
+    pending_merges = {}
+    for min_col, min_row, max_col, max_row in merged_ranges:
+        pending_merges.setdefault(min_row, []).append((min_col, max_col, max_row))
+
+    active_merges = [] # (min_col, max_col, max_row, top-left value)
+    for row_num, values in enumerate(rows, start=1):
+        values = list(values)
+
+        # Remember the top-left value of merges starting on this row
+        for min_col, max_col, max_row in pending_merges.pop(row_num, ()):
+            value = values[min_col - 1] if min_col <= len(values) else None
+            active_merges.append((min_col, max_col, max_row, value))
+
+        # Fill every merge that covers this row
+        if active_merges:
+            active_merges = [m for m in active_merges if m[2] >= row_num]
+            for min_col, max_col, _, value in active_merges:
+                if len(values) < max_col:
+                    values.extend([None] * (max_col - len(values)))
+                values[min_col - 1:max_col] = [value] * (max_col - min_col + 1)
+
+        yield values
+
+def _read_merged_ranges(file_path, title):
+    """
+    Collects merged ranges from the XML of the sheet called title without
+    building cells (read-only sheets do not expose them). The XML is
+    scanned in chunks for <mergeCell ref="..."/> tags.
+    Returns: List of (min_col, min_row, max_col, max_row) tuples.
+    """
+    ranges = []
+    tail = b""
+    with zipfile.ZipFile(file_path) as archive, archive.open(_sheet_part(archive, title)) as src:
+        while True:
+            chunk = src.read(XML_CHUNK_SIZE)
+            data = tail + chunk
+            # Only scan up to the last '<' so a tag is never cut in half
+            cut = data.rfind(b"<") if chunk else len(data)
+            if cut == -1:
+                cut = len(data)
+            for ref in MERGE_CELL_PATTERN.findall(data, 0, cut):
+                ranges.append(range_boundaries(ref.decode()))
+            tail = data[cut:]
+            if not chunk:
+                break
+    return ranges
+
+def _active_sheet_index(file_path):
+    """
+    Position of the sheet the workbook opens on (<workbookView activeTab=..>,
+    what openpyxl's wb.active reads). Legacy .xls is not a zip package: 0.
+    """
+    if not zipfile.is_zipfile(file_path):
+        return 0
+    with zipfile.ZipFile(file_path) as archive:
+        workbook = _workbook_root(archive)[1]
+    for element in workbook.iter():
+        if _local_name(element.tag) == "workbookView":
+            return int(element.get("activeTab", 0))
+    return 0
+
+def _sheet_part(archive, title):
+    """
+    Zip member of the worksheet called title, found the way the package
+    format describes it: root relationships -> workbook part -> its
+    <sheet name=.. r:id=..> -> the workbook's relationships.
+    Returns: Member name, e.g. "xl/worksheets/sheet1.xml".
+    """
+    workbook_part, workbook = _workbook_root(archive)
+    for element in workbook.iter():
+        if _local_name(element.tag) == "sheet" and element.get("name") == title:
+            rel_id = next(value for key, value in element.attrib.items() if _local_name(key) == "id")
+            return _relationships(archive, workbook_part)[rel_id][1]
+    raise ValueError(f"Sheet '{title}' not found in the workbook")
+
+def _workbook_root(archive):
+    """Returns: (zip member of the workbook part, its parsed XML root)."""
+    workbook_part = next(target for rel_type, target in _relationships(archive, "").values()
+                         if rel_type.endswith(OFFICE_DOCUMENT_REL))
+    with archive.open(workbook_part) as f:
+        return workbook_part, ET.parse(f).getroot()
+
+def _local_name(name):
+    """'{namespace}sheet' -> 'sheet' (prefixes vary between writers)."""
+    return name.rsplit("}", 1)[-1]
+
+def _relationships(archive, part):
+    """
+    Returns: {relationship id: (type, zip member of the target)} of a package
+    part ("" for the package root).
+    """
+    folder, name = posixpath.split(part)
+    rels_path = posixpath.join(folder, "_rels", f"{name}.rels")
+    with archive.open(rels_path) as f:
+        root = ET.parse(f).getroot()
+    targets = {}
+    for rel in root:
+        target = rel.get("Target", "")
+        # Absolute targets start at the package root, others at the part's folder
+        path = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join(folder, target))
+        targets[rel.get("Id")] = (rel.get("Type", ""), path)
+    return targets
+
+# --- Text: pyarrow CSV (multi-threaded) ---
+
+def _arrow_read(file_path, text_format, max_rows=None):
+    """
+    Parses everything below the header line with pyarrow. Files pyarrow
+    would read differently from pandas (ragged rows, other encodings)
+    are declined.
+    """
+    if text_format["encoding"] not in ARROW_ENCODINGS:
+        raise ReaderNotApplicable(f"pyarrow: {text_format['encoding']} input")
+    names = text_format["names"]
+    read_options = pa_csv.ReadOptions(column_names=names, block_size=ARROW_BLOCK_SIZE,
+                                      encoding=ARROW_ENCODINGS[text_format["encoding"]])
+    parse_options = pa_csv.ParseOptions(delimiter=text_format["delimiter"], newlines_in_values=True)
+    convert_options = pa_csv.ConvertOptions(
+        column_types={name: pa.string() for name in names},
+        null_values=NA_VALUES,
+        strings_can_be_null=True,
+    )
+    with open(file_path, "rb") as f:
+        for _ in range(text_format["skip_lines"]):
+            f.readline()
+        try:
+            if max_rows is None:
+                table = pa_csv.read_csv(f, read_options, parse_options, convert_options)
+            else:
+                reader = pa_csv.open_csv(f, read_options, parse_options, convert_options)
+                batches = []
+                for batch in reader:
+                    batches.append(batch)
+                    if sum(len(b) for b in batches) >= max_rows:
+                        break
+                table = pa.Table.from_batches(batches, schema=reader.schema).slice(0, max_rows)
+        except pa.ArrowInvalid as e:
+            # e.g. "Expected 6 columns, got 7": pandas keeps such rows
+            raise ReaderNotApplicable(f"pyarrow: {e}")
+    return table.to_pandas()
+
+# --- Text: pandas C parser ---
+
+def _pandas_read(file_path, text_format, max_rows=None):
+    """Single pandas parse below the header line (ragged rows are kept)."""
+    return pd.read_csv(file_path, nrows=max_rows, **_pandas_options(text_format))
+
+def read_text_batches(file_path, text_format, batch_rows):
+    """
+    Same parse as the pandas backend, handed out batch_rows rows at a time
+    (only one batch is in memory).
+    Returns: Iterator of DataFrames of str.
+    """
+    with pd.read_csv(file_path, chunksize=batch_rows, **_pandas_options(text_format)) as chunks:
+        yield from chunks
+
+def _pandas_options(text_format):
+    names = text_format["names"]
+    return {
+        "sep": text_format["delimiter"],
+        "encoding": text_format["encoding"],
+        "dtype": str,
+        "header": None,
+        "names": names,
+        "skiprows": text_format["skip_lines"],
+        "usecols": range(len(names)), # Fields past the header have no name
+        "index_col": False,
+        "na_values": NA_VALUES,
+        "keep_default_na": False,
+    }
+
+register_reader("calamine", EXCEL, (".xlsx", ".xlsm", ".xls"), _calamine_rows,
+                available=CALAMINE_AVAILABLE)
+register_reader("openpyxl", EXCEL, (".xlsx", ".xlsm"), _openpyxl_rows)
+# .pos / .rpt: centroid reports file_loader did not recognize, read as plain text
+register_reader("pyarrow", TEXT, (".csv", ".txt", ".pos", ".rpt"), _arrow_read, available=pa_csv is not None)
+register_reader("pandas", TEXT, (".csv", ".txt", ".pos", ".rpt"), _pandas_read)
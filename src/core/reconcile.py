@@ -0,0 +1,182 @@
+# src/core/reconcile.py
+# Near-miss Ref Des reconciliation: pairs leftover XY_ONLY / BOM_ONLY parts
+# that are the same part spelled differently (R01 / R1, C_10 / C10, U1A / U1).
+import numpy as np
+import pandas as pd
+
+from src.core.instrumentation import instrumented
+from src.core.schema import Status
+
+# Columns filled from the BOM row when a proposal is accepted
+BOM_FIELDS = ["Part Number", "Value", "Footprint", "Description"]
+
+PROPOSAL_COLUMNS = ["XY Ref Des", "BOM Ref Des", "Reason", "XY Row", "BOM Row"]
+
+# df.attrs key of the accepted pairs ({"XY Ref Des", "BOM Ref Des"} dicts)
+ACCEPTED_KEY = "accepted"
+
+# Canonical form (applied in this order, whole column at a time)
+_SEPARATORS = r'[\s_\-./]+'          # C_10 -> C10
+_LEADING_ZEROS = (r'([A-Z])0+(\d)', r'\1\2')  # R01 -> R1
+_GATE_SUFFIX = (r'^(.*\d)[A-Z]{1,2}$', r'\1') # U1A -> U1
+
+# Letters before the first digit / the rest: the edit-distance tier only
+# edits the letters (after the first one), the rest must be equal
+_PREFIX_AND_NUMBER = r'^([A-Z]*)(.*)$'
+
+@instrumented("reconcile.propose")
+def propose_matches(df):
+    """
+    Proposes XY_ONLY <-> BOM_ONLY pairs, strongest reason first:
+    1. "canonical": equal after removing separators and leading zeros
+    2. "gate suffix": equal after also folding a trailing gate letter
+    3. "edit distance 1": one letter of the prefix inserted, deleted or
+       replaced (LED3 / LD3); the number and the first letter are never
+       edited, so R1 / R10, R12 / R13 and R10 / C10 are distinct parts
+    Every tier is a hash join, and edit-distance candidates come from a
+    deletion-variant index, so nothing is compared all-pairs. Refs with more
+    than one candidate in a tier are left alone; each part is used once.
+    Ignored XY rows are skipped.
+    Returns: DataFrame with PROPOSAL_COLUMNS (XY/BOM Row are positions into df).
+    """
+    status = df["Status"].to_numpy()
+    ignored = df["Is Ignored"].to_numpy(dtype=bool)
+    refs = df["Ref Des"].astype(str).str.strip().str.upper().to_numpy()
+    xy = pd.DataFrame({"row": np.flatnonzero((status == Status.XY_ONLY.value) & ~ignored)})
+    bom = pd.DataFrame({"row": np.flatnonzero(status == Status.BOM_ONLY.value)})
+    if not len(xy) or not len(bom):
+        return pd.DataFrame(columns=PROPOSAL_COLUMNS)
+
+    for side in (xy, bom):
+        side["key"] = canonical_refs(refs[side["row"]]).to_numpy()
+
+    found = []
+    tiers = [
+        ("canonical", lambda keys: keys),
+        ("gate suffix", lambda keys: keys.str.replace(*_GATE_SUFFIX, regex=True)),
+    ]
+    for reason, to_key in tiers:
+        pairs = _unique_pairs(xy.assign(key=to_key(xy["key"])), bom.assign(key=to_key(bom["key"])))
+        found.append(pairs.assign(reason=reason))
+        xy = xy[~xy["row"].isin(pairs["row_xy"])]
+        bom = bom[~bom["row"].isin(pairs["row_bom"])]
+
+    found.append(_edit_distance_pairs(xy, bom).assign(reason="edit distance 1"))
+
+    pairs = pd.concat(found, ignore_index=True)
+    return pd.DataFrame({
+        "XY Ref Des": refs[pairs["row_xy"].to_numpy(dtype=np.int64)],
+        "BOM Ref Des": refs[pairs["row_bom"].to_numpy(dtype=np.int64)],
+        "Reason": pairs["reason"].to_numpy(),
+        "XY Row": pairs["row_xy"].to_numpy(dtype=np.int64),
+        "BOM Row": pairs["row_bom"].to_numpy(dtype=np.int64),
+    }, columns=PROPOSAL_COLUMNS)
+
+def canonical_refs(refs):
+    """
+    ' c_010 ' -> 'C10'. Gate suffixes are kept (folded by propose_matches).
+    Returns: str Series.
+    """
+    keys = pd.Series(refs, copy=False).astype(str).str.strip().str.upper()
+    keys = keys.str.replace(_SEPARATORS, "", regex=True)
+    return keys.str.replace(*_LEADING_ZEROS, regex=True).reset_index(drop=True)
+
+@instrumented("reconcile.accept")
+def accept_matches(df, proposals):
+    """
+    Merges each accepted pair into one MATCHED row: the XY row (physical
+    master, keeps its Ref Des and placement) gets the BOM_FIELDS of the BOM
+    row, and the BOM row is dropped. The pairs are added to
+    attrs[ACCEPTED_KEY] so a re-merge can apply them again (reapply_accepted).
+    Returns: New DataFrame with a fresh 0..n-1 index (df is not modified).
+    """
+    xy_rows = proposals["XY Row"].to_numpy(dtype=np.int64)
+    bom_rows = proposals["BOM Row"].to_numpy(dtype=np.int64)
+    if len(np.unique(xy_rows)) != len(xy_rows) or len(np.unique(bom_rows)) != len(bom_rows):
+        raise ValueError("A part can only be reconciled once.")
+
+    result = df.copy()
+    for col in BOM_FIELDS:
+        if col in df.columns:
+            result.iloc[xy_rows, df.columns.get_loc(col)] = df[col].iloc[bom_rows].to_numpy()
+    result.iloc[xy_rows, df.columns.get_loc("Status")] = Status.MATCHED.value
+    result.iloc[xy_rows, df.columns.get_loc("Is Ignored")] = False
+    result = result.drop(index=df.index[bom_rows]).reset_index(drop=True)
+    pairs = proposals[["XY Ref Des", "BOM Ref Des"]].to_dict("records")
+    result.attrs = {**df.attrs, ACCEPTED_KEY: df.attrs.get(ACCEPTED_KEY, []) + pairs}
+    return result
+
+def reapply_accepted(df, accepted):
+    """
+    Accepts stored pairs again on a re-merged frame: a pair applies while its
+    XY ref is still a single XY_ONLY row and its BOM ref a single BOM_ONLY
+    row. Pairs that no longer hold (a ref removed, or now matched on its own)
+    are dropped.
+    Returns: New DataFrame; attrs[ACCEPTED_KEY] gains the pairs applied.
+    """
+    if not accepted:
+        return df
+    status = df["Status"].to_numpy()
+    refs = df["Ref Des"].astype(str).str.strip().str.upper().to_numpy()
+    pairs = pd.DataFrame(accepted, columns=["XY Ref Des", "BOM Ref Des"])
+
+    def rows_of(side_status, side_refs):
+        """Position of each ref among the rows with this status (-1: none or several)."""
+        rows = np.flatnonzero(status == side_status)
+        at = pd.Series(rows, index=refs[rows])
+        at = at[~at.index.duplicated(keep=False)]
+        return at.reindex(side_refs).fillna(-1).to_numpy(dtype=np.int64)
+
+    xy_rows = rows_of(Status.XY_ONLY.value, pairs["XY Ref Des"])
+    bom_rows = rows_of(Status.BOM_ONLY.value, pairs["BOM Ref Des"])
+    valid = (xy_rows >= 0) & (bom_rows >= 0)
+    if not valid.any():
+        return df
+    proposals = pairs[valid].assign(Reason="accepted", **{"XY Row": xy_rows[valid], "BOM Row": bom_rows[valid]})
+    return accept_matches(df, proposals[PROPOSAL_COLUMNS])
+
+def _unique_pairs(xy, bom):
+    """Hash join on key, keeping only refs with exactly one candidate."""
+    pairs = xy.merge(bom, on="key", suffixes=("_xy", "_bom"))
+    single = ~pairs["row_xy"].duplicated(keep=False) & ~pairs["row_bom"].duplicated(keep=False)
+    return pairs.loc[single, ["row_xy", "row_bom"]]
+
+def _edit_distance_pairs(xy, bom):
+    """
+    Levenshtein distance 1 through deletion variants: two prefixes are one
+    edit apart iff one is the other minus a character (pos -1 on one side),
+    or both lose a character at the same position (substitution). Only keys
+    with the same number part are joined.
+    """
+    if not len(xy) or not len(bom):
+        return pd.DataFrame(columns=["row_xy", "row_bom"])
+    xy_variants = _deletion_variants(xy)
+    bom_variants = _deletion_variants(bom)
+    pairs = xy_variants.merge(bom_variants, on=["variant", "number"], suffixes=("_xy", "_bom"))
+    one_edit = (pairs["pos_xy"] == -1) | (pairs["pos_bom"] == -1) | (pairs["pos_xy"] == pairs["pos_bom"])
+    pairs = pairs.loc[one_edit & (pairs["pos_xy"] + pairs["pos_bom"] > -2), ["row_xy", "row_bom"]]
+    pairs = pairs.drop_duplicates()
+    single = ~pairs["row_xy"].duplicated(keep=False) & ~pairs["row_bom"].duplicated(keep=False)
+    return pairs[single]
+
+def _deletion_variants(side):
+    """
+    Every key's letter prefix plus each one-letter deletion of it (never the
+    first letter), built position by position, next to the key's number part.
+    """
+    keys = side["key"].astype(str).reset_index(drop=True)
+    rows = side["row"].to_numpy()
+    parts = keys.str.extract(_PREFIX_AND_NUMBER)
+    prefix = parts[0]
+    number = parts[1].to_numpy()
+    lengths = prefix.str.len().to_numpy()
+
+    frames = [pd.DataFrame({"variant": prefix.to_numpy(), "number": number, "row": rows, "pos": -1})]
+    for pos in range(1, int(lengths.max()) if len(lengths) else 0):
+        has_pos = lengths > pos
+        variant = prefix.str.slice(0, pos) + prefix.str.slice(pos + 1)
+        frames.append(pd.DataFrame({
+            "variant": variant.to_numpy()[has_pos], "number": number[has_pos],
+            "row": rows[has_pos], "pos": pos,
+        }))
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,90 @@
+# src/core/schema.py
+# Typed representation of the merged placement frame (stage after mapping).
+import enum
+import pandas as pd
+
+from src.core.instrumentation import instrumented
+from src.core.units import AUTO, DEFAULT_UNIT, convert_columns, normalize_rotation
+
+class Status(str, enum.Enum):
+    """Merge result of one reference designator."""
+    MATCHED = "MATCHED"
+    XY_ONLY = "XY_ONLY"   # In XY, missing from BOM
+    BOM_ONLY = "BOM_ONLY" # In BOM, missing from XY
+
+STATUS_DTYPE = pd.CategoricalDtype([status.value for status in Status])
+
+# Few distinct values per board: stored as categoricals (int codes + one copy of each text)
+CATEGORY_COLUMNS = ["Layer", "Footprint", "Part Number", "Value", "Description"]
+
+# Text column -> float column parsed from it. The text stays unless an output unit is mapped
+NUMERIC_COLUMNS = {
+    "Mid X": "X",
+    "Mid Y": "Y",
+    "Rotation": "Angle",
+}
+
+# Mapping entries that are not columns: unit of the XY file ("auto" = detect)
+# and unit of X/Y + the exported Mid X/Mid Y (None = keep the file's text)
+INPUT_UNITS_KEY = "Coordinate Units"
+OUTPUT_UNITS_KEY = "Output Units"
+
+@instrumented("schema.apply")
+def apply_schema(df, mapping=None):
+    """
+    Converts the merged frame from perform_merge_and_validation to compact types:
+    Status -> Status categorical, CATEGORY_COLUMNS -> categoricals, and a float64
+    column next to every NUMERIC_COLUMNS text column (NaN if unparseable).
+    X/Y are converted to the mapping's output unit (mm if unset) from the
+    detected or mapped input unit; Angle is canonical 0-360. With an output
+    unit set, Mid X / Mid Y / Rotation are replaced by those numbers too.
+    The units used end up in attrs["units"], "text" being the unit of the Mid X /
+    Mid Y text (None: the file's own text); df.attrs are carried over.
+    Returns: New typed DataFrame (df is not modified).
+    """
+    mapping = mapping or {}
+    output_unit = mapping.get(OUTPUT_UNITS_KEY)
+
+    # Mid X / Mid Y share one unit: detected (or mapped) and converted together
+    coordinate_cols = [col for col in ("Mid X", "Mid Y") if col in df.columns]
+    coordinates, units = convert_columns(
+        [df[col] for col in coordinate_cols],
+        mapping.get(INPUT_UNITS_KEY) or AUTO,
+        output_unit or DEFAULT_UNIT,
+        headers=[mapping.get(col) for col in coordinate_cols],
+    )
+    numbers_of = dict(zip(coordinate_cols, coordinates))
+
+    typed = {}
+    for col in df.columns:
+        values = df[col]
+        if col == "Status":
+            typed[col] = to_status(values)
+        elif col in CATEGORY_COLUMNS:
+            typed[col] = values.astype("category")
+        elif col == "Is Ignored":
+            typed[col] = values.astype(bool)
+        else:
+            typed[col] = values
+
+        if col in NUMERIC_COLUMNS:
+            numbers = normalize_rotation(values) if col == "Rotation" else numbers_of[col]
+            typed[NUMERIC_COLUMNS[col]] = pd.Series(numbers, index=df.index)
+            if output_unit:
+                typed[col] = typed[NUMERIC_COLUMNS[col]]
+
+    result = pd.DataFrame(typed, index=df.index)
+    result.attrs.update(df.attrs)
+    result.attrs["units"] = {**units, "text": output_unit}
+    return result
+
+def to_status(values):
+    """
+    Returns: values as a STATUS_DTYPE categorical.
+    Raises ValueError for anything that is not a Status value.
+    """
+    status = values.astype(STATUS_DTYPE)
+    unknown = status.isna() & values.notna()
+    if unknown.any():
+        raise ValueError(f"Unknown status values: {sorted(set(values[unknown].astype(str)))[:5]}")
+    return status
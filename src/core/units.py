@@ -0,0 +1,189 @@
+# src/core/units.py
+# Coordinate unit detection / conversion and rotation canonicalization.
+# Everything works on whole columns: one regex pass extracts number + suffix.
+import re
+import numpy as np
+import pandas as pd
+
+# Length of one unit in mm
+UNIT_MM = {
+    "mm": 1.0,
+    "mil": 0.0254,
+    "in": 25.4,
+}
+# Suffix / header spellings -> unit
+UNIT_ALIASES = {
+    "mm": "mm", "millimeter": "mm", "millimeters": "mm",
+    "mil": "mil", "mils": "mil", "thou": "mil",
+    "in": "in", "inch": "in", "inches": "in", '"': "in",
+}
+DEFAULT_UNIT = "mm"
+AUTO = "auto"
+
+# First number in a cell ("12.5mm", "-3", "R90", "1e3")
+NUMBER_PATTERN = r'([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)'
+# Unit suffix after a leading number ("1250mil", "31.75 mm", "1.2\"")
+_LEADING_NUMBER = r'^' + NUMBER_PATTERN + r'\s*'
+_TRAILING_UNIT = r'([\d.])\s*(?:[A-Za-z]+|")$' # Digit kept: "nan" stays castable
+# Unit named in a header, e.g. "Mid X (mil)", "X [mm]", "Center-X(in)"
+HEADER_UNIT_PATTERN = re.compile(r'[\(\[\s_-](mm|mils?|thou|in|inch|inches)[\)\]]?\s*$', re.IGNORECASE)
+
+# Board extent (max - min) in file units, only used to warn about unlabelled
+# files: over 1500 units wide looks like mil, under 25 like inches. Not proof
+# (a 15 mm board looks like inches, a 1200 mil one like mm), so never converted on.
+MIL_MIN_SPAN = 1500.0
+INCH_MAX_SPAN = 25.0
+
+def parse_numbers(values):
+    """
+    Parses text once into float64. Clean columns take a single cast; anything
+    else (units, prefixes, blanks) goes through one vectorized regex pass.
+    Returns: float64 Series, NaN where no number was found.
+    """
+    text = pd.Series(values, copy=False).astype(str).str.strip()
+    try:
+        return text.astype(np.float64)
+    except (ValueError, TypeError):
+        return text.str.extract(NUMBER_PATTERN, expand=False).astype(np.float64)
+
+def split_values(values):
+    """
+    Returns: (float64 numbers, unit per row or NaN). Both come from whole-column
+    string replaces (Arrow kernels), not per-row Python.
+    """
+    text = pd.Series(values, copy=False).astype(str).str.strip()
+    try:
+        # Plain numbers: a single cast, no suffixes
+        return text.astype(np.float64).to_numpy(), pd.Series(np.nan, index=text.index, dtype=object)
+    except (ValueError, TypeError):
+        pass
+    suffix = text.str.replace(_LEADING_NUMBER, "", regex=True).str.lower()
+    # Few distinct suffixes: map the categories, not every row
+    units = suffix.astype("category").map(UNIT_ALIASES).astype(object)
+    numbers = parse_numbers(text.str.replace(_TRAILING_UNIT, r"\1", regex=True)).to_numpy()
+    return numbers, units
+
+def detect_unit(columns, headers=()):
+    """
+    Unit a file's coordinates are labelled with, checked in this order:
+    1. suffixes on the values ("1250mil"), majority wins
+    2. a unit named in a column header ("Mid X (mm)")
+    The size of the numbers is no label: unlabelled files give None.
+    columns: Coordinate columns (e.g. Mid X and Mid Y) of the same file.
+    Returns: (unit or None, reason)
+    """
+    return _detect([split_values(values) for values in columns], headers)
+
+def unit_evidence(columns, evidence=None):
+    """
+    What detect_unit looks at (suffix counts, each column's min / max),
+    for files read in batches: every batch's columns are added to evidence.
+    Returns: {"suffixes": {unit: count}, "ranges": [(min, max) or None per column]}
+    """
+    return _add_evidence(evidence, [split_values(values) for values in columns])
+
+def detect_unit_from_evidence(evidence, headers=()):
+    """detect_unit over all batches added with unit_evidence. Returns: (unit or None, reason)"""
+    return _decide(evidence, headers)
+
+def extent_warning(evidence, unit):
+    """
+    For unlabelled coordinates taken as unit: a warning when the board extent
+    (see MIL_MIN_SPAN / INCH_MAX_SPAN) suggests another unit.
+    Returns: Warning text, or None.
+    """
+    spans = [high - low for low, high in filter(None, evidence["ranges"])]
+    if not spans:
+        return None
+    span = max(spans)
+    if span >= MIL_MIN_SPAN:
+        guess = "mil"
+    elif span <= INCH_MAX_SPAN:
+        guess = "in"
+    else:
+        guess = "mm"
+    if guess == unit:
+        return None
+    return (f"The XY coordinates carry no unit and were taken as {unit}, "
+            f"but a board extent of {span:g} looks like {guess}. Set the coordinate unit to convert them.")
+
+def convert_coordinates(values, unit, target=DEFAULT_UNIT):
+    """
+    Converts a coordinate column to target. Values with their own suffix use
+    it; plain numbers are taken as unit.
+    Returns: float64 array (NaN where no number was found).
+    """
+    _check_unit(unit)
+    _check_unit(target)
+    return _convert(split_values(values), unit, target)
+
+def convert_columns(columns, unit=AUTO, target=DEFAULT_UNIT, headers=()):
+    """
+    detect_unit + convert_coordinates for all coordinate columns of a file,
+    parsing each column only once.
+    Unlabelled coordinates (unit AUTO, nothing detected) are not converted:
+    they are taken as target, with a warning if their extent disagrees.
+    Returns: (list of float64 arrays, {"input", "reason", "output", "warning"})
+    """
+    _check_unit(target)
+    splits = [split_values(values) for values in columns]
+    warning = None
+    if unit == AUTO:
+        evidence = _add_evidence(None, splits)
+        unit, reason = _decide(evidence, headers)
+        if unit is None:
+            unit = target
+            warning = extent_warning(evidence, unit)
+    else:
+        _check_unit(unit)
+        reason = "given"
+    converted = [_convert(split, unit, target) for split in splits]
+    return converted, {"input": unit, "reason": reason, "output": target, "warning": warning}
+
+def _check_unit(unit):
+    if unit not in UNIT_MM:
+        raise ValueError(f"Unknown unit: {unit}")
+
+def _detect(splits, headers):
+    return _decide(_add_evidence(None, splits), headers)
+
+def _add_evidence(evidence, splits):
+    evidence = evidence or {"suffixes": {}, "ranges": [None] * len(splits)}
+    for units in (units for _, units in splits):
+        for unit, count in units.dropna().value_counts().items():
+            evidence["suffixes"][unit] = evidence["suffixes"].get(unit, 0) + int(count)
+    for i, (numbers, _) in enumerate(splits):
+        if np.isfinite(numbers).any():
+            low, high = np.nanmin(numbers), np.nanmax(numbers)
+            if evidence["ranges"][i] is not None:
+                low, high = min(low, evidence["ranges"][i][0]), max(high, evidence["ranges"][i][1])
+            evidence["ranges"][i] = (low, high)
+    return evidence
+
+def _decide(evidence, headers):
+    """1. suffix majority, 2. header unit, else None (see detect_unit)."""
+    if evidence["suffixes"]:
+        return max(evidence["suffixes"].items(), key=lambda item: item[1])[0], "value suffix"
+
+    for header in headers:
+        match = HEADER_UNIT_PATTERN.search(str(header or ""))
+        if match:
+            return UNIT_ALIASES[match.group(1).lower()], f"header '{header}'"
+    return None, "not labelled"
+
+def _convert(split, unit, target):
+    numbers, units = split
+    if units.isna().all():
+        return numbers * (UNIT_MM[unit] / UNIT_MM[target])
+    to_mm = units.astype("category").map(UNIT_MM).astype(np.float64).fillna(UNIT_MM[unit])
+    return numbers * to_mm.to_numpy() / UNIT_MM[target]
+
+def normalize_rotation(values):
+    """
+    "-90", "270.00", "R90", 450 -> degrees in [0, 360).
+    Returns: float64 array (NaN where no number was found).
+    """
+    numbers, _ = split_values(values)
+    rotation = np.mod(numbers, 360.0)
+    rotation[rotation == 360.0] = 0.0 # mod of tiny negatives can round up to 360
+    return rotation + 0.0 # -0.0 -> 0.0
@@ -0,0 +1,103 @@
+# src/ui/diagnostics.py
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QCheckBox, QPushButton,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog,
+                             QAbstractItemView)
+from PyQt5.QtCore import Qt, QTimer
+
+from src.core import instrumentation
+
+COLUMNS = ["Stage", "Detail", "Seconds", "Peak MB", "Rows", "Thread"]
+
+# Poll interval for new records (stages finish on worker threads)
+REFRESH_MS = 500
+# Peak MB of a stage that ran while another thread's stage did (process-wide peak)
+OVERLAPPED_TEXT = "n/a"
+OVERLAPPED_TIP = "Ran at the same time as another stage: its peak memory cannot be told apart"
+
+class DiagnosticsPanel(QWidget):
+    """
+    Lists the stages recorded by src.core.instrumentation: wall time,
+    peak memory and rows per load / normalize / merge / table fill.
+    Recording is switched on and off from here.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._shown_count = -1
+
+        layout = QVBoxLayout(self)
+        controls = QHBoxLayout()
+        self.chk_record = QCheckBox("Record stage timings")
+        self.chk_record.setChecked(instrumentation.is_enabled())
+        self.chk_record.toggled.connect(self.apply_settings)
+        self.chk_memory = QCheckBox("Track peak memory (slower)")
+        self.chk_memory.setChecked(instrumentation.is_tracking_memory())
+        self.chk_memory.toggled.connect(self.apply_settings)
+        btn_clear = QPushButton("Clear")
+        btn_clear.clicked.connect(self.clear)
+        btn_save = QPushButton("Save JSON...")
+        btn_save.clicked.connect(self.save_json)
+        controls.addWidget(self.chk_record)
+        controls.addWidget(self.chk_memory)
+        controls.addStretch()
+        controls.addWidget(btn_clear)
+        controls.addWidget(btn_save)
+        layout.addLayout(controls)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(REFRESH_MS)
+
+    def apply_settings(self):
+        if self.chk_record.isChecked():
+            instrumentation.enable(memory=self.chk_memory.isChecked())
+        else:
+            instrumentation.disable()
+
+    def clear(self):
+        instrumentation.clear()
+        self.refresh(force=True)
+
+    def refresh(self, force=False):
+        """Rebuilds the table when new stages were recorded (and the panel is visible)."""
+        count = instrumentation.record_count()
+        if not self.isVisible() or (count == self._shown_count and not force):
+            return
+        self._shown_count = count
+
+        records = instrumentation.records()
+        self.table.setRowCount(len(records))
+        for row, record in enumerate(records):
+            values = [
+                "    " * record["depth"] + record["stage"] + ("" if record["ok"] else " (failed)"),
+                record["detail"] or "",
+                f"{record['seconds']:.3f}",
+                _peak_text(record),
+                "" if record["rows"] is None else str(record["rows"]),
+                record["thread"],
+            ]
+            for col, text in enumerate(values):
+                item = QTableWidgetItem(text)
+                if col in (2, 3, 4):
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                if col == 3 and record.get("overlapped"):
+                    item.setToolTip(OVERLAPPED_TIP)
+                self.table.setItem(row, col, item)
+        self.table.scrollToBottom()
+
+    def save_json(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Diagnostics", "diagnostics.json", "JSON (*.json)")
+        if path:
+            instrumentation.to_json(path)
+
+def _peak_text(record):
+    if record["peak_mb"] is not None:
+        return f"{record['peak_mb']:.1f}"
+    return OVERLAPPED_TEXT if record.get("overlapped") else ""
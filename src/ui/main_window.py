@@ -1,10 +1,20 @@
 # src/ui/main_window.py
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, 
-                             QStackedWidget, QMessageBox)
+                             QStackedWidget, QMessageBox, QFileDialog, QDockWidget)
+from PyQt5.QtCore import Qt, QFileSystemWatcher, QTimer
+import os
 from src.ui.screens.screen_import import ImportScreen
-from src.ui.screens.screen_mapping import MappingScreen
-from src.ui.screens.screen_dashboard import DashboardScreen # <--- NEW
-from src.core.logic_engine import perform_merge_and_validation # <--- NEW
+from src.ui.workers import Worker, TaskProgress
+from src.ui.diagnostics import DiagnosticsPanel
+from src.ui.preload import start_preload
+# Everything that needs pandas (core modules, mapping + dashboard screens) is
+# imported where it is first used: the window appears before pandas is loaded
+
+# Let the first paint finish before the preload thread competes for the GIL
+PRELOAD_DELAY_MS = 50
+
+# Editors save in bursts (truncate, write, rename): wait for the file to settle
+WATCH_DEBOUNCE_MS = 500
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -14,37 +24,92 @@ class MainWindow(QMainWindow):
 
         self.bom_df = None
         self.xy_df = None
+        self.merge_worker = None
+        self.export_worker = None
+        self.mapping = None
+        self.sources = {} # "bom" / "xy" -> incremental.snapshot of the loaded file
+        self.refresh_worker = None
+        self.preload_started = False
+        self.preload_worker = None
+
+        # Watch mode: changed source files are re-read and merged incrementally
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.on_source_changed)
+        self.changed_sources = set()
+        self.watch_timer = QTimer(self)
+        self.watch_timer.setSingleShot(True)
+        self.watch_timer.setInterval(WATCH_DEBOUNCE_MS)
+        self.watch_timer.timeout.connect(self.refresh_changed_sources)
 
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
         self.layout = QVBoxLayout(self.central_widget)
         self.stack = QStackedWidget()
         self.layout.addWidget(self.stack)
+        self.task_progress = TaskProgress() # Shared by merge and export
+        self.task_progress.btn_cancel.clicked.connect(self._unlock_screens)
+        self.layout.addWidget(self.task_progress)
 
-        # Screens
-        self.screen_import = ImportScreen()
-        self.screen_mapping = MappingScreen()
-        self.screen_dashboard = DashboardScreen() # <--- NEW
+        # Diagnostics: per-stage timings, hidden until View > Diagnostics
+        self.diagnostics = DiagnosticsPanel()
+        self.diagnostics_dock = QDockWidget("Diagnostics", self)
+        self.diagnostics_dock.setObjectName("diagnostics_dock")
+        self.diagnostics_dock.setWidget(self.diagnostics)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.diagnostics_dock)
+        self.diagnostics_dock.hide()
+        view_menu = self.menuBar().addMenu("View")
+        view_menu.addAction(self.diagnostics_dock.toggleViewAction())
 
+        # Screens: mapping + dashboard are built when the data first gets there
+        self.screen_import = ImportScreen()
+        self.screen_mapping = None
+        self.screen_dashboard = None
         self.stack.addWidget(self.screen_import)   # 0
-        self.stack.addWidget(self.screen_mapping)  # 1
-        self.stack.addWidget(self.screen_dashboard)# 2
-        
+
         # Signals
         self.screen_import.next_clicked.connect(self.go_to_mapping)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.preload_started: # First show only
+            self.preload_started = True
+            QTimer.singleShot(PRELOAD_DELAY_MS, self._start_preload)
+
+    def _start_preload(self):
+        self.preload_worker = start_preload()
+
+    def _build_screens(self):
+        """Creates the mapping and dashboard screens (first visit only)."""
+        if self.screen_mapping is not None:
+            return
+        from src.ui.screens.screen_mapping import MappingScreen
+        from src.ui.screens.screen_dashboard import DashboardScreen
+
+        self.screen_mapping = MappingScreen()
+        self.screen_dashboard = DashboardScreen()
+        self.stack.addWidget(self.screen_mapping)  # 1
+        self.stack.addWidget(self.screen_dashboard)# 2
+
         self.screen_mapping.back_clicked.connect(self.go_to_import)
         self.screen_mapping.next_clicked.connect(self.go_to_validation)
-        
+
         # Dashboard Signals
         self.screen_dashboard.back_clicked.connect(self.go_to_mapping_from_dash)
         self.screen_dashboard.export_clicked.connect(self.perform_final_export)
+        self.screen_dashboard.watch_toggled.connect(self.set_watching)
 
     def go_to_mapping(self):
+        from src.core.incremental import snapshot
+
         if not hasattr(self.screen_import, 'clean_bom_df') or self.screen_import.xy_df is None:
              QMessageBox.warning(self, "Error", "Data not ready.")
              return
+        self._build_screens()
         self.bom_df = self.screen_import.clean_bom_df
         self.xy_df = self.screen_import.xy_df
+        self.sources = {"bom": self.screen_import.bom_snapshot, "xy": snapshot(self.xy_df)}
+        if self.watcher.files():
+            self.set_watching(True) # Files may have been replaced
         
         bom_cols = list(self.bom_df.columns)
         xy_cols = list(self.xy_df.columns)
@@ -55,23 +120,171 @@ class MainWindow(QMainWindow):
         self.stack.setCurrentIndex(0)
 
     def go_to_validation(self, mapping_dict):
-        try:
-            # CALL LOGIC ENGINE
-            result_df = perform_merge_and_validation(self.bom_df, self.xy_df, mapping_dict)
-            
-            # LOAD DATA INTO DASHBOARD
-            self.screen_dashboard.set_data(result_df)
-            
-            # SWITCH SCREEN
-            self.stack.setCurrentIndex(2)
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Merge Error", f"Logic Failed:\n{str(e)}")
+        # CALL LOGIC ENGINE (on a worker thread)
+        self.mapping = mapping_dict
+        self.screen_mapping.setEnabled(False)
+        self.merge_worker = Worker(self._merge_task, self.bom_df, self.xy_df, mapping_dict)
+        self.task_progress.track(self.merge_worker, "Merging BOM and XY...")
+        self.merge_worker.signals.finished.connect(self.on_merge_done)
+        self.merge_worker.signals.failed.connect(self.on_merge_failed)
+        self.merge_worker.start()
+
+    def _merge_task(self, report, bom_df, xy_df, mapping_dict):
+        """Runs on a worker thread."""
+        from src.core.logic_engine import perform_merge_and_validation
+        from src.core.schema import apply_schema
+
+        report("Joining on Reference Designator...")
+        merged_df = perform_merge_and_validation(bom_df, xy_df, mapping_dict)
+        report("Converting columns to typed schema...")
+        return apply_schema(merged_df, mapping_dict)
+
+    def _unlock_screens(self):
+        if self.screen_mapping is None: return
+        self.screen_mapping.setEnabled(True)
+        self.screen_dashboard.setEnabled(True)
+
+    def _is_current_merge(self):
+        worker = self.merge_worker
+        return worker is not None and not worker.cancelled and worker.signals is self.sender()
+
+    def on_merge_done(self, result_df):
+        if not self._is_current_merge(): return
+        self._unlock_screens()
+
+        # LOAD DATA INTO DASHBOARD
+        self.screen_dashboard.set_data(result_df)
+        
+        # SWITCH SCREEN
+        self.stack.setCurrentIndex(2)
+
+    def on_merge_failed(self, message):
+        if not self._is_current_merge(): return
+        self._unlock_screens()
+        QMessageBox.critical(self, "Merge Error", f"Logic Failed:\n{message}")
 
     def go_to_mapping_from_dash(self):
         self.stack.setCurrentIndex(1)
 
+    # --- WATCH MODE ---
+
+    def _source_paths(self):
+        """Returns: {"bom": path, "xy": path} of the loaded files."""
+        return {"bom": self.screen_import.bom_path, "xy": self.screen_import.xy_path}
+
+    def set_watching(self, enabled):
+        """Starts/stops watching the loaded BOM and XY files."""
+        if self.watcher.files():
+            self.watcher.removePaths(self.watcher.files())
+        if enabled:
+            self.watcher.addPaths([p for p in self._source_paths().values() if p and os.path.exists(p)])
+
+    def on_source_changed(self, path):
+        # Saving by rename drops the path from the watcher: add it back
+        if path not in self.watcher.files() and os.path.exists(path):
+            self.watcher.addPath(path)
+        self.changed_sources.add(path)
+        self.watch_timer.start() # Restart: one refresh per burst of writes
+
+    def refresh_changed_sources(self):
+        """Re-reads the changed files and re-merges only the changed rows (worker thread)."""
+        if self.screen_dashboard is None or self.screen_dashboard.master_df is None or not self.mapping:
+            return
+        if self.task_progress.is_busy():
+            self.watch_timer.start() # Busy: try again once it settles
+            return
+        paths = self._source_paths()
+        kinds = [kind for kind, path in paths.items() if path in self.changed_sources]
+        self.changed_sources.clear()
+        if not kinds:
+            return
+
+        self.screen_dashboard.setEnabled(False) # Ignore decisions must not race the update
+        self.refresh_worker = Worker(self._refresh_task, kinds, paths, dict(self.sources),
+                                     self.screen_dashboard.master_df, self.mapping,
+                                     self.screen_import.ref_col, self.screen_import.delimiter)
+        self.task_progress.track(self.refresh_worker, "Updating from changed files...")
+        self.refresh_worker.signals.finished.connect(self.on_refresh_done)
+        self.refresh_worker.signals.failed.connect(self.on_refresh_failed)
+        self.refresh_worker.start()
+
+    def _refresh_task(self, report, kinds, paths, sources, master_df, mapping, ref_col, delimiter):
+        """Runs on a worker thread."""
+        from src.core.file_loader import load_and_clean_file
+        from src.core.incremental import update_source, remerge
+
+        changed = {}
+        for kind in kinds:
+            report(f"Re-reading {os.path.basename(paths[kind])}...")
+            raw_df = self.screen_import.parse_cache.load(paths[kind], load_and_clean_file, progress=report)
+            if kind == "bom":
+                sources[kind], changed[kind] = update_source(sources[kind], raw_df, ref_col, delimiter)
+            else:
+                sources[kind], changed[kind] = update_source(sources[kind], raw_df)
+
+        report("Merging changed rows...")
+        full = any(rows is None for rows in changed.values()) # Columns changed
+        master_df, n_refs = remerge(master_df, sources["bom"]["clean"], sources["xy"]["clean"], mapping,
+                                    changed.get("bom"), changed.get("xy"), full=full)
+        return kinds, sources, master_df, n_refs
+
+    def on_refresh_done(self, result):
+        if self.refresh_worker is None or self.refresh_worker.signals is not self.sender(): return
+        self._unlock_screens()
+        kinds, self.sources, master_df, n_refs = result
+        self.bom_df = self.screen_import.clean_bom_df = self.sources["bom"]["clean"]
+        self.screen_import.bom_snapshot = self.sources["bom"]
+        self.screen_import.bom_df = self.sources["bom"]["raw"]
+        self.xy_df = self.screen_import.xy_df = self.sources["xy"]["clean"]
+
+        files = " + ".join(kind.upper() for kind in kinds)
+        self.screen_dashboard.lbl_watch.setText(f"{files} changed: {n_refs} Ref Des re-merged")
+        if n_refs:
+            self.screen_dashboard.set_data(master_df)
+
+    def on_refresh_failed(self, message):
+        if self.refresh_worker is None or self.refresh_worker.signals is not self.sender(): return
+        self._unlock_screens()
+        # Often a half-written file: the next save triggers another attempt
+        self.screen_dashboard.lbl_watch.setText(f"Update failed: {message.splitlines()[0] if message else ''}")
+
     def perform_final_export(self, final_df):
-        print("Ready to export!")
-        # We will implement this in Iteration 4
-        QMessageBox.information(self, "Done", "Export function coming in next update!")
\ No newline at end of file
+        # The chosen filter decides the optional side outputs
+        filters = ["Excel (*.xlsx)", "Excel + CSV copies (*.xlsx)", "Excel + Parquet copies (*.xlsx)"]
+        path, selected = QFileDialog.getSaveFileName(self, "Export Placement File", "placement.xlsx", ";;".join(filters))
+        if not path: return
+        if not path.lower().endswith(".xlsx"):
+            path += ".xlsx"
+
+        self.screen_dashboard.setEnabled(False)
+        self.export_worker = Worker(self._export_task, final_df, path, self.screen_dashboard.panel,
+                                    selected == filters[1], selected == filters[2])
+        self.task_progress.track(self.export_worker, "Exporting...")
+        self.export_worker.signals.finished.connect(self.on_export_done)
+        self.export_worker.signals.failed.connect(self.on_export_failed)
+        self.export_worker.start()
+
+    def _export_task(self, report, final_df, path, panel, write_csv, write_parquet):
+        """Runs on a worker thread."""
+        from src.core.exporter import export_placements
+        from src.core.panelize import panelize
+
+        if panel:
+            report("Building panel...")
+            final_df = panelize(final_df, panel)
+        report("Writing placement file...")
+        counts = export_placements(final_df, path, write_csv=write_csv, write_parquet=write_parquet,
+                                   progress=report)
+        return path, counts
+
+    def on_export_done(self, result):
+        if self.export_worker is None or self.export_worker.signals is not self.sender(): return
+        self._unlock_screens()
+        path, counts = result
+        summary = "\n".join(f"{sheet}: {n} rows" for sheet, n in counts.items())
+        QMessageBox.information(self, "Done", f"Saved {path}\n\n{summary}")
+
+    def on_export_failed(self, message):
+        if self.export_worker is None or self.export_worker.signals is not self.sender(): return
+        self._unlock_screens()
+        QMessageBox.critical(self, "Export Error", f"Export Failed:\n{message}")
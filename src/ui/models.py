@@ -0,0 +1,174 @@
+# src/ui/models.py
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+
+# Removing more separate row blocks than this resets the model instead
+MAX_REMOVE_BLOCKS = 64
+# Removed rows stay in storage (skipped by a sorted slot list) until there are
+# this many, or 1/COMPACT_FRACTION of the storage: then it is compacted once
+COMPACT_MIN_HOLES = 256
+COMPACT_FRACTION = 8
+
+class DataFrameTableModel(QAbstractTableModel):
+    """
+    Read-only table over a subset of rows of a DataFrame.
+    Nothing is copied into Qt items: the view asks data() only for the
+    cells it actually paints, so 100k+ rows stay smooth.
+    Removing rows does not move the stored values: removed storage slots are
+    kept in a short sorted list that model rows skip, and dropped in one
+    pass now and then, so one removal costs O(log n), not O(n).
+
+    columns: List of (Header Label, DataFrame Column).
+    """
+
+    def __init__(self, columns):
+        super().__init__()
+        self.headers = [header for header, _ in columns]
+        self.source_columns = [col for _, col in columns]
+        self.df = None
+        self._rows = np.empty(0, dtype=np.int64) # Positions into self.df, per storage slot
+        self._values = [] # One numpy array per column, in storage slot order
+        self._slot_of = np.empty(0, dtype=np.int64) # df position -> storage slot (-1: not shown)
+        self._removed = np.empty(0, dtype=np.int64) # Removed storage slots, sorted
+        self._gaps = np.empty(0, dtype=np.int64) # Shown slots before each removed one
+
+    def set_rows(self, df, rows):
+        """Shows df rows at the given positions (int array)."""
+        self.beginResetModel()
+        self.df = df
+        self._rows = np.asarray(rows, dtype=np.int64)
+        self._load_values()
+        self._slot_of = np.full(0 if df is None else len(df), -1, dtype=np.int64)
+        self._slot_of[self._rows] = np.arange(len(self._rows))
+        self._set_removed(np.empty(0, dtype=np.int64))
+        self.endResetModel()
+
+    @property
+    def rows(self):
+        """df positions of the model rows, in model order."""
+        if not len(self._removed):
+            return self._rows
+        return np.delete(self._rows, self._removed)
+
+    def _load_values(self):
+        self._values = []
+        for col in self.source_columns:
+            if self.df is not None and col in self.df.columns:
+                self._values.append(self.df[col].to_numpy()[self._rows])
+            else:
+                self._values.append(np.full(len(self._rows), "", dtype=object))
+
+    def remove_positions(self, positions):
+        """
+        Drops the model rows showing these df positions: O(k log n) for k
+        positions, through the position -> slot index (no scan of all rows).
+        Only the removed row blocks are signalled, so the view keeps its
+        scroll position and selection for everything else.
+        Returns: Number of model rows removed.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        positions = positions[(positions >= 0) & (positions < len(self._slot_of))]
+        slots = np.unique(self._slot_of[positions])
+        slots = slots[slots >= 0]
+        if not len(slots):
+            return 0
+        self._slot_of[self._rows[slots]] = -1
+
+        # Model rows of those slots, in contiguous blocks: [starts[i], ends[i]]
+        hit = slots - np.searchsorted(self._removed, slots)
+        breaks = np.flatnonzero(np.diff(hit) != 1)
+        block_starts = np.r_[0, breaks + 1]
+        block_ends = np.r_[breaks, len(hit) - 1]
+
+        if len(block_starts) > MAX_REMOVE_BLOCKS:
+            self.beginResetModel()
+            self._set_removed(np.union1d(self._removed, slots))
+            self.endResetModel()
+        else:
+            # Back to front so earlier block numbers stay valid
+            for first, last in zip(block_starts[::-1], block_ends[::-1]):
+                self.beginRemoveRows(QModelIndex(), int(hit[first]), int(hit[last]))
+                self._set_removed(np.union1d(self._removed, slots[first:last + 1]))
+                self.endRemoveRows()
+        if len(self._removed) > max(COMPACT_MIN_HOLES, len(self._rows) // COMPACT_FRACTION):
+            self._compact()
+        return len(slots)
+
+    def row_position(self, row):
+        """DataFrame row position of a model row."""
+        return self._rows[self._slot(row)]
+
+    def _slot(self, row):
+        """Storage slot of a model row: row plus the removed slots before it."""
+        return row + int(np.searchsorted(self._gaps, row, side="right"))
+
+    def _set_removed(self, removed):
+        self._removed = removed
+        self._gaps = removed - np.arange(len(removed))
+
+    def _compact(self):
+        """Drops the removed slots from storage (model rows do not change)."""
+        keep = np.ones(len(self._rows), dtype=bool)
+        keep[self._removed] = False
+        self._rows = self._rows[keep]
+        self._values = [values[keep] for values in self._values]
+        self._slot_of[self._rows] = np.arange(len(self._rows))
+        self._set_removed(np.empty(0, dtype=np.int64))
+
+    # --- Qt model interface ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows) - len(self._removed)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.ToolTipRole):
+            return None
+        value = self._values[index.column()][self._slot(index.row())]
+        return "" if pd.isna(value) else str(value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.headers[section]
+        return str(section + 1)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Column sort done by pandas in one call instead of per-row comparisons."""
+        if not self.rowCount():
+            return
+        self.layoutAboutToBeChanged.emit()
+        if len(self._removed):
+            self._compact()
+        keys = pd.Series(self._values[column]).astype(str)
+        # Numeric columns (X, Y, Rotation) sort by value when they parse
+        numbers = pd.to_numeric(keys, errors="coerce")
+        if numbers.notna().all():
+            keys = numbers
+        order_idx = np.argsort(keys.to_numpy(), kind="stable")
+        if order == Qt.DescendingOrder:
+            order_idx = order_idx[::-1]
+        self._rows = self._rows[order_idx]
+        self._values = [values[order_idx] for values in self._values]
+        self._slot_of[self._rows] = np.arange(len(self._rows))
+        self.layoutChanged.emit()
+
+class DataFrameProxyModel(QSortFilterProxyModel):
+    """Case-insensitive text filter; sorting is delegated to the source model."""
+
+    def __init__(self, source):
+        super().__init__()
+        self.setSourceModel(source)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.setFilterKeyColumn(0) # Ref Des
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sourceModel().sort(column, order)
+
+    def source_rows(self, proxy_indexes):
+        """Source model rows for a list of proxy indexes (duplicates removed)."""
+        return sorted({self.mapToSource(index).row() for index in proxy_indexes})
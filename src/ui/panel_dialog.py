@@ -0,0 +1,91 @@
+# src/ui/panel_dialog.py
+from PyQt5.QtWidgets import (QDialog, QFormLayout, QSpinBox, QDoubleSpinBox, QCheckBox,
+                             QLineEdit, QDialogButtonBox, QMessageBox)
+
+from src.core.panelize import PANEL_DEFAULTS, panel_definition
+
+class PanelDialog(QDialog):
+    """Step-and-repeat settings. get_panel() returns the dict for panelize()."""
+
+    def __init__(self, panel=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Panel (Step and Repeat)")
+        panel = {**PANEL_DEFAULTS, **(panel or {})}
+
+        layout = QFormLayout(self)
+        self.spin_rows = self._int_spin(panel["rows"])
+        self.spin_cols = self._int_spin(panel["cols"])
+        self.spin_pitch_x = self._float_spin(panel["pitch_x"])
+        self.spin_pitch_y = self._float_spin(panel["pitch_y"])
+        self.spin_rotation = self._float_spin(panel["rotation"], -360, 360)
+        self.chk_mirror = QCheckBox("Flip every board (Top <-> Bottom)")
+        self.chk_mirror.setChecked(bool(panel["mirror"]))
+        self.txt_board_rotation = QLineEdit(
+            ", ".join(f"{board}:{deg:g}" for board, deg in panel["board_rotation"].items())
+        )
+        self.txt_board_rotation.setPlaceholderText("e.g. 2:180, 4:180")
+        self.txt_mirrored = QLineEdit(", ".join(str(b) for b in panel["mirrored_boards"]))
+        self.txt_mirrored.setPlaceholderText("e.g. 3, 4")
+        self.txt_skip = QLineEdit(", ".join(str(b) for b in panel["skip"]))
+        self.txt_skip.setPlaceholderText("X-outs, e.g. 7")
+        self.txt_ref_format = QLineEdit(panel["ref_format"])
+
+        layout.addRow("Rows:", self.spin_rows)
+        layout.addRow("Columns:", self.spin_cols)
+        layout.addRow("Pitch X:", self.spin_pitch_x)
+        layout.addRow("Pitch Y:", self.spin_pitch_y)
+        layout.addRow("Rotation (all boards):", self.spin_rotation)
+        layout.addRow("", self.chk_mirror)
+        layout.addRow("Rotated boards (board:deg):", self.txt_board_rotation)
+        layout.addRow("Flipped boards:", self.txt_mirrored)
+        layout.addRow("Skipped boards:", self.txt_skip)
+        layout.addRow("Ref Des format:", self.txt_ref_format)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+
+    def _int_spin(self, value):
+        spin = QSpinBox()
+        spin.setRange(1, 100)
+        spin.setValue(int(value))
+        return spin
+
+    def _float_spin(self, value, low=0.0, high=10000.0):
+        spin = QDoubleSpinBox()
+        spin.setDecimals(3)
+        spin.setRange(low, high)
+        spin.setValue(float(value))
+        return spin
+
+    def get_panel(self):
+        """Raises ValueError for unparseable board lists or an invalid definition."""
+        board_rotation = {}
+        for item in self._split(self.txt_board_rotation.text()):
+            board, _, degrees = item.partition(":")
+            board_rotation[int(board)] = float(degrees)
+        return panel_definition({
+            "rows": self.spin_rows.value(),
+            "cols": self.spin_cols.value(),
+            "pitch_x": self.spin_pitch_x.value(),
+            "pitch_y": self.spin_pitch_y.value(),
+            "rotation": self.spin_rotation.value(),
+            "mirror": self.chk_mirror.isChecked(),
+            "board_rotation": board_rotation,
+            "mirrored_boards": [int(b) for b in self._split(self.txt_mirrored.text())],
+            "skip": [int(b) for b in self._split(self.txt_skip.text())],
+            "ref_format": self.txt_ref_format.text().strip(),
+        })
+
+    def accept(self):
+        try:
+            self.get_panel()
+        except ValueError as e:
+            QMessageBox.warning(self, "Panel", f"Invalid panel settings:\n{e}")
+            return
+        super().accept()
+
+    @staticmethod
+    def _split(text):
+        return [item.strip() for item in text.replace(";", ",").split(",") if item.strip()]
@@ -0,0 +1,41 @@
+# src/ui/preload.py
+# Cold start: the window only needs PyQt5. pandas, openpyxl and the screens
+# behind the import screen are imported on a worker thread once the window
+# is up, so the first file load rarely waits for them.
+import importlib
+
+from src.core.instrumentation import stage
+from src.ui.workers import Worker
+
+# Roughly in the order the user needs them
+PRELOAD_MODULES = (
+    "pandas",
+    "openpyxl",
+    "src.core.file_loader",
+    "src.core.parse_cache",
+    "src.core.incremental",
+    "src.ui.screens.screen_mapping",
+    "src.ui.screens.screen_dashboard",
+    "src.core.exporter",
+)
+
+def preload_modules(report=None, modules=PRELOAD_MODULES):
+    """
+    Imports modules one by one (a later import of the same module is free).
+    A module that fails to import is skipped: the real import reports it.
+    Returns: Names of the modules that failed.
+    """
+    failed = []
+    for name in modules:
+        if report:
+            report(f"Loading {name}...")
+        with stage("startup.preload", name):
+            try:
+                importlib.import_module(name)
+            except Exception:
+                failed.append(name)
+    return failed
+
+def start_preload():
+    """Runs preload_modules on the global QThreadPool. Returns: The Worker."""
+    return Worker(preload_modules).start()
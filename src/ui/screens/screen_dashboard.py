@@ -1,17 +1,34 @@
 # src/ui/screens/screen_dashboard.py
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
-                             QTableWidgetItem, QLabel, QPushButton, QTabWidget, 
-                             QHeaderView, QMessageBox, QCheckBox, QFrame)
+import numpy as np
+import pandas as pd
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableView, 
+                             QLabel, QPushButton, QTabWidget, QLineEdit,
+                             QHeaderView, QMessageBox, QCheckBox, QFrame,
+                             QAbstractItemView, QAction, QDoubleSpinBox)
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QColor
 
+from src.core.instrumentation import stage
+from src.core.collisions import find_collisions, DEFAULT_MIN_DISTANCE
+from src.core.reconcile import propose_matches, accept_matches
+from src.core.logic_engine import DUPLICATE_COLUMNS
+from src.ui.models import DataFrameTableModel, DataFrameProxyModel
+from src.ui.panel_dialog import PanelDialog
+
 class DashboardScreen(QWidget):
     back_clicked = pyqtSignal()
     export_clicked = pyqtSignal(object) # Passes the final DataFrame
+    watch_toggled = pyqtSignal(bool) # Re-validate when the BOM/XY files change on disk
 
     def __init__(self):
         super().__init__()
         self.master_df = None
+        self.collisions_df = None # Pairs from find_collisions()
+        self.proposals_df = None # Near-miss Ref Des pairs from propose_matches()
+        # master_df position -> rows of collisions_df / proposals_df (see _position_index)
+        self.collisions_index = _position_index()
+        self.proposals_index = _position_index()
+        self.panel = None # Step-and-repeat definition applied at export (None = single board)
         self.init_ui()
 
     def init_ui(self):
@@ -28,30 +45,109 @@ class DashboardScreen(QWidget):
         summary_layout.addWidget(self.lbl_bom_warn)
         layout.addLayout(summary_layout)
 
+        # Unlabelled XY coordinates whose size suggests another unit (see units.extent_warning)
+        self.lbl_units = QLabel("")
+        self.lbl_units.setWordWrap(True)
+        self.lbl_units.setStyleSheet("background-color: #FFF3CD; color: #856404; padding: 6px;")
+        self.lbl_units.hide()
+        layout.addWidget(self.lbl_units)
+
+        # --- FILTER ---
+        self.txt_filter = QLineEdit()
+        self.txt_filter.setPlaceholderText("Filter by Ref Des...")
+        self.txt_filter.textChanged.connect(self.apply_filter)
+        layout.addWidget(self.txt_filter)
+
         # --- TABS ---
         self.tabs = QTabWidget()
         
         # Tab 1: XY Errors (Critical)
         self.tab_xy = QWidget()
-        self.table_xy = self._create_table(["Ref Des", "Layer", "X", "Y", "Action"])
+        self.table_xy = self._create_table([("Ref Des", "Ref Des"), ("Layer", "Layer"), ("X", "Mid X"), ("Y", "Mid Y")])
+        # Per-row action: right-click menu or button on the current selection
+        self.act_ignore = QAction("Ignore / DNI", self.table_xy)
+        self.act_ignore.triggered.connect(self.ignore_selected)
+        self.table_xy.addAction(self.act_ignore)
+        self.table_xy.setContextMenuPolicy(Qt.ActionsContextMenu)
+        self.table_xy.doubleClicked.connect(lambda _: self.ignore_selected())
+        btn_ignore = QPushButton("Ignore / DNI Selected")
+        btn_ignore.clicked.connect(self.ignore_selected)
+        # Bulk action: ignore every XY error whose Ref Des starts with a prefix
+        self.txt_ignore_prefix = QLineEdit()
+        self.txt_ignore_prefix.setPlaceholderText("Prefix, e.g. FID")
+        self.txt_ignore_prefix.returnPressed.connect(self.ignore_prefix)
+        btn_ignore_prefix = QPushButton("Ignore All With Prefix")
+        btn_ignore_prefix.clicked.connect(self.ignore_prefix)
+        xy_actions = QHBoxLayout()
+        xy_actions.addWidget(self.txt_ignore_prefix)
+        xy_actions.addWidget(btn_ignore_prefix)
+        xy_actions.addStretch()
+        xy_actions.addWidget(btn_ignore)
         xy_layout = QVBoxLayout(self.tab_xy)
         xy_layout.addWidget(self.table_xy)
+        xy_layout.addLayout(xy_actions)
         self.tabs.addTab(self.tab_xy, "XY Errors (Missing Parts)")
         
         # Tab 2: BOM Warnings
         self.tab_bom = QWidget()
-        self.table_bom = self._create_table(["Ref Des", "Part Number", "Description", "Action"])
+        self.table_bom = self._create_table([("Ref Des", "Ref Des"), ("Part Number", "Part Number"), ("Description", "Description")])
         bom_layout = QVBoxLayout(self.tab_bom)
         bom_layout.addWidget(self.table_bom)
         self.tabs.addTab(self.tab_bom, "BOM Only (No Location)")
 
         # Tab 3: Matched
         self.tab_match = QWidget()
-        self.table_match = self._create_table(["Ref Des", "Layer", "X", "Y", "Part Number", "Rotation"])
+        self.table_match = self._create_table([("Ref Des", "Ref Des"), ("Layer", "Layer"), ("X", "Mid X"), ("Y", "Mid Y"),
+                                               ("Part Number", "Part Number"), ("Rotation", "Rotation")])
         match_layout = QVBoxLayout(self.tab_match)
         match_layout.addWidget(self.table_match)
         self.tabs.addTab(self.tab_match, "Matched Data")
 
+        # Tab 4: Collisions (parts on the same layer closer than a distance)
+        self.tab_collisions = QWidget()
+        self.table_collisions = self._create_table([("Ref Des", "Ref Des A"), ("Too Close To", "Ref Des B"),
+                                                    ("Layer", "Layer"), ("Distance", "Distance")])
+        self.spin_min_distance = QDoubleSpinBox()
+        self.spin_min_distance.setDecimals(3)
+        self.spin_min_distance.setRange(0.001, 1000.0)
+        self.spin_min_distance.setSingleStep(0.05)
+        self.spin_min_distance.setValue(DEFAULT_MIN_DISTANCE)
+        self.spin_min_distance.valueChanged.connect(self.check_collisions)
+        collision_actions = QHBoxLayout()
+        self.lbl_min_distance = QLabel("Minimum distance:")
+        collision_actions.addWidget(self.lbl_min_distance)
+        collision_actions.addWidget(self.spin_min_distance)
+        collision_actions.addStretch()
+        collisions_layout = QVBoxLayout(self.tab_collisions)
+        collisions_layout.addLayout(collision_actions)
+        collisions_layout.addWidget(self.table_collisions)
+        self.tabs.addTab(self.tab_collisions, "Collisions")
+
+        # Tab 5: Near Matches (XY error + BOM warning that are the same part, e.g. R01 / R1)
+        self.tab_near = QWidget()
+        self.table_near = self._create_table([("XY Ref Des", "XY Ref Des"), ("BOM Ref Des", "BOM Ref Des"),
+                                              ("Reason", "Reason")])
+        btn_accept_selected = QPushButton("Accept Selected")
+        btn_accept_selected.clicked.connect(self.accept_selected_matches)
+        btn_accept_all = QPushButton("Accept All")
+        btn_accept_all.clicked.connect(self.accept_all_matches)
+        near_actions = QHBoxLayout()
+        near_actions.addStretch()
+        near_actions.addWidget(btn_accept_selected)
+        near_actions.addWidget(btn_accept_all)
+        near_layout = QVBoxLayout(self.tab_near)
+        near_layout.addWidget(self.table_near)
+        near_layout.addLayout(near_actions)
+        self.tabs.addTab(self.tab_near, "Near Matches")
+
+        # Tab 6: Duplicates (Ref Des listed more than once, resolved before the merge)
+        self.tab_duplicates = QWidget()
+        self.table_duplicates = self._create_table([("Ref Des", "Ref Des"), ("File", "Source"),
+                                                    ("Times Listed", "Count"), ("Action", "Action")])
+        duplicates_layout = QVBoxLayout(self.tab_duplicates)
+        duplicates_layout.addWidget(self.table_duplicates)
+        self.tabs.addTab(self.tab_duplicates, "Duplicates")
+
         layout.addWidget(self.tabs)
 
         # --- BOTTOM BAR ---
@@ -62,9 +158,23 @@ class DashboardScreen(QWidget):
         self.btn_export = QPushButton("GENERATE EXCEL >>")
         self.btn_export.setStyleSheet("font-weight: bold; padding: 10px;")
         self.btn_export.clicked.connect(self.on_export)
+
+        # Panelization happens at export: the tables keep showing one board
+        self.lbl_panel = QLabel("Single board")
+        btn_panel = QPushButton("Panel...")
+        btn_panel.clicked.connect(self.edit_panel)
+
+        self.chk_watch = QCheckBox("Watch source files")
+        self.chk_watch.setToolTip("Re-read the BOM/XY when they are saved; only changed rows are merged again")
+        self.chk_watch.toggled.connect(self.watch_toggled.emit)
+        self.lbl_watch = QLabel("")
         
         nav_layout.addWidget(btn_back)
+        nav_layout.addWidget(self.chk_watch)
+        nav_layout.addWidget(self.lbl_watch)
         nav_layout.addStretch()
+        nav_layout.addWidget(self.lbl_panel)
+        nav_layout.addWidget(btn_panel)
         nav_layout.addWidget(self.btn_export)
         
         layout.addLayout(nav_layout)
@@ -77,84 +187,205 @@ class DashboardScreen(QWidget):
         return lbl
 
     def _create_table(self, columns):
-        table = QTableWidget()
-        table.setColumnCount(len(columns))
-        table.setHorizontalHeaderLabels(columns)
+        """QTableView over a DataFrameTableModel. columns: List of (Header, DataFrame Column)."""
+        table = QTableView()
+        # Keep Python references: Qt does not own models set from Python
+        table.source_model = DataFrameTableModel(columns)
+        table.proxy_model = DataFrameProxyModel(table.source_model)
+        table.setModel(table.proxy_model)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.setSortingEnabled(True)
         table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        # Fixed row height: the view never measures rows it does not paint
+        table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         return table
 
     def set_data(self, df):
         """Called by Main Window to load data."""
         self.master_df = df
+        units = df.attrs.get("units")
+        if units:
+            self.lbl_min_distance.setText(f"Minimum distance ({units['output']}):")
+            self.lbl_min_distance.setToolTip(f"XY file units: {units['input']} ({units['reason']})")
+        warning = (units or {}).get("warning")
+        self.lbl_units.setText(warning or "")
+        self.lbl_units.setVisible(bool(warning))
+        # Duplicates were resolved by the merge: reported once, not rebuilt on refresh
+        duplicates = pd.DataFrame(df.attrs.get("duplicates", []), columns=DUPLICATE_COLUMNS)
+        self.table_duplicates.source_model.set_rows(duplicates, np.arange(len(duplicates)))
+        index = self.tabs.indexOf(self.tab_duplicates)
+        self.tabs.setTabText(index, f"Duplicates ({len(duplicates)})" if len(duplicates) else "Duplicates")
         self.refresh_views()
 
     def refresh_views(self):
-        """Filters master_df and repopulates tables."""
+        """Rebuilds the status buckets from master_df and repopulates tables."""
         if self.master_df is None: return
 
-        # Buckets
-        matched = self.master_df[self.master_df["Status"] == "MATCHED"]
-        xy_err = self.master_df[(self.master_df["Status"] == "XY_ONLY") & (self.master_df["Is Ignored"] == False)]
-        bom_warn = self.master_df[self.master_df["Status"] == "BOM_ONLY"]
-        
-        # Update Stats
-        self.lbl_matched.setText(f"Matched: {len(matched)}")
-        self.lbl_xy_err.setText(f"XY Errors: {len(xy_err)}")
-        self.lbl_bom_warn.setText(f"BOM Warnings: {len(bom_warn)}")
+        # Buckets (row positions into master_df)
+        with stage("dashboard.buckets") as s:
+            status = self.master_df["Status"].to_numpy()
+            ignored = self.master_df["Is Ignored"].to_numpy(dtype=bool)
+            buckets = {
+                "MATCHED": np.flatnonzero(status == "MATCHED"),
+                "XY_ONLY": np.flatnonzero((status == "XY_ONLY") & ~ignored), # Critical only
+                "BOM_ONLY": np.flatnonzero(status == "BOM_ONLY"),
+            }
+            s.rows = len(self.master_df)
+
+        # Populate Tables (models only keep row positions, no per-cell items);
+        # from here on the table models hold the buckets
+        with stage("dashboard.populate_tables") as s:
+            self.table_xy.source_model.set_rows(self.master_df, buckets["XY_ONLY"])
+            self.table_bom.source_model.set_rows(self.master_df, buckets["BOM_ONLY"])
+            self.table_match.source_model.set_rows(self.master_df, buckets["MATCHED"])
+            s.rows = sum(len(rows) for rows in buckets.values())
+        self._update_summary()
+
+        self.proposals_df = propose_matches(self.master_df)
+        self.proposals_index = _position_index(self.proposals_df["XY Row"])
+        self.table_near.source_model.set_rows(self.proposals_df, np.arange(len(self.proposals_df)))
+        self._update_near_tab()
+
+        self.check_collisions()
+
+    def check_collisions(self):
+        """Re-runs the collision check with the current minimum distance."""
+        if self.master_df is None: return
+        self.collisions_df = find_collisions(self.master_df, self.spin_min_distance.value())
+        self.collisions_index = _position_index(self.collisions_df["Row A"], self.collisions_df["Row B"])
+        self.table_collisions.source_model.set_rows(self.collisions_df, np.arange(len(self.collisions_df)))
+        self._update_collision_tab()
+
+    def _update_collision_tab(self):
+        n_pairs = self.table_collisions.source_model.rowCount()
+        index = self.tabs.indexOf(self.tab_collisions)
+        self.tabs.setTabText(index, f"Collisions ({n_pairs})" if n_pairs else "Collisions")
+
+    def _update_near_tab(self):
+        n_pairs = self.table_near.source_model.rowCount()
+        index = self.tabs.indexOf(self.tab_near)
+        self.tabs.setTabText(index, f"Near Matches ({n_pairs})" if n_pairs else "Near Matches")
+
+    def _update_summary(self):
+        """Counters and export button, straight from the bucket (table) sizes."""
+        n_xy_err = self.table_xy.source_model.rowCount()
+        self.lbl_matched.setText(f"Matched: {self.table_match.source_model.rowCount()}")
+        self.lbl_xy_err.setText(f"XY Errors: {n_xy_err}")
+        self.lbl_bom_warn.setText(f"BOM Warnings: {self.table_bom.source_model.rowCount()}")
 
         # Update Export Button Logic
-        if len(xy_err) > 0:
+        if n_xy_err > 0:
             self.btn_export.setEnabled(False)
-            self.btn_export.setText(f"Fix {len(xy_err)} Critical Errors to Export")
+            self.btn_export.setText(f"Fix {n_xy_err} Critical Errors to Export")
         else:
             self.btn_export.setEnabled(True)
             self.btn_export.setText("GENERATE EXCEL >>")
 
-        # Populate Tables
-        self._populate_xy_table(xy_err)
-        self._populate_bom_table(bom_warn)
-        self._populate_match_table(matched)
-
-    def _populate_xy_table(self, df):
-        self.table_xy.setRowCount(len(df))
-        for r, (idx, row) in enumerate(df.iterrows()):
-            self.table_xy.setItem(r, 0, QTableWidgetItem(str(row["Ref Des"])))
-            self.table_xy.setItem(r, 1, QTableWidgetItem(str(row["Layer"])))
-            self.table_xy.setItem(r, 2, QTableWidgetItem(str(row["Mid X"])))
-            self.table_xy.setItem(r, 3, QTableWidgetItem(str(row["Mid Y"])))
-            
-            # Action Button (Ignore)
-            btn_ignore = QPushButton("Ignore / DNI")
-            btn_ignore.clicked.connect(lambda _, x=idx: self.mark_ignore(x))
-            self.table_xy.setCellWidget(r, 4, btn_ignore)
-
-    def _populate_bom_table(self, df):
-        self.table_bom.setRowCount(len(df))
-        for r, (idx, row) in enumerate(df.iterrows()):
-            self.table_bom.setItem(r, 0, QTableWidgetItem(str(row["Ref Des"])))
-            self.table_bom.setItem(r, 1, QTableWidgetItem(str(row["Part Number"])))
-            self.table_bom.setItem(r, 2, QTableWidgetItem(str(row["Description"])))
-            
-            # Action Button (Placeholder)
-            self.table_bom.setItem(r, 3, QTableWidgetItem("Wait for v1.1"))
-
-    def _populate_match_table(self, df):
-        self.table_match.setRowCount(len(df))
-        # Limit matched view for performance if needed
-        limit_df = df.head(100) 
-        self.table_match.setRowCount(len(limit_df))
-        for r, (idx, row) in enumerate(limit_df.iterrows()):
-            self.table_match.setItem(r, 0, QTableWidgetItem(str(row["Ref Des"])))
-            self.table_match.setItem(r, 1, QTableWidgetItem(str(row["Layer"])))
-            self.table_match.setItem(r, 2, QTableWidgetItem(str(row["Mid X"])))
-            self.table_match.setItem(r, 3, QTableWidgetItem(str(row["Mid Y"])))
-            self.table_match.setItem(r, 4, QTableWidgetItem(str(row["Part Number"])))
-            self.table_match.setItem(r, 5, QTableWidgetItem(str(row["Rotation"])))
+    def apply_filter(self, text):
+        for table in (self.table_xy, self.table_bom, self.table_match, self.table_collisions, self.table_near,
+                      self.table_duplicates):
+            table.proxy_model.setFilterFixedString(text)
+
+    def ignore_rows(self, positions):
+        """
+        Marks master_df rows (positions) as ignored, incrementally: the XY
+        Errors, Collisions and Near Matches tables only lose the affected
+        rows, found through position indexes (cost grows with the number of
+        positions, not with the table sizes). Nothing is re-filtered or rebuilt.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        if not len(positions): return
+        with stage("dashboard.ignore_rows") as s:
+            self.master_df.iloc[positions, self.master_df.columns.get_loc("Is Ignored")] = True
+            self.table_xy.source_model.remove_positions(positions)
+
+            # Ignored parts are not placed: drop their collision pairs
+            pairs = _lookup(self.collisions_index, positions)
+            if len(pairs):
+                self.table_collisions.source_model.remove_positions(pairs)
+                self._update_collision_tab()
+
+            # Ignored XY errors are no longer reconciled
+            proposals = _lookup(self.proposals_index, positions)
+            if len(proposals):
+                self.table_near.source_model.remove_positions(proposals)
+                self._update_near_tab()
+            s.rows = len(positions)
+        self._update_summary()
+
+    def ignore_selected(self):
+        """Marks every selected row of the XY Errors table as ignored (one operation)."""
+        rows = self.table_xy.proxy_model.source_rows(self.table_xy.selectionModel().selectedRows())
+        model = self.table_xy.source_model
+        self.ignore_rows([model.row_position(r) for r in rows])
+
+    def ignore_prefix(self):
+        """Marks every XY error whose Ref Des starts with the typed prefix as ignored."""
+        prefix = self.txt_ignore_prefix.text().strip().upper()
+        if not prefix or self.master_df is None: return
+        xy_rows = self.table_xy.source_model.rows
+        refs = pd.Series(self.master_df["Ref Des"].to_numpy()[xy_rows], dtype=object).astype(str).str.upper()
+        self.ignore_rows(xy_rows[refs.str.startswith(prefix).to_numpy()])
 
     def mark_ignore(self, index):
         """Update DataFrame to ignore this item."""
-        self.master_df.at[index, "Is Ignored"] = True
+        self.ignore_rows([self.master_df.index.get_loc(index)])
+
+    def accept_proposals(self, proposal_rows):
+        """
+        Merges the proposals at these positions (into proposals_df) into MATCHED
+        rows. Rows are removed from master_df, so the views are rebuilt.
+        """
+        if not len(proposal_rows): return
+        self.master_df = accept_matches(self.master_df, self.proposals_df.iloc[proposal_rows])
         self.refresh_views()
 
+    def accept_selected_matches(self):
+        rows = self.table_near.proxy_model.source_rows(self.table_near.selectionModel().selectedRows())
+        model = self.table_near.source_model
+        self.accept_proposals([model.row_position(r) for r in rows])
+
+    def accept_all_matches(self):
+        """Accepts every proposal still listed (ignored XY rows already dropped out)."""
+        self.accept_proposals(self.table_near.source_model.rows)
+
+    def edit_panel(self):
+        """Opens the step-and-repeat dialog; a 1x1 panel means single board."""
+        dialog = PanelDialog(self.panel, self)
+        if not dialog.exec_(): return
+        panel = dialog.get_panel()
+        n_boards = panel["rows"] * panel["cols"]
+        if n_boards == 1 and not panel["mirror"] and not panel["rotation"]:
+            self.panel = None
+            self.lbl_panel.setText("Single board")
+        else:
+            self.panel = panel
+            placed = n_boards - len(set(panel["skip"]))
+            self.lbl_panel.setText(f"Panel {panel['rows']} x {panel['cols']} ({placed} boards)")
+
     def on_export(self):
-        self.export_clicked.emit(self.master_df)
\ No newline at end of file
+        self.export_clicked.emit(self.master_df)
+
+
+def _position_index(*columns):
+    """
+    Lookup from master_df positions to the rows of a pairs frame that name
+    them in any of columns (e.g. collisions' Row A / Row B).
+    Returns: (sorted positions, frame row of each)
+    """
+    if not columns:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    positions = np.concatenate([np.asarray(col, dtype=np.int64) for col in columns])
+    frame_rows = np.tile(np.arange(len(columns[0]), dtype=np.int64), len(columns))
+    order = np.argsort(positions, kind="stable")
+    return positions[order], frame_rows[order]
+
+
+def _lookup(index, positions):
+    """Returns: Frame rows naming any of positions (binary search per position)."""
+    sorted_positions, frame_rows = index
+    starts = np.searchsorted(sorted_positions, positions, side="left")
+    ends = np.searchsorted(sorted_positions, positions, side="right")
+    found = [frame_rows[start:end] for start, end in zip(starts, ends) if end > start]
+    return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
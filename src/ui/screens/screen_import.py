@@ -1,13 +1,20 @@
 # src/ui/screens/screen_import.py
 import os
+import threading
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QLabel, QFileDialog, QTableWidget, QTableWidgetItem, 
                              QGroupBox, QRadioButton, QHeaderView, QMessageBox)
 from PyQt5.QtCore import pyqtSignal, Qt
 
 # IMPORT YOUR BACKEND LOGIC
-from src.core.file_loader import load_and_clean_file
-from src.core.normalizer import normalize_bom_data
+# (pandas-based modules are imported inside the tasks, on the worker thread:
+# the screen shows before pandas is loaded, see src/ui/preload.py)
+from src.core.instrumentation import stage
+from src.ui.workers import Worker, TaskProgress
+
+# Same as file_loader.PREVIEW_ROWS (not imported: file_loader needs pandas)
+PREVIEW_ROWS = 50
+PREVIEW_TITLE = f"Data Preview (First {PREVIEW_ROWS} rows):"
 
 class ImportScreen(QWidget):
     # Custom Signal to tell MainWindow "We are done here"
@@ -17,6 +24,15 @@ class ImportScreen(QWidget):
         super().__init__()
         self.bom_df = None   # To store loaded BOM data
         self.xy_df = None    # To store loaded XY data
+        self.bom_path = None # Source files (watched from the dashboard)
+        self.xy_path = None
+        self._parse_cache = None # Re-opening an unchanged file skips parsing
+        self._parse_cache_lock = threading.Lock() # BOM and XY load on two threads
+        # Background workers (BOM and XY can load at the same time)
+        self.bom_worker = None
+        self.bom_preview_worker = None
+        self.xy_worker = None
+        self.process_worker = None
         self.init_ui()
 
     def init_ui(self):
@@ -31,8 +47,11 @@ class ImportScreen(QWidget):
         self.lbl_bom_path = QLabel("No file selected")
         btn_load_bom = QPushButton("Select BOM File...")
         btn_load_bom.clicked.connect(self.load_bom)
+        self.bom_progress = TaskProgress()
+        self.bom_progress.btn_cancel.clicked.connect(self.on_bom_cancelled)
         bom_layout.addWidget(btn_load_bom)
         bom_layout.addWidget(self.lbl_bom_path)
+        bom_layout.addWidget(self.bom_progress)
         bom_group.setLayout(bom_layout)
 
         # XY Group
@@ -41,8 +60,10 @@ class ImportScreen(QWidget):
         self.lbl_xy_path = QLabel("No file selected")
         btn_load_xy = QPushButton("Select XY File...")
         btn_load_xy.clicked.connect(self.load_xy)
+        self.xy_progress = TaskProgress()
         xy_layout.addWidget(btn_load_xy)
         xy_layout.addWidget(self.lbl_xy_path)
+        xy_layout.addWidget(self.xy_progress)
         xy_group.setLayout(xy_layout)
 
         top_controls.addWidget(bom_group)
@@ -53,7 +74,8 @@ class ImportScreen(QWidget):
         self.table_preview = QTableWidget()
         self.table_preview.setColumnCount(0)
         self.table_preview.setRowCount(0)
-        layout.addWidget(QLabel("Data Preview (First 50 rows):"))
+        self.lbl_preview = QLabel(PREVIEW_TITLE)
+        layout.addWidget(self.lbl_preview)
         layout.addWidget(self.table_preview)
 
         # --- SECTION 3: OPTIONS & NAVIGATION ---
@@ -77,6 +99,9 @@ class ImportScreen(QWidget):
         self.btn_next = QPushButton("Process & Next >>")
         self.btn_next.setEnabled(False) # Disabled until files are loaded
         self.btn_next.clicked.connect(self.process_and_continue)
+        self.process_progress = TaskProgress()
+        self.process_progress.btn_cancel.clicked.connect(self.check_ready)
+        bottom_bar.addWidget(self.process_progress)
         bottom_bar.addWidget(self.btn_next)
 
         layout.addLayout(bottom_bar)
@@ -85,45 +110,116 @@ class ImportScreen(QWidget):
     def load_bom(self):
         path, _ = QFileDialog.getOpenFileName(self, "Open BOM", "", "Excel Files (*.xlsx *.xls *.csv)")
         if path:
+            self.bom_path = path
             self.lbl_bom_path.setText(os.path.basename(path))
-            try:
-                # CALLING YOUR BACKEND LOGIC
-                self.bom_df = load_and_clean_file(path)
-                self.populate_table(self.bom_df)
-                self.check_ready()
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to load BOM:\n{str(e)}")
+            self.bom_df = None
+            self.check_ready()
+            # Quick preview of the first rows while the full parse runs
+            self.bom_preview_worker = Worker(self._preview_task, path)
+            self.bom_preview_worker.signals.finished.connect(self.on_bom_preview)
+            self.bom_preview_worker.start()
+            # CALLING YOUR BACKEND LOGIC (on a worker thread)
+            # Track first: the progress bar clears itself before our handlers run
+            self.bom_worker = Worker(self._load_task, path)
+            self.bom_progress.track(self.bom_worker, "Loading BOM...")
+            self.bom_worker.signals.finished.connect(self.on_bom_loaded)
+            self.bom_worker.signals.failed.connect(self.on_bom_failed)
+            self.bom_worker.start()
 
     def load_xy(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Open XY", "", "Text/Excel (*.txt *.csv *.xlsx)")
+        path, _ = QFileDialog.getOpenFileName(self, "Open XY", "", "Text/Excel (*.txt *.csv *.pos *.rpt *.xlsx)")
         if path:
+            self.xy_path = path
             self.lbl_xy_path.setText(os.path.basename(path))
-            try:
-                # CALLING YOUR BACKEND LOGIC
-                self.xy_df = load_and_clean_file(path)
-                # Note: We usually preview BOM, but you could preview XY if you want
-                self.check_ready()
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to load XY:\n{str(e)}")
+            self.xy_df = None
+            self.check_ready()
+            # CALLING YOUR BACKEND LOGIC (on a worker thread)
+            self.xy_worker = Worker(self._load_task, path)
+            self.xy_progress.track(self.xy_worker, "Loading XY...")
+            self.xy_worker.signals.finished.connect(self.on_xy_loaded)
+            self.xy_worker.signals.failed.connect(self.on_xy_failed)
+            self.xy_worker.start()
+
+    @property
+    def parse_cache(self):
+        """The ParseCache, created on first use."""
+        with self._parse_cache_lock:
+            if self._parse_cache is None:
+                from src.core.parse_cache import ParseCache
+                self._parse_cache = ParseCache()
+            return self._parse_cache
+
+    def _load_task(self, report, path):
+        """Runs on a worker thread."""
+        from src.core.file_loader import load_and_clean_file
+
+        report("Parsing file...")
+        return self.parse_cache.load(path, load_and_clean_file, progress=report)
+
+    def _preview_task(self, report, path):
+        """Runs on a worker thread."""
+        from src.core.file_loader import preview_file
+
+        return preview_file(path, PREVIEW_ROWS)
+
+    def _is_current(self, worker):
+        """True if the signal comes from worker and it was not cancelled meanwhile."""
+        return worker is not None and not worker.cancelled and worker.signals is self.sender()
+
+    def on_bom_loaded(self, df):
+        if not self._is_current(self.bom_worker): return
+        self.bom_df = df
+        self.populate_table(self.bom_df) # Swaps out the quick preview
+        self.lbl_preview.setText(PREVIEW_TITLE)
+        self.check_ready()
+
+    def on_bom_preview(self, df):
+        # Skipped when the full load won the race (e.g. served from the parse cache)
+        if not self._is_current(self.bom_preview_worker) or self.bom_df is not None: return
+        if self.bom_worker is None or self.bom_worker.cancelled: return
+        self.populate_table(df)
+        self.lbl_preview.setText(f"Quick Preview (First {len(df)} rows) - loading the full file...")
+
+    def on_bom_cancelled(self):
+        if self.bom_df is None:
+            self.lbl_preview.setText(f"{PREVIEW_TITLE} full load cancelled")
+
+    def on_bom_failed(self, message):
+        if not self._is_current(self.bom_worker): return
+        self.lbl_preview.setText(PREVIEW_TITLE)
+        QMessageBox.critical(self, "Error", f"Failed to load BOM:\n{message}")
+
+    def on_xy_loaded(self, df):
+        if not self._is_current(self.xy_worker): return
+        self.xy_df = df
+        # Note: We usually preview BOM, but you could preview XY if you want
+        self.check_ready()
+
+    def on_xy_failed(self, message):
+        if not self._is_current(self.xy_worker): return
+        QMessageBox.critical(self, "Error", f"Failed to load XY:\n{message}")
 
     def populate_table(self, df):
         """Displays the Pandas DataFrame in the QTableWidget."""
-        self.table_preview.clear()
-        self.table_preview.setRowCount(min(50, len(df))) # Show max 50 rows
-        self.table_preview.setColumnCount(len(df.columns))
-        self.table_preview.setHorizontalHeaderLabels(df.columns.astype(str))
-
-        for r in range(self.table_preview.rowCount()):
-            for c in range(self.table_preview.columnCount()):
-                item_text = str(df.iloc[r, c])
-                self.table_preview.setItem(r, c, QTableWidgetItem(item_text))
-        
+        with stage("import.populate_table") as s:
+            self.table_preview.clear()
+            self.table_preview.setRowCount(min(PREVIEW_ROWS, len(df))) # Show max 50 rows
+            self.table_preview.setColumnCount(len(df.columns))
+            self.table_preview.setHorizontalHeaderLabels(df.columns.astype(str))
+
+            # One conversion of the visible block, not one .iloc lookup per cell
+            rows = df.head(PREVIEW_ROWS).to_numpy(dtype=object).tolist()
+            for r, values in enumerate(rows):
+                for c, value in enumerate(values):
+                    self.table_preview.setItem(r, c, QTableWidgetItem(str(value)))
+            s.rows = len(rows)
+
         self.table_preview.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
 
     def check_ready(self):
         """Enable 'Next' button only if both files are loaded."""
-        if self.bom_df is not None and self.xy_df is not None:
-            self.btn_next.setEnabled(True)
+        ready = self.bom_df is not None and self.xy_df is not None
+        self.btn_next.setEnabled(ready and not self.process_progress.is_busy())
 
     def process_and_continue(self):
             # 1. Determine Delimiter
@@ -145,16 +241,33 @@ class ImportScreen(QWidget):
             
             ref_col = possible_cols[0]
 
-            try:
-                # 3. Normalize (Explode R1-R3)
-                # We import the normalizer function inside the method or at top
-                from src.core.normalizer import normalize_bom_data
-                
-                # Create a clean copy for the next stage
-                self.clean_bom_df = normalize_bom_data(self.bom_df, ref_col, delimiter)
-                
-                # 4. Emit Signal (We are ready to move)
-                self.next_clicked.emit()
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Normalization Error", str(e))
\ No newline at end of file
+            # 3. Normalize (Explode R1-R3) on a worker thread
+            self.btn_next.setEnabled(False)
+            self.ref_col, self.delimiter = ref_col, delimiter # Re-used when a watched BOM changes
+            self.process_worker = Worker(self._normalize_task, self.bom_df, ref_col, delimiter)
+            self.process_progress.track(self.process_worker, "Normalizing BOM...")
+            self.process_worker.signals.finished.connect(self.on_processed)
+            self.process_worker.signals.failed.connect(self.on_process_failed)
+            self.process_worker.start()
+
+    def _normalize_task(self, report, bom_df, ref_col, delimiter):
+        """Runs on a worker thread."""
+        from src.core.incremental import snapshot
+
+        report("Expanding reference designators...")
+        return snapshot(bom_df, ref_col, delimiter)
+
+    def on_processed(self, bom_snapshot):
+        if not self._is_current(self.process_worker): return
+        # Create a clean copy for the next stage (snapshot: for watch mode updates)
+        self.bom_snapshot = bom_snapshot
+        self.clean_bom_df = bom_snapshot["clean"]
+        self.check_ready()
+
+        # 4. Emit Signal (We are ready to move)
+        self.next_clicked.emit()
+
+    def on_process_failed(self, message):
+        if not self._is_current(self.process_worker): return
+        self.check_ready()
+        QMessageBox.critical(self, "Normalization Error", message)
@@ -1,8 +1,20 @@
 
+import json
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QGridLayout, QLabel, 
-                             QComboBox, QPushButton, QGroupBox, QMessageBox, QHBoxLayout)
+                             QComboBox, QPushButton, QGroupBox, QMessageBox, QHBoxLayout,
+                             QFileDialog)
 from PyQt5.QtCore import pyqtSignal
 
+from src.core.logic_engine import DUPLICATE_POLICY_KEY
+from src.core.schema import INPUT_UNITS_KEY, OUTPUT_UNITS_KEY
+from src.core.units import AUTO, UNIT_MM
+
+# (Label, value stored in the mapping)
+INPUT_UNIT_CHOICES = [("Auto-detect", AUTO)] + [(unit, unit) for unit in UNIT_MM]
+# Keeping the file's text is the default: nothing is rescaled unless asked for
+OUTPUT_UNIT_CHOICES = [("Keep file text", None)] + [(unit, unit) for unit in UNIT_MM]
+DUPLICATE_CHOICES = [("Keep first row", "keep_first"), ("Combine rows", "aggregate"), ("Stop with an error", "reject")]
+
 class MappingScreen(QWidget):
     next_clicked = pyqtSignal(dict) # Signals the "Map" dictionary back to Main
     back_clicked = pyqtSignal()
@@ -59,21 +71,47 @@ class MappingScreen(QWidget):
         group.setLayout(grid_layout)
         layout.addWidget(group)
 
+        # --- UNITS / DUPLICATES ---
+        units_layout = QGridLayout()
+        self.combo_input_units = self._choice_combo(INPUT_UNIT_CHOICES)
+        self.combo_output_units = self._choice_combo(OUTPUT_UNIT_CHOICES)
+        units_layout.addWidget(QLabel("XY coordinates are in:"), 0, 0)
+        units_layout.addWidget(self.combo_input_units, 0, 1)
+        units_layout.addWidget(QLabel("Convert coordinates to:"), 1, 0)
+        units_layout.addWidget(self.combo_output_units, 1, 1)
+        self.combo_duplicates = self._choice_combo(DUPLICATE_CHOICES)
+        units_layout.addWidget(QLabel("Ref Des listed twice:"), 2, 0)
+        units_layout.addWidget(self.combo_duplicates, 2, 1)
+
+        units_group = QGroupBox("Options")
+        units_group.setLayout(units_layout)
+        layout.addWidget(units_group)
+
         # --- NAVIGATION ---
         nav_layout = QHBoxLayout()
         btn_back = QPushButton("<< Back")
         btn_back.clicked.connect(self.back_clicked.emit)
         
+        btn_save = QPushButton("Save Mapping...")
+        btn_save.clicked.connect(self.save_mapping)
+
         btn_next = QPushButton("Validate & Merge >>")
         btn_next.clicked.connect(self.finalize_mapping)
         
         nav_layout.addWidget(btn_back)
         nav_layout.addStretch()
+        nav_layout.addWidget(btn_save)
         nav_layout.addWidget(btn_next)
         
         layout.addLayout(nav_layout)
         self.setLayout(layout)
 
+    def _choice_combo(self, choices):
+        combo = QComboBox()
+        for label, value in choices:
+            combo.addItem(label, value)
+        return combo
+
     def populate_dropdowns(self, bom_cols, xy_cols):
         """Called by MainWindow to fill the dropdowns with real file headers."""
         self.bom_columns = bom_cols
@@ -107,8 +145,8 @@ class MappingScreen(QWidget):
                 combo.setCurrentIndex(i + 1) # +1 because of "-- Select --"
                 return
 
-    def finalize_mapping(self):
-        """Gather all user selections and send to Main."""
+    def get_mapping(self):
+        """Gather all user selections into {Target Field: Source Column} plus the option choices."""
         final_map = {}
         for field, (combo, source) in self.mapping_combos.items():
             selected = combo.currentText()
@@ -118,6 +156,22 @@ class MappingScreen(QWidget):
                 final_map[field] = None
             else:
                 final_map[field] = selected
-        
+        final_map[INPUT_UNITS_KEY] = self.combo_input_units.currentData()
+        final_map[OUTPUT_UNITS_KEY] = self.combo_output_units.currentData()
+        final_map[DUPLICATE_POLICY_KEY] = self.combo_duplicates.currentData()
+        return final_map
+
+    def save_mapping(self):
+        """Writes the current mapping to JSON (usable by 'main.py batch --mapping')."""
+        path, _ = QFileDialog.getSaveFileName(self, "Save Mapping", "mapping.json", "JSON (*.json)")
+        if path:
+            try:
+                with open(path, "w") as f:
+                    json.dump(self.get_mapping(), f, indent=2)
+            except OSError as e:
+                QMessageBox.critical(self, "Error", f"Failed to save mapping:\n{str(e)}")
+
+    def finalize_mapping(self):
+        """Gather all user selections and send to Main."""
         # Emit the map
-        self.next_clicked.emit(final_map)
\ No newline at end of file
+        self.next_clicked.emit(self.get_mapping())
\ No newline at end of file
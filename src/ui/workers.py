@@ -0,0 +1,108 @@
+# src/ui/workers.py
+from PyQt5.QtWidgets import QWidget, QHBoxLayout, QLabel, QProgressBar, QPushButton
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+class TaskCancelled(Exception):
+    """Raised inside a task by report() once the user pressed Cancel."""
+
+class WorkerSignals(QObject):
+    progress = pyqtSignal(str, int) # Message, percent (-1 = unknown)
+    finished = pyqtSignal(object)   # Task result
+    failed = pyqtSignal(str)        # Error message
+
+class Worker(QRunnable):
+    """
+    Runs task(report, *args) on the global QThreadPool.
+    The task calls report("message", percent) between stages (and hands it
+    to long steps as their progress callback, e.g. the parse, so they check
+    in between batches); once cancel() was called, report() raises
+    TaskCancelled and nothing is emitted.
+    Signals are delivered on the GUI thread.
+    """
+
+    def __init__(self, task, *args):
+        super().__init__()
+        self.task = task
+        self.args = args
+        self.signals = WorkerSignals()
+        self.cancelled = False
+
+    def start(self):
+        QThreadPool.globalInstance().start(self)
+        return self
+
+    def cancel(self):
+        self.cancelled = True
+
+    def report(self, message, percent=-1):
+        if self.cancelled:
+            raise TaskCancelled()
+        self.signals.progress.emit(message, percent)
+
+    def run(self):
+        try:
+            result = self.task(self.report, *self.args)
+        except TaskCancelled:
+            return
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.failed.emit(str(e))
+            return
+        if not self.cancelled:
+            self.signals.finished.emit(result)
+
+class TaskProgress(QWidget):
+    """Progress bar + stage text + Cancel button for one Worker. Hidden when idle."""
+
+    def __init__(self):
+        super().__init__()
+        self.worker = None
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.lbl_stage = QLabel("")
+        self.progress = QProgressBar()
+        self.btn_cancel = QPushButton("Cancel")
+        self.btn_cancel.clicked.connect(self.cancel)
+        layout.addWidget(self.lbl_stage)
+        layout.addWidget(self.progress, 1)
+        layout.addWidget(self.btn_cancel)
+        self.hide()
+
+    def track(self, worker, message="Working..."):
+        """Shows progress for worker (cancelling whatever was tracked before)."""
+        self.cancel()
+        self.worker = worker
+        worker.signals.progress.connect(self.on_progress)
+        worker.signals.finished.connect(self.on_done)
+        worker.signals.failed.connect(self.on_done)
+        self.on_progress(message, -1)
+        self.show()
+
+    def is_busy(self):
+        return self.worker is not None
+
+    def is_current(self, signals):
+        """True if signals belong to the tracked worker (not a stale one)."""
+        return self.worker is not None and self.worker.signals is signals
+
+    def cancel(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+        self.hide()
+
+    def on_progress(self, message, percent):
+        if not self.is_current(self.sender()) and self.sender() is not None:
+            return
+        self.lbl_stage.setText(message)
+        if percent < 0:
+            self.progress.setRange(0, 0) # Busy indicator
+        else:
+            self.progress.setRange(0, 100)
+            self.progress.setValue(percent)
+
+    def on_done(self, _):
+        if self.is_current(self.sender()):
+            self.worker = None
+            self.hide()
@@ -0,0 +1,106 @@
+# tests/test_batch.py
+import sys
+import os
+import json
+import tempfile
+import subprocess
+import pandas as pd
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from src.core.batch import load_manifest, run_job, run_batch
+
+MAPPING = {"Reference Designator": "Designator", "Part Number": "PN", "Mid X": "Mid X (mm)",
+           "Mid Y": "Mid Y (mm)", "Rotation": "Rotation", "Layer / Side": "Layer"}
+
+def write_manifest(tmp):
+    """One good job (every part placed) and one whose XY file does not exist."""
+    board = os.path.join(tmp, "board")
+    os.makedirs(board)
+    pd.DataFrame({"Designator": ["R1, R2", "C1"], "PN": ["PN-R", "PN-C"]}).to_csv(
+        os.path.join(board, "bom.csv"), index=False)
+    pd.DataFrame({
+        "Designator": ["R1", "R2", "C1"], "Mid X (mm)": ["1.0", "5.0", "9.0"],
+        "Mid Y (mm)": ["2.0", "2.0", "2.0"], "Rotation": ["0", "90", "180"], "Layer": ["Top", "Top", "Bottom"],
+    }).to_csv(os.path.join(board, "xy.csv"), index=False)
+    manifest_path = os.path.join(tmp, "manifest.json")
+    with open(manifest_path, "w") as f:
+        json.dump({"mapping": MAPPING, "jobs": [
+            {"name": "good board", "bom": "board/bom.csv", "xy": "board/xy.csv"},
+            {"name": "broken", "bom": "board/bom.csv", "xy": "board/missing_xy.csv"},
+        ]}, f)
+    return manifest_path
+
+def run_test():
+    print("--- TEST: BATCH MODE ---")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest_path = write_manifest(tmp)
+
+            # 1. Manifest: paths resolved against its folder, names made file-safe
+            jobs = load_manifest(manifest_path)
+            if ([job["name"] for job in jobs] == ["good_board", "broken"]
+                    and jobs[0]["xy"] == os.path.join(tmp, "board", "xy.csv") and jobs[0]["delimiter"] == ","):
+                print("[PASS] Manifest loaded.")
+            else:
+                print(f"[FAIL] Jobs: {jobs}")
+
+            with open(os.path.join(tmp, "no_mapping.json"), "w") as f:
+                json.dump({"jobs": [{"bom": "board/bom.csv", "xy": "board/xy.csv"}]}, f)
+            try:
+                load_manifest(os.path.join(tmp, "no_mapping.json"))
+                print("[FAIL] Manifest without a mapping accepted.")
+            except ValueError:
+                print("[PASS] Manifest without a mapping rejected.")
+
+            # 2. One job: outputs written, counts returned
+            result = run_job(jobs[0], os.path.join(tmp, "single"))
+            job_dir = os.path.join(tmp, "single", "good_board")
+            if (result["status"] == "OK" and result["matched"] == 3 and result["critical"] == 0
+                    and all(os.path.exists(os.path.join(job_dir, name))
+                            for name in ("merged.csv", "placements.xlsx", "result.json"))):
+                print("[PASS] run_job writes merged.csv, placements.xlsx and result.json.")
+            else:
+                print(f"[FAIL] run_job: {result}")
+
+            # 3. A broken job is reported without stopping the others
+            messages = []
+            summary_df = run_batch(jobs, os.path.join(tmp, "pool"), workers=2, progress=messages.append)
+            status = summary_df.set_index("name")["status"].to_dict()
+            broken = summary_df.set_index("name").loc["broken"]
+            with open(os.path.join(tmp, "pool", "summary.json")) as f:
+                summary = json.load(f)
+            if (status == {"good_board": "OK", "broken": "ERROR"} and "missing_xy.csv" in broken["error"]
+                    and summary["ok"] == 1 and summary["errors"] == 1 and len(messages) == 2
+                    and os.path.exists(os.path.join(tmp, "pool", "good_board", "merged.csv"))):
+                print("[PASS] Broken job reported, good job still written.")
+            else:
+                print(f"[FAIL] Batch:\n{summary_df}\n{messages}")
+
+            # 4. 'main.py batch' entry point: exit status 1 while any job needs attention
+            command = [sys.executable, os.path.join(parent_dir, "main.py"), "batch", manifest_path,
+                       "--out", os.path.join(tmp, "cli"), "--workers", "1"]
+            failed = subprocess.run(command, capture_output=True, text=True)
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            manifest["jobs"] = manifest["jobs"][:1]
+            with open(manifest_path, "w") as f:
+                json.dump(manifest, f)
+            passed = subprocess.run(command, capture_output=True, text=True)
+            summary_csv = pd.read_csv(os.path.join(tmp, "cli", "summary.csv"))
+            if failed.returncode == 1 and passed.returncode == 0 and "1 OK" in passed.stdout and len(summary_csv) == 1:
+                print("[PASS] 'main.py batch' exits 1 with a broken job, 0 when all are OK.")
+            else:
+                print(f"[FAIL] Exit codes {failed.returncode} / {passed.returncode}:\n{failed.stderr}{passed.stderr}")
+
+    except Exception as e:
+        print(f"[CRITICAL FAIL] {e}")
+        import traceback
+        traceback.print_exc()
+
+if __name__ == "__main__":
+    run_test()
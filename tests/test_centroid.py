@@ -0,0 +1,153 @@
+# tests/test_centroid.py
+import sys
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+import src.core.centroid as centroid
+from src.core.file_loader import load_and_clean_file, preview_file
+from src.core.logic_engine import perform_merge_and_validation
+from src.core.schema import apply_schema
+
+KICAD_POS = """\
+### Footprint positions - created on Mon Jan 01 12:00:00 2024 ###
+### Printed by KiCad version 7.0.10
+## Unit = mm, Angle = deg.
+## Side : All
+# Ref     Val                Package                    PosX       PosY       Rot  Side
+C1        100n               C_0603_1608Metric       120.6500   -80.0100   90.0000  top
+R1        "10k 1%"           R_0603_1608Metric       130.0000   -85.5000  180.0000  bottom
+U1        NA                 LQFP-48                 140.2500   -90.0000    0.0000  top
+## End
+"""
+
+ALTIUM_TXT = """\
+Altium Designer Pick and Place Locations
+C:\\Projects\\Board\\Board.PcbDoc
+
+========================================================================================================================
+File Design Information:
+
+Date:       01/01/24
+Units used: mil
+
+"Designator" "Comment" "Layer" "Footprint" "Center-X(mil)" "Center-Y(mil)" "Rotation" "Description"
+"C1" "100nF" "TopLayer" "C0603" "1000.00" "2000.00" "90" "Capacitor, ceramic"
+"R1" "10k" "BottomLayer" "R0603" "1100.50" "2100.00" "270" ""
+"""
+
+MENTOR_RPT = """\
+Mentor Xpedition Centroid Report
+Units: mm
+
+RefDes   Part Number      X          Y          Rotation  Side
+-------- ---------------- ---------- ---------- --------- ------
+C1       CAP 0603 100N    10.000     20.000     90        TOP
+R1       RES-0603         11.500     21.000     270       BOTTOM
+======================================================================
+"""
+
+CADENCE_TXT = """\
+UUNITS = MILS
+C1           1200.00    850.00   90  m CAP0603
+R1           1300.00    850.00    0    RES0603
+"""
+
+# Old Altium text format: column aligned, unit only on the values
+ALTIUM_OLD_TXT = """\
+Designator Footprint               Mid X         Mid Y         TB      Rotation Comment
+
+C1         0603                    1395.669mil   2088.583mil   T       90.00    100nF
+R12        0603                    1495.669mil   2188.583mil   B       180.00   10k
+"""
+
+def write(tmp, name, text):
+    path = os.path.join(tmp, name)
+    with open(path, "w", newline="") as f:
+        f.write(text)
+    return path
+
+def run_test():
+    print("--- TEST: CAD CENTROID REPORTS ---")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            files = {
+                "kicad": write(tmp, "board.pos", KICAD_POS),
+                "altium": write(tmp, "pick_place.txt", ALTIUM_TXT),
+                "mentor": write(tmp, "centroid.rpt", MENTOR_RPT),
+                "cadence": write(tmp, "place_txt.txt", CADENCE_TXT),
+                "altium old": write(tmp, "old.txt", ALTIUM_OLD_TXT),
+            }
+            # (Unit in the headers, refs, X, sides)
+            expected = {
+                "kicad": ("mm", ["C1", "R1", "U1"], [120.65, 130.0, 140.25], ["Top", "Bottom", "Top"]),
+                "altium": ("mil", ["C1", "R1"], [1000.0, 1100.5], ["Top", "Bottom"]),
+                "mentor": ("mm", ["C1", "R1"], [10.0, 11.5], ["Top", "Bottom"]),
+                "cadence": ("mil", ["C1", "R1"], [1200.0, 1300.0], ["Bottom", "Top"]),
+                "altium old": ("mil", ["C1", "R12"], [1395.669, 1495.669], ["Top", "Bottom"]),
+            }
+            frames = {}
+
+            # 1. Every format: typed columns, unit from the file's metadata
+            for name, path in files.items():
+                df = frames[name] = load_and_clean_file(path)
+                unit, refs, xs, sides = expected[name]
+                x_col = f"Mid X ({unit})"
+                ok = (x_col in df.columns and df[x_col].dtype == np.float64
+                      and df["Rotation"].dtype == np.float64
+                      and df["Designator"].tolist() == refs
+                      and np.allclose(df[x_col].to_numpy(), xs)
+                      and df["Layer"].tolist() == sides)
+                if ok:
+                    print(f"[PASS] {name}: {len(df)} parts, {unit}.")
+                else:
+                    print(f"[FAIL] {name}:\n{df}")
+
+            # 2. Quoted fields keep their blanks, "NA" is a value
+            if frames["kicad"]["Val"].tolist() == ["100n", "10k 1%", "NA"]:
+                print("[PASS] Quoted and NA-looking values kept.")
+            else:
+                print(f"[FAIL] Values: {frames['kicad']['Val'].tolist()}")
+
+            # 3. Same frames without pyarrow (pandas tokenizer)
+            saved = centroid.pa_csv
+            centroid.pa_csv = None
+            try:
+                same = all(load_and_clean_file(path).equals(frames[name]) for name, path in files.items())
+            finally:
+                centroid.pa_csv = saved
+            if same:
+                print("[PASS] pandas fallback gives the same frames.")
+            else:
+                print("[FAIL] pandas fallback differs.")
+
+            # 4. Preview stops early, plain tab-separated XY is not taken for a report
+            plain = write(tmp, "xy.txt", "Designator\tMid X\tMid Y\nC1\t1\t2\n")
+            if len(preview_file(files["kicad"], 2)) == 2 and load_and_clean_file(plain)["Mid X"].tolist() == ["1"]:
+                print("[PASS] Preview and generic files unaffected.")
+            else:
+                print("[FAIL] Preview or generic loader changed.")
+
+            # 5. The header unit reaches the schema: mil converted to mm
+            bom_df = pd.DataFrame({"Designator": ["C1", "R1"], "PN": ["CAP", "RES"]})
+            mapping = {"Reference Designator": "Designator", "Part Number": "PN",
+                       "Mid X": "Mid X (mil)", "Mid Y": "Mid Y (mil)", "Rotation": "Rotation", "Layer / Side": "Layer"}
+            merged_df = apply_schema(perform_merge_and_validation(bom_df, frames["cadence"], mapping), mapping)
+            if merged_df.attrs["units"]["input"] == "mil" and np.allclose(merged_df["X"], [30.48, 33.02]):
+                print("[PASS] Report unit used by the schema.")
+            else:
+                print(f"[FAIL] Units: {merged_df.attrs['units']}\n{merged_df}")
+
+    except Exception as e:
+        print(f"[CRITICAL FAIL] {e}")
+        import traceback
+        traceback.print_exc()
+
+if __name__ == "__main__":
+    run_test()
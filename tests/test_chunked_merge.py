@@ -0,0 +1,152 @@
+# tests/test_chunked_merge.py
+import sys
+import os
+import json
+import tempfile
+import pandas as pd
+from openpyxl import load_workbook
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+import src.core.exporter as exporter
+from src.core.batch import main as batch_main, run_job
+from src.core.chunked_merge import merge_in_partitions
+from src.core.logic_engine import perform_merge_and_validation, DuplicateRefError, DUPLICATE_POLICY_KEY
+from src.core.schema import apply_schema
+
+MAPPING = {"Reference Designator": "Designator", "Part Number": "PN", "Mid X": "Mid X",
+           "Mid Y": "Mid Y", "Rotation": "Rotation", "Layer / Side": "Layer"}
+
+def write_files(tmp, n_parts=600):
+    """XY in mil (only the board extent suggests it), with duplicates on both sides."""
+    xy_lines = ["Designator\tMid X\tMid Y\tRotation\tLayer"]
+    for i in range(n_parts):
+        xy_lines.append(f"R{i}\t{100 + i * 5}\t{200 + i * 3}\t{i % 4 * 90}\t{'Top' if i % 3 else 'Bottom'}")
+    xy_lines += ["r7 \t1.0\t1.0\t0\tTop", "FID1\t0\t0\t0\tTop", "TP3\t10\t10\t0\tTop"]
+    xy_path = os.path.join(tmp, "panel_xy.txt")
+    with open(xy_path, "w") as f:
+        f.write("\n".join(xy_lines) + "\n")
+    refs = [f"R{i}" for i in range(0, n_parts + 40, 2)] + ["R4", "R4"]
+    bom_df = pd.DataFrame({"Designator": refs, "PN": [f"PN{len(r) + i % 3}" for i, r in enumerate(refs)]})
+    return bom_df, xy_path
+
+def same_rows(frames, expected):
+    """Partitions together hold exactly the in-memory merge's rows."""
+    got = pd.concat(frames, ignore_index=True).sort_values("Ref Des", ignore_index=True)
+    expected = expected.sort_values("Ref Des", ignore_index=True)
+    if list(got.columns) != list(expected.columns) or len(got) != len(expected):
+        return False
+    # Each partition has its own categories: compare the values
+    return all(got[col].astype(str).equals(expected[col].astype(str)) for col in expected.columns)
+
+def run_test():
+    print("--- TEST: CHUNKED (PARTITIONED) MERGE ---")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            bom_df, xy_path = write_files(tmp)
+            xy_df = pd.read_csv(xy_path, sep="\t", dtype=str)
+
+            # 1. Same rows, statuses and duplicate handling as the in-memory merge
+            for policy in ("keep_first", "aggregate"):
+                mapping = {**MAPPING, DUPLICATE_POLICY_KEY: policy}
+                expected = apply_schema(perform_merge_and_validation(bom_df, xy_df, mapping), mapping)
+                frames = list(merge_in_partitions([bom_df], xy_path, mapping, partitions=5, spill_dir=tmp))
+                n_duplicates = sum(len(f.attrs["duplicates"]) for f in frames)
+                if (len(frames) == 5 and same_rows(frames, expected)
+                        and n_duplicates == len(expected.attrs["duplicates"]) == 2):
+                    print(f"[PASS] {policy}: {len(expected)} rows in {len(frames)} partitions match.")
+                else:
+                    print(f"[FAIL] {policy}: partitions differ from the in-memory merge.")
+
+            # 2. Unit (and its warning) from the whole file, spill folder cleaned up
+            units = frames[0].attrs["units"]
+            spill_left = [name for name in os.listdir(tmp) if name.startswith("merge_spill_")]
+            if (units == expected.attrs["units"] and units["input"] == "mm"
+                    and "looks like mil" in units["warning"] and not spill_left):
+                print(f"[PASS] Unit checked over the whole file ({units['reason']}), spill files removed.")
+            else:
+                print(f"[FAIL] Units {units} / {expected.attrs['units']}, folder: {os.listdir(tmp)}")
+
+            # 3. Reject raises before any partition is handed out
+            try:
+                next(merge_in_partitions([bom_df], xy_path, {**MAPPING, DUPLICATE_POLICY_KEY: "reject"}, partitions=3))
+                print("[FAIL] Duplicates accepted by the reject policy.")
+            except DuplicateRefError as e:
+                if sorted(e.report["Ref Des"]) == ["R4", "R7"]:
+                    print("[PASS] Reject policy raises with the whole file's report.")
+                else:
+                    print(f"[FAIL] Report: {e.report}")
+
+            # 4. Streamed export: same sheets as export_placements, overflow on continuation sheets
+            saved = exporter.SHEET_MAX_ROWS
+            exporter.SHEET_MAX_ROWS = 101
+            try:
+                chunked_path = os.path.join(tmp, "chunked.xlsx")
+                counts = exporter.export_placement_chunks(
+                    merge_in_partitions([bom_df], xy_path, MAPPING, partitions=4), chunked_path, write_csv=True)
+            finally:
+                exporter.SHEET_MAX_ROWS = saved
+            full_path = os.path.join(tmp, "full.xlsx")
+            expected = apply_schema(perform_merge_and_validation(bom_df, xy_df, MAPPING), MAPPING)
+            full_counts = exporter.export_placements(expected, full_path, write_csv=True)
+            sheets = load_workbook(chunked_path, read_only=True).sheetnames
+            same_csv = all(
+                pd.read_csv(f"{tmp}/chunked_{name}.csv").sort_values("Ref Des", ignore_index=True).equals(
+                    pd.read_csv(f"{tmp}/full_{name}.csv").sort_values("Ref Des", ignore_index=True))
+                for name in counts
+            )
+            if counts == full_counts and same_csv and "Top (2)" in sheets and "Exceptions (2)" in sheets:
+                print(f"[PASS] Streamed export matches ({counts}).")
+            else:
+                print(f"[FAIL] Export: {counts} vs {full_counts}, sheets {sheets}, CSV same: {same_csv}")
+
+            # 5. Batch job over its memory budget (~200 KB to join in memory):
+            # chunked merge, partitions streamed into merged.csv and placements.xlsx
+            bom_path = os.path.join(tmp, "bom.csv")
+            bom_df.to_csv(bom_path, index=False)
+            job = {"name": "panel", "bom": bom_path, "xy": xy_path, "mapping": MAPPING,
+                   "delimiter": ",", "memory_mb": 0.05}
+            result = run_job(job, os.path.join(tmp, "out"))
+            plain = run_job({**job, "name": "plain", "memory_mb": None}, os.path.join(tmp, "out"))
+            keys = ["matched", "xy_only", "bom_only", "ignored", "critical", "duplicates"]
+            merged = pd.read_csv(result["output"])
+            if (result["error"] == "" and all(result[k] == plain[k] for k in keys)
+                    and result["collisions"] is None and plain["collisions"] is not None
+                    and len(merged) == len(pd.read_csv(plain["output"]))):
+                with open(os.path.join(tmp, "out", "panel", "result.json")) as f:
+                    print(f"[PASS] Batch job over 50 KB merged in partitions: {json.load(f)['matched']} matched, same counts.")
+            else:
+                print(f"[FAIL] Batch: {result}\nvs {plain}")
+
+            # 6. End to end: 'main.py batch' picks the chunked path for the file over
+            # its budget, and the streamed workbook holds the in-memory job's rows
+            manifest_path = os.path.join(tmp, "manifest.json")
+            with open(manifest_path, "w") as f:
+                json.dump({"mapping": MAPPING, "jobs": [
+                    {"name": "large", "bom": "bom.csv", "xy": "panel_xy.txt", "memory_mb": 0.05},
+                    {"name": "small", "bom": "bom.csv", "xy": "panel_xy.txt"},
+                ]}, f)
+            out_dir = os.path.join(tmp, "cli")
+            status = batch_main([manifest_path, "--out", out_dir, "--workers", "1"])
+            summary = pd.read_csv(os.path.join(out_dir, "summary.csv")).set_index("name")
+            sheets = {name: [pd.read_excel(os.path.join(out_dir, name, "placements.xlsx"), sheet_name=sheet)
+                                 .sort_values("Ref Des", ignore_index=True) for sheet in ("Top", "Bottom", "Exceptions")]
+                      for name in ("large", "small")}
+            same_sheets = all(a.equals(b) for a, b in zip(sheets["large"], sheets["small"]))
+            if (status == 1 and pd.isna(summary.loc["large", "collisions"])  # XY_ONLY parts: CRITICAL
+                    and not pd.isna(summary.loc["small", "collisions"]) and same_sheets
+                    and len(sheets["large"][0]) == summary.loc["large", "matched"] - len(sheets["large"][1])):
+                print(f"[PASS] 'batch' streams the large job into placements.xlsx ({summary.loc['large', 'matched']} matched).")
+            else:
+                print(f"[FAIL] CLI batch: status {status}, same sheets {same_sheets}\n{summary}")
+
+    except Exception as e:
+        print(f"[CRITICAL FAIL] {e}")
+        import traceback
+        traceback.print_exc()
+
+if __name__ == "__main__":
+    run_test()
@@ -0,0 +1,69 @@
+# tests/test_collisions.py
+import sys
+import os
+import itertools
+import numpy as np
+import pandas as pd
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from src.core.collisions import find_collisions
+
+def brute_force_pairs(df, min_distance):
+    """O(n^2) reference: same-layer pairs closer than min_distance."""
+    x = df["Mid X"].astype(float).to_numpy()
+    y = df["Mid Y"].astype(float).to_numpy()
+    side = df["Layer"].str[:1].to_numpy()
+    pairs = set()
+    for i, j in itertools.combinations(range(len(df)), 2):
+        if side[i] == side[j] and np.hypot(x[i] - x[j], y[i] - y[j]) < min_distance:
+            pairs.add((i, j))
+    return pairs
+
+def run_test():
+    print("--- TEST: PLACEMENT COLLISIONS ---")
+
+    rng = np.random.default_rng(1)
+    n = 400
+    df = pd.DataFrame({
+        "Ref Des": [f"R{i}" for i in range(n)],
+        "Layer": rng.choice(["TopLayer", "BottomLayer"], n),
+        "Mid X": rng.uniform(0, 50, n).astype(str),
+        "Mid Y": rng.uniform(0, 50, n).astype(str),
+        "Is Ignored": False,
+    })
+    # Stacked parts: same spot, same side
+    df.loc[1, ["Mid X", "Mid Y", "Layer"]] = df.loc[0, ["Mid X", "Mid Y", "Layer"]].to_numpy()
+
+    try:
+        # 1. Grid hash finds exactly the brute force pairs
+        for min_distance in (0.05, 1.0, 5.0):
+            pairs = find_collisions(df, min_distance)
+            found = {tuple(sorted(p)) for p in pairs[["Row A", "Row B"]].to_numpy().tolist()}
+            expected = brute_force_pairs(df, min_distance)
+            if found == expected:
+                print(f"[PASS] {len(found)} pairs within {min_distance} match brute force.")
+            else:
+                print(f"[FAIL] Distance {min_distance}: {len(found)} pairs, expected {len(expected)}.")
+
+        # 2. Ignored parts and other-layer parts are never flagged
+        df.loc[2, ["Mid X", "Mid Y"]] = df.loc[0, ["Mid X", "Mid Y"]].to_numpy()
+        df.loc[2, "Layer"] = "BottomLayer" if df.loc[0, "Layer"] == "TopLayer" else "TopLayer"
+        df.loc[1, "Is Ignored"] = True
+        pairs = find_collisions(df, 0.05)
+        involved = set(pairs["Row A"]) | set(pairs["Row B"])
+        if not involved & {0, 1, 2}:
+            print("[PASS] Ignored and opposite-side parts skipped.")
+        else:
+            print(f"[FAIL] Unexpected pairs: {pairs.head().to_dict('records')}")
+
+    except Exception as e:
+        print(f"[CRITICAL FAIL] {e}")
+        import traceback
+        traceback.print_exc()
+
+if __name__ == "__main__":
+    run_test()
@@ -0,0 +1,58 @@
+# tests/test_duplicates.py
+import sys
+import os
+import pandas as pd
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from src.core.logic_engine import perform_merge_and_validation, DuplicateRefError, DUPLICATE_POLICY_KEY
+
+def run_test():
+    print("--- TEST: DUPLICATE REF DES GUARD ---")
+
+    # R3 three times in the BOM (overlapping ranges), R1 twice in the XY
+    bom_df = pd.DataFrame({"Ref": ["R1", "R2", "R3", "R3", "r3 "], "PN": ["A", "B", "C", "C2", "C"]})
+    xy_df = pd.DataFrame({"Ref": ["R1", "R1", "R3", "R4"], "X": ["1", "2", "3", "4"]})
+    mapping = {"Reference Designator": "Ref", "Part Number": "PN", "Mid X": "X"}
+
+    def merge(policy):
+        return perform_merge_and_validation(bom_df.copy(), xy_df.copy(), {**mapping, DUPLICATE_POLICY_KEY: policy})
+
+    try:
+        # 1. Keep first: one row per Ref Des, duplicates reported
+        merged_df = merge("keep_first")
+        report = pd.DataFrame(merged_df.attrs["duplicates"])
+        if (merged_df["Ref Des"].tolist() == ["R1", "R2", "R3", "R4"]
+                and dict(zip(report["Ref Des"], report["Count"])) == {"R1": 2, "R3": 3}):
+            print("[PASS] Join is one-to-one, duplicates reported.")
+        else:
+            print(f"[FAIL] Merged:\n{merged_df}\n{report}")
+
+        # 2. Aggregate: distinct values combined into one cell
+        merged_df = merge("aggregate")
+        r3 = merged_df[merged_df["Ref Des"] == "R3"].iloc[0]
+        if len(merged_df) == 4 and r3["Part Number"] == "C; C2":
+            print("[PASS] Duplicate rows combined.")
+        else:
+            print(f"[FAIL] Aggregated:\n{merged_df}")
+
+        # 3. Reject: error lists the refs
+        try:
+            merge("reject")
+            print("[FAIL] Duplicates accepted by the reject policy.")
+        except DuplicateRefError as e:
+            if sorted(e.report["Ref Des"]) == ["R1", "R3"]:
+                print("[PASS] Reject policy raises with the duplicate report.")
+            else:
+                print(f"[FAIL] Report: {e.report}")
+
+    except Exception as e:
+        print(f"[CRITICAL FAIL] {e}")
+        import traceback
+        traceback.print_exc()
+
+if __name__ == "__main__":
+    run_test()
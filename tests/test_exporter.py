@@ -0,0 +1,118 @@
+# tests/test_exporter.py
+import sys
+import os
+import tempfile
+import pandas as pd
+from openpyxl import load_workbook
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from src.core import exporter
+from src.core.exporter import export_placements, EXPORT_COLUMNS, EXCEPTION_COLUMNS
+
+def make_master_df():
+    """One row per case: both sides, unknown layer, both exception statuses, ignored rows."""
+    return pd.DataFrame({
+        "Ref Des": ["R1", "R2", "C1", "U1", "FID1", "C9", "R3", "J1"],
+        "Status": ["MATCHED", "MATCHED", "MATCHED", "MATCHED", "XY_ONLY", "XY_ONLY", "BOM_ONLY", "MATCHED"],
+        "Is Ignored": [False, False, False, False, True, False, False, True],
+        "Layer": ["TopLayer", "Top", "Bottom", "Inner1", "Top", "Bottom", None, "Top"],
+        "Mid X": ["1.0", "2.0", "3.0", "4.0", "5.0", "6.0", None, "8.0"],
+        "Mid Y": ["1.5", "2.5", "3.5", "4.5", "5.5", "6.5", None, "8.5"],
+        "Rotation": ["0", "90", "180", "270", "0", "90", None, "0"],
+        "Part Number": ["PN-R1", "PN-R2", "PN-C1", "PN-U1", None, None, "PN-R3", "PN-J1"],
+        "Value": ["10k", "10k", "100n", "MCU", None, None, "1k", "HDR"],
+    })
+
+def run_test():
+    print("--- TEST: PLACEMENT EXPORT ---")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            xlsx_path = os.path.join(tmp, "placements.xlsx")
+            counts = export_placements(make_master_df(), xlsx_path, write_csv=True, write_parquet=True)
+
+            # 1. Returned counts: ignored FID1 / J1 are in no sheet
+            if counts == {"Top": 2, "Bottom": 1, "Exceptions": 3}:
+                print("[PASS] Row counts per sheet returned.")
+            else:
+                print(f"[FAIL] Counts: {counts}")
+
+            # 2. Top / Bottom / Exceptions split, with headers and reasons
+            sheets = pd.read_excel(xlsx_path, sheet_name=None)
+            exceptions = sheets["Exceptions"].set_index("Ref Des")["Reason"].to_dict()
+            if (list(sheets) == ["Top", "Bottom", "Exceptions"]
+                    and sheets["Top"]["Ref Des"].tolist() == ["R1", "R2"]
+                    and sheets["Bottom"]["Ref Des"].tolist() == ["C1"]
+                    and list(sheets["Top"].columns) == EXPORT_COLUMNS
+                    and list(sheets["Exceptions"].columns) == EXCEPTION_COLUMNS
+                    and exceptions == {"U1": "Unknown layer", "C9": "In XY, missing from BOM",
+                                       "R3": "In BOM, no placement"}):
+                print("[PASS] Sheets split by layer and status, exceptions have a reason.")
+            else:
+                print(f"[FAIL] Sheets: {({name: df['Ref Des'].tolist() for name, df in sheets.items()})}, {exceptions}")
+
+            # 3. Ignored rows are excluded, missing values are empty cells
+            all_refs = set().union(*(df["Ref Des"] for df in sheets.values()))
+            r3 = load_workbook(xlsx_path, read_only=True)["Exceptions"]
+            r3_row = [row for row in r3.iter_rows(values_only=True) if row[0] == "R3"][0]
+            if not all_refs & {"FID1", "J1"} and r3_row[EXCEPTION_COLUMNS.index("Mid X")] is None:
+                print("[PASS] Ignored rows excluded, missing values left empty.")
+            else:
+                print(f"[FAIL] Refs exported: {sorted(all_refs)}, R3 row: {r3_row}")
+
+            # 4. CSV / Parquet side files hold the same rows as the sheets
+            same = True
+            for name, sheet_df in sheets.items():
+                csv_df = pd.read_csv(os.path.join(tmp, f"placements_{name}.csv"))
+                parquet_df = pd.read_parquet(os.path.join(tmp, f"placements_{name}.parquet"))
+                same &= (csv_df["Ref Des"].tolist() == parquet_df["Ref Des"].tolist() == sheet_df["Ref Des"].tolist()
+                         and list(parquet_df.columns) == list(sheet_df.columns))
+            if same:
+                print("[PASS] CSV and Parquet copies match the workbook.")
+            else:
+                print(f"[FAIL] Side files differ: {sorted(os.listdir(tmp))}")
+
+            # 5. A progress callback that raises (cancel) removes the partial workbook
+            def cancel(message, percent):
+                raise InterruptedError("cancelled")
+            cancelled_path = os.path.join(tmp, "cancelled.xlsx")
+            try:
+                export_placements(make_master_df(), cancelled_path, progress=cancel)
+                print("[FAIL] Export not cancelled.")
+            except InterruptedError:
+                if not os.path.exists(cancelled_path):
+                    print("[PASS] Cancelled export leaves no partial file.")
+                else:
+                    print("[FAIL] Partial workbook left behind.")
+
+            # 6. Past the sheet row limit (shrunk here): rows continue on "Top (2)", ... none lost
+            panel_df = pd.DataFrame({
+                "Ref Des": [f"R{i}" for i in range(10)], "Status": "MATCHED", "Is Ignored": False,
+                "Layer": "Top", "Mid X": "1.0", "Mid Y": "2.0", "Rotation": "0", "Part Number": "PN-R",
+            })
+            saved_max_rows = exporter.SHEET_MAX_ROWS
+            exporter.SHEET_MAX_ROWS = 4 # Header + 3 rows per sheet
+            try:
+                panel_path = os.path.join(tmp, "panel.xlsx")
+                counts = export_placements(panel_df, panel_path)
+            finally:
+                exporter.SHEET_MAX_ROWS = saved_max_rows
+            sheets = pd.read_excel(panel_path, sheet_name=None)
+            top_refs = [ref for name, df in sheets.items() if name.startswith("Top") for ref in df["Ref Des"]]
+            if (counts["Top"] == 10 and top_refs == panel_df["Ref Des"].tolist()
+                    and [name for name in sheets if name.startswith("Top")] == ["Top", "Top (2)", "Top (3)", "Top (4)"]):
+                print("[PASS] Rows past the sheet limit continue on numbered sheets.")
+            else:
+                print(f"[FAIL] Counts {counts}, sheets {({name: len(df) for name, df in sheets.items()})}")
+
+    except Exception as e:
+        print(f"[CRITICAL FAIL] {e}")
+        import traceback
+        traceback.print_exc()
+
+if __name__ == "__main__":
+    run_test()
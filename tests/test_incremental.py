@@ -0,0 +1,96 @@
+# tests/test_incremental.py
+import sys
+import os
+import pandas as pd
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from src.core.incremental import snapshot, row_hashes, diff_rows, update_source, remerge
+from src.core.logic_engine import perform_merge_and_validation
+from src.core.reconcile import propose_matches, accept_matches
+from src.core.schema import apply_schema, INPUT_UNITS_KEY
+
+def run_test():
+    print("--- TEST: INCREMENTAL RE-VALIDATION ---")
+
+    bom_df = pd.DataFrame({"Ref": ["R1-R3", "C1", "U1"], "PN": ["RES", "CAP", "IC"]})
+    xy_df = pd.DataFrame({"Ref": ["R1", "R2", "R3", "C1", "FID1"], "X": ["1", "2", "3", "4", "5"], "Y": ["0"] * 5})
+    mapping = {"Reference Designator": "Ref", "Part Number": "PN", "Mid X": "X", "Mid Y": "Y", INPUT_UNITS_KEY: "mm"}
+
+    def full_merge(bom, xy):
+        return apply_schema(perform_merge_and_validation(bom, xy, mapping), mapping)
+
+    def by_ref(df):
+        return {r["Ref Des"]: (r["Status"], r["Part Number"], r["Is Ignored"]) for r in df.to_dict("records")}
+
+    try:
+        # 1. Row diff: kept rows move, edited rows show up as removed + added
+        old = pd.DataFrame({"A": ["x", "y", "z", "z"]})
+        new = pd.DataFrame({"A": ["z", "x", "w", "z"]})
+        old_to_new, added = diff_rows(row_hashes(old), row_hashes(new))
+        if old_to_new.tolist() == [1, -1, 0, 3] and added.tolist() == [2]:
+            print("[PASS] Rows matched by content, repeated rows counted.")
+        else:
+            print(f"[FAIL] old_to_new={old_to_new.tolist()} added={added.tolist()}")
+
+        # 2. BOM edit: only the changed rows are normalized and re-merged
+        bom_snap = snapshot(bom_df, "Ref", None)
+        master_df = full_merge(bom_snap["clean"], xy_df)
+        master_df.loc[master_df["Ref Des"] == "R2", "Is Ignored"] = True
+
+        edited_bom_df = pd.DataFrame({"Ref": ["R1-R3", "C1", "U1", "Q1"], "PN": ["RES2", "CAP", "IC", "FET"]})
+        bom_snap, changed = update_source(bom_snap, edited_bom_df, "Ref", None)
+        new_master_df, n_refs = remerge(master_df, bom_snap["clean"], xy_df, mapping, changed_bom=changed)
+
+        expected = by_ref(full_merge(bom_snap["clean"], xy_df))
+        expected["R2"] = (expected["R2"][0], expected["R2"][1], True)
+        if by_ref(new_master_df) == expected and n_refs == 4:
+            print("[PASS] Delta merge equals a full merge, ignores kept.")
+        else:
+            print(f"[FAIL] n_refs={n_refs}\n{new_master_df}")
+
+        # 3. XY edit: a moved part only re-merges its own Ref Des
+        xy_snap = snapshot(xy_df)
+        edited_xy_df = xy_df.assign(X=["1", "2", "3", "40", "5"])
+        xy_snap, changed = update_source(xy_snap, edited_xy_df)
+        moved_df, n_refs = remerge(new_master_df, bom_snap["clean"], edited_xy_df, mapping, changed_xy=changed)
+        x_by_ref = dict(zip(moved_df["Ref Des"], moved_df["X"]))
+        if n_refs == 1 and x_by_ref["C1"] == 40 and x_by_ref["R1"] == 1 and len(moved_df) == len(new_master_df):
+            print("[PASS] XY edit re-merges only the moved part.")
+        else:
+            print(f"[FAIL] n_refs={n_refs}\n{moved_df}")
+
+        # 4. New columns: no diff possible, caller re-merges everything
+        _, changed = update_source(xy_snap, edited_xy_df.assign(Rot="0"))
+        if changed is None:
+            print("[PASS] Column change reported as a full reload.")
+        else:
+            print(f"[FAIL] Changed rows: {changed}")
+
+        # 5. Accepted near-match (XY R01 <-> BOM R1) survives a BOM edit, delta and full
+        pair_bom_df = pd.DataFrame({"Ref": ["R1", "C1"], "PN": ["P1", "CAP"]})
+        pair_xy_df = pd.DataFrame({"Ref": ["R01", "C1"], "X": ["1", "4"], "Y": ["0", "0"]})
+        pair_snap = snapshot(pair_bom_df, "Ref", None)
+        pair_df = full_merge(pair_snap["clean"], pair_xy_df)
+        pair_df = accept_matches(pair_df, propose_matches(pair_df))
+
+        pair_snap, changed = update_source(pair_snap, pair_bom_df.assign(PN=["P1-new", "CAP"]), "Ref", None)
+        delta_df, n_refs = remerge(pair_df, pair_snap["clean"], pair_xy_df, mapping, changed_bom=changed)
+        full_df, _ = remerge(pair_df, pair_snap["clean"], pair_xy_df, mapping, full=True)
+        expected = {"R01": ("MATCHED", "P1-new", False), "C1": ("MATCHED", "CAP", False)}
+        if (by_ref(delta_df) == expected and by_ref(full_df) == expected and n_refs == 1
+                and delta_df.attrs["accepted"] == full_df.attrs["accepted"] == [{"XY Ref Des": "R01", "BOM Ref Des": "R1"}]):
+            print("[PASS] Accepted pairs re-applied after a remerge.")
+        else:
+            print(f"[FAIL] Delta:\n{delta_df}\nFull:\n{full_df}")
+
+    except Exception as e:
+        print(f"[CRITICAL FAIL] {e}")
+        import traceback
+        traceback.print_exc()
+
+if __name__ == "__main__":
+    run_test()
@@ -0,0 +1,92 @@
+# tests/test_instrumentation.py
+import sys
+import os
+import tempfile
+import threading
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from src.core import instrumentation
+from src.core.file_loader import load_and_clean_file
+from src.core.normalizer import normalize_bom_data
+
+def run_test():
+    print("--- TEST: STAGE INSTRUMENTATION ---")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bom_path = os.path.join(tmp, "bom.csv")
+        with open(bom_path, "w") as f:
+            f.write("Customer: Stark Industries\n")
+            f.write("Ref Des,Part Number,Qty\n")
+            f.write("R1-R4,GRM155,4\n")
+            f.write("C1,GRM188,1\n")
+
+        try:
+            # 1. Disabled: nothing recorded
+            instrumentation.disable()
+            instrumentation.clear()
+            df = load_and_clean_file(bom_path)
+            if not instrumentation.records():
+                print("[PASS] Nothing recorded while disabled.")
+            else:
+                print(f"[FAIL] Disabled run recorded {len(instrumentation.records())} stages.")
+
+            # 2. Enabled with memory: nested stages, rows and peaks
+            instrumentation.enable(memory=True)
+            df = load_and_clean_file(bom_path)
+            normalize_bom_data(df, "Ref Des")
+            records = {r["stage"]: r for r in instrumentation.records()}
+            instrumentation.disable()
+
+            load = records.get("file_loader.load", {})
+            normalize = records.get("normalizer.normalize", {})
+            nested = records.get("file_loader.read_rows", {}).get("depth") == 1
+            if load.get("rows") == 2 and load.get("detail") == "bom.csv" and normalize.get("rows") == 5 and nested:
+                print("[PASS] Load/normalize stages recorded with row counts and nesting.")
+            else:
+                print(f"[FAIL] Unexpected records: {sorted(records)}")
+
+            if all(r["peak_mb"] is not None and r["seconds"] >= 0 for r in records.values()):
+                print("[PASS] Peak memory tracked for every stage.")
+            else:
+                print("[FAIL] Missing peak memory values.")
+
+            # 3. Stages running at the same time on two threads (BOM + XY on the
+            # pool) get no peak; a worker stage running alone keeps its own
+            def load(name, barrier=None):
+                with instrumentation.stage("test.load", name):
+                    data = bytearray(4 * 1024 * 1024)
+                    if barrier:
+                        barrier.wait()
+                    del data
+
+            def run_threads(targets):
+                threads = [threading.Thread(target=load, args=args, name=args[0]) for args in targets]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+            instrumentation.clear()
+            instrumentation.enable(memory=True)
+            barrier = threading.Barrier(2)
+            run_threads([("bom", barrier), ("xy", barrier)])
+            run_threads([("alone",)])
+            peaks = {r["detail"]: (r["peak_mb"], r["overlapped"]) for r in instrumentation.records()}
+            instrumentation.disable()
+            if (peaks["bom"] == (None, True) and peaks["xy"] == (None, True)
+                    and peaks["alone"][0] >= 4 and not peaks["alone"][1]):
+                print("[PASS] Overlapping stages marked, no shared peak reported.")
+            else:
+                print(f"[FAIL] Peaks: {peaks}")
+
+        except Exception as e:
+            print(f"[CRITICAL FAIL] {e}")
+            import traceback
+            traceback.print_exc()
+
+if __name__ == "__main__":
+    run_test()
@@ -1,6 +1,7 @@
 # tests/test_loader.py
 import sys
 import os
+import tempfile
 import pandas as pd
 import xlsxwriter
 
@@ -9,10 +10,16 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
 sys.path.append(parent_dir)
 
-from src.core.file_loader import load_and_clean_file
+from src.core import file_loader
+from src.core.file_loader import load_and_clean_file, preview_file, sniff_text_format
+from src.core.parse_cache import ParseCache
+from src.core.readers import READERS, _active_sheet_index
 
 # File to generate for testing
 TEST_FILE = os.path.join(current_dir, "temp_messy_bom.xlsx")
+TEST_CSV = os.path.join(current_dir, "temp_messy_bom.csv")
+TEST_SEMICOLON_CSV = os.path.join(current_dir, "temp_semicolon_bom.csv")
+TEST_TWO_SHEETS = os.path.join(current_dir, "temp_two_sheets.xlsx")
 
 def create_messy_dummy_file():
     """Generates an Excel file with noise and merged cells."""
@@ -45,6 +52,17 @@ def create_messy_dummy_file():
     workbook.close()
     print(f"--> Created dummy file: {TEST_FILE}")
 
+def create_messy_dummy_csv():
+    """Generates a CSV with ragged banner lines above a duplicated header."""
+    with open(TEST_CSV, "w") as f:
+        f.write("Customer: Stark Industries\n")
+        f.write("Project: Jarvis V1,Rev B\n")
+        f.write("\n")
+        f.write("Ref Des,Part Number,Qty,Qty\n")
+        f.write("R1,GRM155,10,1\n")
+        f.write("R2,GRM155,10,1\n")
+    print(f"--> Created dummy file: {TEST_CSV}")
+
 def run_test():
     print("--- TEST: FILE LOADER ---")
     
@@ -76,6 +94,83 @@ def run_test():
         else:
             print(f"[FAIL] Merged cell failed. Got '{val_r2}' instead of 'Murata'.")
 
+        # Check CSV path (banner lines have fewer fields than the header)
+        create_messy_dummy_csv()
+        df_csv = load_and_clean_file(TEST_CSV)
+        if list(df_csv.columns) == ['Ref Des', 'Part Number', 'Qty', 'Qty.1'] and len(df_csv) == 2:
+            print("[PASS] CSV header found below banner lines and deduplicated.")
+        else:
+            print(f"[FAIL] CSV header detection failed. Got {list(df_csv.columns)}.")
+
+        # Quick preview: same header, only the first rows
+        preview_xlsx = preview_file(TEST_FILE, n_rows=1)
+        preview_csv = preview_file(TEST_CSV, n_rows=1)
+        if (list(preview_xlsx.columns) == list(df.columns) and preview_xlsx["Part Number"].tolist() == ["GRM155"]
+                and preview_csv.equals(df_csv.head(1))):
+            print("[PASS] Preview reads the header and stops after n rows.")
+        else:
+            print(f"[FAIL] Preview:\n{preview_xlsx}\n{preview_csv}")
+
+        # Sniffing: Windows-1252 text, ';' delimiter despite the .csv extension
+        with open(TEST_SEMICOLON_CSV, "wb") as f:
+            f.write("Export\nRef Des;Part Number;Description\nR1;PN1;Résistance\nR2;NA;x\n".encode("cp1252"))
+        text_format = sniff_text_format(TEST_SEMICOLON_CSV, ",")
+        df_semi = load_and_clean_file(TEST_SEMICOLON_CSV)
+        if (text_format["encoding"] == "cp1252" and text_format["delimiter"] == ";"
+                and df_semi["Description"].tolist() == ["Résistance", "x"]):
+            print("[PASS] Encoding and delimiter sniffed.")
+        else:
+            print(f"[FAIL] Sniffed {text_format}:\n{df_semi}")
+
+        # Every installed backend gives the same frame
+        mismatched = []
+        for path in [TEST_FILE, TEST_CSV, TEST_SEMICOLON_CSV]:
+            ext = os.path.splitext(path)[1]
+            frames = {name: load_and_clean_file(path, reader=name) for name, r in READERS.items()
+                      if ext in r["extensions"] and r["available"]}
+            first = next(iter(frames.values()))
+            mismatched += [f"{os.path.basename(path)}: {name}" for name, df in frames.items() if not df.equals(first)]
+        if not mismatched:
+            print("[PASS] Reader backends agree.")
+        else:
+            print(f"[FAIL] Backends differ: {mismatched}")
+
+        # Two sheets, the second one active: every backend reads the active sheet
+        with xlsxwriter.Workbook(TEST_TWO_SHEETS) as workbook:
+            workbook.add_worksheet("Notes").write_row(0, 0, ["Exported by", "CAD"])
+            bom_sheet = workbook.add_worksheet("BOM")
+            bom_sheet.write_row(0, 0, ["Ref Des", "Part Number"])
+            bom_sheet.write_row(1, 0, ["R1", "PN1"])
+            bom_sheet.activate()
+        frames = {name: load_and_clean_file(TEST_TWO_SHEETS, reader=name) for name, r in READERS.items()
+                  if ".xlsx" in r["extensions"] and r["available"]}
+        wrong = {name: list(df.columns) for name, df in frames.items()
+                 if "Ref Des" not in df.columns or df["Ref Des"].tolist() != ["R1"]}
+        if not wrong and _active_sheet_index(TEST_TWO_SHEETS) == 1:
+            print(f"[PASS] Active sheet read ({', '.join(frames)}).")
+        else:
+            print(f"[FAIL] Wrong sheet read: {wrong}")
+
+        # Progress during the parse: a callback that raises (cancel) stops it, nothing is cached
+        def cancel(message, percent):
+            raise InterruptedError(message)
+        saved_progress_rows = file_loader.PROGRESS_ROWS
+        file_loader.PROGRESS_ROWS = 1 # Every row
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                cache = ParseCache(tmp)
+                try:
+                    cache.load(TEST_FILE, load_and_clean_file, progress=cancel)
+                    message = None
+                except InterruptedError as e:
+                    message = str(e)
+                if message == "Parsing file... 1 rows" and cache.get(TEST_FILE) is None:
+                    print("[PASS] Parse reports progress between rows and stops when cancelled.")
+                else:
+                    print(f"[FAIL] Cancelled parse: {message}")
+        finally:
+            file_loader.PROGRESS_ROWS = saved_progress_rows
+
     except Exception as e:
         print(f"[CRITICAL FAIL] Logic crashed: {e}")
         import traceback
@@ -84,6 +179,9 @@ def run_test():
     # Cleanup
     # if os.path.exists(TEST_FILE):
     #    os.remove(TEST_FILE)
+    for path in [TEST_CSV, TEST_SEMICOLON_CSV, TEST_TWO_SHEETS]:
+        if os.path.exists(path):
+            os.remove(path)
 
 if __name__ == "__main__":
     run_test()
\ No newline at end of file
@@ -0,0 +1,70 @@
+# tests/test_merge_cache.py
+import sys
+import os
+import pandas as pd
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from src.core import instrumentation
+from src.core.logic_engine import perform_merge_and_validation, clear_merge_cache
+
+def run_test():
+    print("--- TEST: MEMOIZED MERGE ---")
+
+    bom_df = pd.DataFrame({"Ref": ["R1", "R2", "C1"], "PN": ["A", "B", "C"], "Desc": ["res", "res", "cap"]})
+    xy_df = pd.DataFrame({"Ref": ["R1", "R2", "FID1"], "X": ["1", "2", "3"]})
+    mapping = {"Reference Designator": "Ref", "Part Number": "PN", "Mid X": "X"}
+
+    def by_ref(df, col):
+        return dict(zip(df["Ref Des"], df[col]))
+
+    def joins():
+        return sum(r["stage"] == "logic_engine.join" for r in instrumentation.records())
+
+    try:
+        clear_merge_cache()
+        instrumentation.enable()
+        instrumentation.clear()
+
+        # 1. Inputs are not modified
+        first_df = perform_merge_and_validation(bom_df, xy_df, mapping)
+        if list(bom_df.columns) == ["Ref", "PN", "Desc"] and list(xy_df.columns) == ["Ref", "X"]:
+            print("[PASS] Input frames left untouched.")
+        else:
+            print(f"[FAIL] Inputs changed: {list(bom_df.columns)} / {list(xy_df.columns)}")
+
+        # 2. Same inputs: no second join, same result, result edits do not leak into the cache
+        first_df["Is Ignored"] = True
+        second_df = perform_merge_and_validation(bom_df, xy_df, mapping)
+        if joins() == 1 and not by_ref(second_df, "Is Ignored")["R1"] and by_ref(second_df, "Part Number")["R2"] == "B":
+            print("[PASS] Repeated merge served from the cache.")
+        else:
+            print(f"[FAIL] Joins: {joins()}\n{second_df}")
+
+        # 3. Non-key mapping change: re-projected, not re-joined
+        described_df = perform_merge_and_validation(bom_df, xy_df, {**mapping, "Description": "Desc"})
+        if joins() == 1 and by_ref(described_df, "Description")["C1"] == "cap":
+            print("[PASS] Non-key mapping change re-projects the cached join.")
+        else:
+            print(f"[FAIL] Joins: {joins()}\n{described_df}")
+
+        # 4. Edited content: joined again
+        edited_bom_df = bom_df.assign(PN=["A", "B2", "C"])
+        edited_df = perform_merge_and_validation(edited_bom_df, xy_df, mapping)
+        if joins() == 2 and by_ref(edited_df, "Part Number")["R2"] == "B2":
+            print("[PASS] Changed input content invalidates the cache.")
+        else:
+            print(f"[FAIL] Joins: {joins()}\n{edited_df}")
+
+    except Exception as e:
+        print(f"[CRITICAL FAIL] {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        instrumentation.disable()
+
+if __name__ == "__main__":
+    run_test()
@@ -58,6 +58,14 @@ def run_test():
         else:
              print("[FAIL] Mixed range failed.")
 
+        # Check Edge Cases (reverse range, prefix mismatch, lower case)
+        df_edge = pd.DataFrame({'Ref Des': ['r5-r3', 'R1-C5', 'c1-4'], 'Value': ['a', 'b', 'c']})
+        edge_refs = normalize_bom_data(df_edge, 'Ref Des', delimiter=',')['Ref Des'].tolist()
+        if edge_refs == ['R3', 'R4', 'R5', 'R1-C5', 'C1', 'C2', 'C3', 'C4']:
+            print("[PASS] Reverse ranges, prefix mismatch and upper-casing handled.")
+        else:
+            print(f"[FAIL] Edge cases failed. Got {edge_refs}.")
+
     except Exception as e:
         print(f"[CRITICAL FAIL] {e}")
         import traceback
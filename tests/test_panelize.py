@@ -0,0 +1,90 @@
+# tests/test_panelize.py
+import sys
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from src.core.panelize import panelize
+from src.core.schema import apply_schema, OUTPUT_UNITS_KEY
+from src.core.exporter import export_placements
+
+def run_test():
+    print("--- TEST: PANEL STEP AND REPEAT ---")
+
+    board_df = pd.DataFrame({
+        "Ref Des": ["R1", "C1"],
+        "Status": ["MATCHED", "MATCHED"],
+        "Is Ignored": [False, False],
+        "Layer": ["TopLayer", "BottomLayer"],
+        "Mid X": ["0", "10mm"],
+        "Mid Y": ["0", "20"],
+        "Rotation": ["90", "0"],
+    })
+    panel = {
+        "rows": 2, "cols": 3, "pitch_x": 100, "pitch_y": 50,
+        "board_width": 10, "board_height": 20,
+        "board_rotation": {2: 180}, "mirrored_boards": [3], "skip": [5],
+    }
+
+    try:
+        panel_df = panelize(board_df, panel)
+        by_ref = panel_df.set_index("Ref Des")
+
+        # 1. Boards x parts, x-outs skipped, suffixed refs
+        if len(panel_df) == 10 and "R1_5" not in by_ref.index and by_ref.loc["C1_6", "Board"] == 6:
+            print("[PASS] 5 boards x 2 parts with board suffixes, board 5 skipped.")
+        else:
+            print(f"[FAIL] Unexpected refs: {panel_df['Ref Des'].tolist()}")
+
+        # 2. Pitch offsets (board 4 is row 2, column 1)
+        if np.allclose(by_ref.loc["C1_4", ["Mid X", "Mid Y"]].astype(float), [10, 70]):
+            print("[PASS] Pitch offset applied.")
+        else:
+            print(f"[FAIL] C1_4 at {by_ref.loc['C1_4', ['Mid X', 'Mid Y']].tolist()}")
+
+        # 3. Board 2 rotated 180 about its centre (5, 10)
+        r1 = by_ref.loc["R1_2"]
+        if np.allclose([r1["Mid X"], r1["Mid Y"], r1["Rotation"]], [110, 20, 270]):
+            print("[PASS] Per-board rotation about the board centre.")
+        else:
+            print(f"[FAIL] R1_2 at {r1[['Mid X', 'Mid Y', 'Rotation']].tolist()}")
+
+        # 4. Board 3 flipped: X mirrored, sides swapped
+        r1 = by_ref.loc["R1_3"]
+        if np.isclose(r1["Mid X"], 210) and r1["Layer"] == "BottomLayer" and by_ref.loc["C1_3", "Layer"] == "TopLayer":
+            print("[PASS] Mirrored board swaps Top/Bottom.")
+        else:
+            print(f"[FAIL] R1_3: {r1.to_dict()}")
+
+        # 5. mil-labelled board, file text kept: panel Mid X/Y stay in mil (pitch in X/Y mm)
+        mil_df = pd.DataFrame({
+            "Ref Des": ["R1"], "Status": ["MATCHED"], "Is Ignored": [False], "Layer": ["Top"],
+            "Mid X": ["100"], "Mid Y": ["50"], "Rotation": ["0"],
+        })
+        mapping = {"Mid X": "X (mil)", "Mid Y": "Y (mil)"}
+        kept_df = panelize(apply_schema(mil_df, mapping), {"cols": 2, "pitch_x": 2.54})
+        converted_df = panelize(apply_schema(mil_df, {**mapping, OUTPUT_UNITS_KEY: "mm"}), {"cols": 2, "pitch_x": 2.54})
+        with tempfile.TemporaryDirectory() as tmp:
+            export_placements(kept_df, os.path.join(tmp, "panel.xlsx"))
+            header = pd.read_excel(os.path.join(tmp, "panel.xlsx"), sheet_name="Top").columns.tolist()
+        if (kept_df["Mid X"].tolist() == [100, 200] and kept_df["X"].tolist() == [2.54, 5.08]
+                and converted_df["Mid X"].tolist() == [2.54, 5.08] and converted_df.attrs["units"]["text"] == "mm"
+                and "Mid X (mil)" in header and "Mid Y (mil)" in header):
+            print("[PASS] Panel coordinates kept in the file's unit, unit named in the header.")
+        else:
+            print(f"[FAIL] Kept: {kept_df[['Mid X', 'X']].values.tolist()}, "
+                  f"converted: {converted_df['Mid X'].tolist()}, header: {header}")
+
+    except Exception as e:
+        print(f"[CRITICAL FAIL] {e}")
+        import traceback
+        traceback.print_exc()
+
+if __name__ == "__main__":
+    run_test()
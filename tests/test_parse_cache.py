@@ -0,0 +1,97 @@
+# tests/test_parse_cache.py
+import sys
+import os
+import time
+import tempfile
+import functools
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from src.core.file_loader import load_and_clean_file
+from src.core.parse_cache import ParseCache
+
+def write_bom(path, n_rows, part="GRM155"):
+    with open(path, "w") as f:
+        f.write("Customer: Stark Industries\n")
+        f.write("Ref Des,Part Number,Qty\n")
+        for i in range(n_rows):
+            f.write(f"R{i},{part},1\n")
+
+def run_test():
+    print("--- TEST: PARSE CACHE ---")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ParseCache(cache_dir=os.path.join(tmp, "cache"))
+        bom_path = os.path.join(tmp, "bom.csv")
+        write_bom(bom_path, 50_000)
+
+        try:
+            calls = []
+            def counting_loader(path):
+                calls.append(path)
+                return load_and_clean_file(path)
+
+            # 1. Miss -> parse, Hit -> no parse
+            start = time.perf_counter()
+            first = cache.load(bom_path, counting_loader)
+            cold_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            second = cache.load(bom_path, counting_loader)
+            warm_s = time.perf_counter() - start
+
+            if len(calls) == 1 and first.equals(second):
+                print(f"[PASS] Re-open served from cache (cold {cold_s * 1000:.0f} ms, warm {warm_s * 1000:.0f} ms).")
+            else:
+                print(f"[FAIL] Expected 1 parse and equal frames, got {len(calls)} parses.")
+
+            # 2. Edited file -> re-parse
+            time.sleep(0.01)
+            write_bom(bom_path, 50_000, part="GRM188")
+            third = cache.load(bom_path, counting_loader)
+            if len(calls) == 2 and third.loc[0, "Part Number"] == "GRM188":
+                print("[PASS] Changed file invalidated the cached entry.")
+            else:
+                print("[FAIL] Changed file was served from a stale entry.")
+
+            # 3. The loader is part of the key: another loader (or reader) re-parses
+            lower_calls = []
+            def lower_loader(path):
+                lower_calls.append(path)
+                df = load_and_clean_file(path)
+                df["Part Number"] = df["Part Number"].str.lower()
+                return df
+            lowered = cache.load(bom_path, lower_loader)
+            again = cache.load(bom_path, counting_loader)
+            by_reader = [cache.load(bom_path, functools.partial(load_and_clean_file, reader=name))
+                         for name in ("pandas", "pyarrow", "pandas")]
+            entries = [n for n in os.listdir(cache.cache_dir) if n != "index.json"]
+            if (len(lower_calls) == 1 and lowered.loc[0, "Part Number"] == "grm188" and len(calls) == 2
+                    and again.loc[0, "Part Number"] == "GRM188" and len(entries) == 5
+                    and all(df.equals(third) for df in by_reader)):
+                print("[PASS] Each loader / reader gets its own entry.")
+            else:
+                print(f"[FAIL] Loader calls {len(lower_calls)}/{len(calls)}, entries: {entries}")
+
+            # 4. LRU eviction keeps the cache under its size limit
+            small = ParseCache(cache_dir=os.path.join(tmp, "small"), max_bytes=1)
+            small.load(bom_path)
+            other_path = os.path.join(tmp, "other.csv")
+            write_bom(other_path, 10)
+            small.load(other_path)
+            entries = [n for n in os.listdir(small.cache_dir) if n != "index.json"]
+            if len(entries) <= 1:
+                print("[PASS] Size limit enforced with LRU eviction.")
+            else:
+                print(f"[FAIL] Expected at most 1 entry, found {len(entries)}.")
+
+        except Exception as e:
+            print(f"[CRITICAL FAIL] {e}")
+            import traceback
+            traceback.print_exc()
+
+if __name__ == "__main__":
+    run_test()
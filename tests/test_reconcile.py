@@ -0,0 +1,72 @@
+# tests/test_reconcile.py
+import sys
+import os
+import pandas as pd
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from src.core.reconcile import propose_matches, accept_matches, canonical_refs
+
+def run_test():
+    print("--- TEST: NEAR-MISS REF DES RECONCILIATION ---")
+
+    merged_df = pd.DataFrame({
+        "Ref Des": ["R01", "C_10", "U1A", "LED12", "LD7", "LE7", "FID1",
+                    "R1", "C10", "U1", "LD12", "L7", "FID2", "Q1"],
+        "Status": ["XY_ONLY"] * 7 + ["BOM_ONLY"] * 7,
+        "Is Ignored": [False] * 6 + [True] + [False] * 7,
+        "Mid X": ["1", "2", "3", "4", "5", "6", "7"] + [None] * 7,
+        "Part Number": [None] * 7 + ["PR1", "PC10", "PU1", "PR13", "PL9", "PF", "PQ1"],
+    })
+
+    try:
+        # 1. Canonical form
+        if canonical_refs([" r_001 ", "C-10", "U1A"]).tolist() == ["R1", "C10", "U1A"]:
+            print("[PASS] Separators and leading zeros removed.")
+        else:
+            print(f"[FAIL] Canonical: {canonical_refs([' r_001 ', 'C-10', 'U1A']).tolist()}")
+
+        # 2. Proposals per tier; LD7/LE7 -> L7 is ambiguous, ignored FID1 is skipped
+        proposals = propose_matches(merged_df)
+        found = {(a, b): reason for a, b, reason in proposals[["XY Ref Des", "BOM Ref Des", "Reason"]].values}
+        expected = {
+            ("R01", "R1"): "canonical",
+            ("C_10", "C10"): "canonical",
+            ("U1A", "U1"): "gate suffix",
+            ("LED12", "LD12"): "edit distance 1",
+        }
+        if found == expected:
+            print("[PASS] Near misses proposed, ambiguous and ignored refs left alone.")
+        else:
+            print(f"[FAIL] Proposals: {found}")
+
+        # 3. Numbers are never edited: R1/R10 and R12/R13 are different parts
+        numbers_df = pd.DataFrame({
+            "Ref Des": ["R1", "R12", "C5", "R10", "R13", "R5"],
+            "Status": ["XY_ONLY"] * 3 + ["BOM_ONLY"] * 3,
+            "Is Ignored": [False] * 6,
+        })
+        if propose_matches(numbers_df).empty:
+            print("[PASS] R1/R10, R12/R13 and C5/R5 not proposed.")
+        else:
+            print(f"[FAIL] Proposed: {propose_matches(numbers_df)[['XY Ref Des', 'BOM Ref Des']].values.tolist()}")
+
+        # 4. Accepting merges each pair into one MATCHED row
+        accepted_df = accept_matches(merged_df, proposals)
+        r01 = accepted_df[accepted_df["Ref Des"] == "R01"].iloc[0]
+        if (len(accepted_df) == len(merged_df) - 4 and r01["Status"] == "MATCHED"
+                and r01["Part Number"] == "PR1" and "R1" not in accepted_df["Ref Des"].tolist()):
+            print("[PASS] Accepted pairs merged into MATCHED rows.")
+        else:
+            print(f"[FAIL] After accept:\n{accepted_df}")
+
+    except Exception as e:
+        print(f"[CRITICAL FAIL] {e}")
+        import traceback
+        traceback.print_exc()
+
+if __name__ == "__main__":
+    run_test()
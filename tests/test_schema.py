@@ -0,0 +1,57 @@
+# tests/test_schema.py
+import sys
+import os
+import pandas as pd
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from src.core.schema import apply_schema, Status, STATUS_DTYPE
+
+def run_test():
+    print("--- TEST: TYPED SCHEMA ---")
+
+    merged_df = pd.DataFrame({
+        "Ref Des": ["R1", "R2", "FID1", "C1"],
+        "Status": ["MATCHED", "MATCHED", "XY_ONLY", "BOM_ONLY"],
+        "Is Ignored": [False, False, True, False],
+        "Layer": ["Top", "Top", "Top", None],
+        "Mid X": ["10.5", "12.25mm", "1", None],
+        "Mid Y": ["-3", "4", "1", None],
+        "Rotation": ["90", "R270", "", None],
+        "Part Number": ["PN1", "PN1", None, "PN2"],
+    })
+
+    try:
+        typed_df = apply_schema(merged_df)
+
+        # 1. Floats parsed once, original text kept
+        if (typed_df["X"].tolist()[:3] == [10.5, 12.25, 1.0] and typed_df["Angle"].tolist()[:2] == [90.0, 270.0]
+                and typed_df["Mid X"].equals(merged_df["Mid X"])):
+            print("[PASS] Coordinates parsed to float, text columns unchanged.")
+        else:
+            print(f"[FAIL] Parsed: {typed_df[['X', 'Angle']].values.tolist()}")
+
+        # 2. Categoricals, Status values from the enum
+        if (typed_df["Status"].dtype == STATUS_DTYPE and typed_df["Layer"].dtype == "category"
+                and (typed_df["Status"] == Status.XY_ONLY).sum() == 1):
+            print("[PASS] Status / Layer stored as categoricals.")
+        else:
+            print(f"[FAIL] Unexpected dtypes: {typed_df.dtypes.to_dict()}")
+
+        # 3. Unknown status is an error, not silent NaN
+        try:
+            apply_schema(merged_df.assign(Status="MAYBE"))
+            print("[FAIL] Unknown status accepted.")
+        except ValueError:
+            print("[PASS] Unknown status rejected.")
+
+    except Exception as e:
+        print(f"[CRITICAL FAIL] {e}")
+        import traceback
+        traceback.print_exc()
+
+if __name__ == "__main__":
+    run_test()
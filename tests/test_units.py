@@ -0,0 +1,84 @@
+# tests/test_units.py
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Setup path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from src.core.units import detect_unit, convert_coordinates, normalize_rotation
+from src.core.schema import apply_schema, INPUT_UNITS_KEY, OUTPUT_UNITS_KEY
+
+def run_test():
+    print("--- TEST: COORDINATE UNITS ---")
+
+    try:
+        # 1. Detection: suffix, then header; the value range is no label
+        checks = [
+            (detect_unit([pd.Series(["1250mil", "300", "40mil"])])[0], "mil"),
+            (detect_unit([pd.Series(["1.5", "2.25"])], headers=["Center-X(in)"])[0], "in"),
+            (detect_unit([pd.Series(["100", "4500"]), pd.Series(["0", "3000"])])[0], None),
+            (detect_unit([pd.Series(["0.25", "3.9"])])[0], None),
+        ]
+        if all(found == expected for found, expected in checks):
+            print("[PASS] Units detected from suffixes and headers only.")
+        else:
+            print(f"[FAIL] Detected: {[found for found, _ in checks]}")
+
+        # 1b. Small unlabelled boards keep their numbers: a 15.5 mm board (looks
+        # like inches) and a 1200 mil board (looks like mm); a guess only warns
+        small_mm = pd.DataFrame({"Ref Des": ["R1", "R2"], "Status": ["MATCHED", "MATCHED"],
+                                 "Is Ignored": [False, False], "Mid X": ["2.0", "17.5"], "Mid Y": ["1.0", "9.0"]})
+        small_mil = small_mm.assign(**{"Mid X": ["100", "1300"], "Mid Y": ["50", "800"]})
+        mm_df = apply_schema(small_mm, {INPUT_UNITS_KEY: "auto", OUTPUT_UNITS_KEY: None})
+        mil_df = apply_schema(small_mil, {INPUT_UNITS_KEY: "auto", OUTPUT_UNITS_KEY: None})
+        mil_to_mm = apply_schema(small_mil, {INPUT_UNITS_KEY: "mil", OUTPUT_UNITS_KEY: "mm"})
+        if (mm_df["X"].tolist() == [2.0, 17.5] and mm_df["Mid X"].tolist() == ["2.0", "17.5"]
+                and "looks like in" in mm_df.attrs["units"]["warning"]
+                and mil_df["X"].tolist() == [100.0, 1300.0] and mil_df.attrs["units"]["warning"] is None
+                and np.allclose(mil_to_mm["Mid X"], [2.54, 33.02])):
+            print("[PASS] Small mm / mil boards not rescaled without a unit label.")
+        else:
+            print(f"[FAIL] mm board: {mm_df['X'].tolist()} {mm_df.attrs['units']}, "
+                  f"mil board: {mil_df['X'].tolist()} {mil_df.attrs['units']}")
+
+        # 2. Per-value suffixes win over the file unit
+        mm = convert_coordinates(pd.Series(["1000", "1in", "2.54mm", None]), "mil", "mm")
+        if np.allclose(mm[:3], [25.4, 25.4, 2.54]) and np.isnan(mm[3]):
+            print("[PASS] Coordinates converted to mm.")
+        else:
+            print(f"[FAIL] Converted: {mm}")
+
+        # 3. Rotations canonical in [0, 360)
+        rotation = normalize_rotation(pd.Series(["-90", "R90", "450", "360.00", "-0"]))
+        if rotation.tolist() == [270.0, 90.0, 90.0, 0.0, 0.0]:
+            print("[PASS] Rotations normalized to 0-360.")
+        else:
+            print(f"[FAIL] Rotations: {rotation.tolist()}")
+
+        # 4. Mapping step: output unit replaces the exported text
+        merged_df = pd.DataFrame({
+            "Ref Des": ["R1", "R2"],
+            "Status": ["MATCHED", "MATCHED"],
+            "Is Ignored": [False, False],
+            "Mid X": ["100mil", "2000mil"],
+            "Mid Y": ["0mil", "50mil"],
+            "Rotation": ["-90", "180"],
+        })
+        typed_df = apply_schema(merged_df, {INPUT_UNITS_KEY: "auto", OUTPUT_UNITS_KEY: "mm"})
+        if (np.allclose(typed_df["Mid X"], [2.54, 50.8]) and typed_df["Rotation"].tolist() == [270.0, 180.0]
+                and typed_df.attrs["units"]["input"] == "mil"):
+            print("[PASS] Schema stage converts mil to mm.")
+        else:
+            print(f"[FAIL] Typed: {typed_df[['Mid X', 'Rotation']].values.tolist()} {typed_df.attrs}")
+
+    except Exception as e:
+        print(f"[CRITICAL FAIL] {e}")
+        import traceback
+        traceback.print_exc()
+
+if __name__ == "__main__":
+    run_test()